@@ -0,0 +1,129 @@
+"""对比逐块 aiofiles 写入与合并缓冲写入（专用 I/O 线程 + 按偏移量写入）的下载写入性能
+
+用法:
+    python scripts/benchmarks/bench_file_writer.py --files 8 --size 64 --chunk 64
+
+模拟 ``--files`` 个并发下载，每个文件 ``--size`` MiB，网络层每次产出 ``--chunk`` KiB
+的数据块。除吞吐量外，脚本统计事件循环线程每写入 1 MiB 消耗的 CPU 时间、提交到
+线程池的次数，并运行一个每 1ms 唤醒一次的心跳任务统计事件循环延迟，用于衡量事件
+循环的调度负担。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from statistics import mean, quantiles
+from time import perf_counter, thread_time
+
+from aiofiles import open as aio_open
+
+SRC_PATH = Path(__file__).resolve().parents[2] / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from media_crawler.modules.xhs_downloader.core.module.writer import (  # noqa: E402
+    WriterPool,
+)
+
+
+async def chunks(size: int, chunk: int):
+    data = os.urandom(chunk)
+    for __ in range(size // chunk):
+        # 模拟网络数据到达：每个数据块之间让出一次事件循环
+        await asyncio.sleep(0)
+        yield data
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(perf_counter() - start - 0.001)
+
+
+async def aiofiles_writer(file: Path, size: int, chunk: int) -> int:
+    hops = 0
+    async with aio_open(file, "ab") as f:
+        async for data in chunks(size, chunk):
+            await f.write(data)
+            hops += 1
+    return hops + 2
+
+
+async def buffered_writer(
+    pool: WriterPool, file: Path, size: int, chunk: int, buffer: int
+) -> int:
+    async with pool.writer(file, 0, buffer) as f:
+        async for data in chunks(size, chunk):
+            await f.write(data)
+    return size // buffer + 3
+
+
+async def run(name: str, factory, files: int, folder: Path) -> tuple:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(heartbeat(lags, stop))
+    start, cpu = perf_counter(), thread_time()
+    hops = await asyncio.gather(
+        *(factory(folder.joinpath(f"{name}-{i}.bin")) for i in range(files))
+    )
+    elapsed, cpu = perf_counter() - start, thread_time() - cpu
+    stop.set()
+    await ticker
+    return elapsed, cpu, sum(hops), lags
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--files", type=int, default=8, help="并发写入的文件数量")
+    parser.add_argument("--size", type=int, default=64, help="每个文件的大小（MiB）")
+    parser.add_argument("--chunk", type=int, default=64, help="网络数据块大小（KiB）")
+    parser.add_argument(
+        "--buffer", type=int, default=4096, help="合并写入缓冲区大小（KiB）"
+    )
+    parser.add_argument("--threads", type=int, default=2, help="I/O 线程数量")
+    args = parser.parse_args()
+
+    size, chunk, buffer = args.size << 20, args.chunk << 10, args.buffer << 10
+    pool = WriterPool(args.threads)
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        folder = Path(folder)
+        results["aiofiles"] = await run(
+            "aiofiles",
+            lambda file: aiofiles_writer(file, size, chunk),
+            args.files,
+            folder,
+        )
+        results["buffered"] = await run(
+            "buffered",
+            lambda file: buffered_writer(pool, file, size, chunk, buffer),
+            args.files,
+            folder,
+        )
+    pool.shutdown()
+
+    total = args.files * args.size
+    print(
+        f"{'mode':<10}{'MiB/s':>10}{'total(s)':>10}{'loop cpu(ms/MiB)':>18}"
+        f"{'hops':>8}{'lag avg(ms)':>13}{'lag p99(ms)':>13}"
+    )
+    for name, (elapsed, cpu, hops, lags) in results.items():
+        p99 = quantiles(lags, n=100)[-1] if len(lags) > 1 else 0
+        print(
+            f"{name:<10}{total / elapsed:>10.0f}{elapsed:>10.2f}"
+            f"{cpu * 1000 / total:>18.3f}{hops:>8}"
+            f"{mean(lags) * 1000:>13.2f}{p99 * 1000:>13.2f}"
+        )
+    legacy, buffered = results["aiofiles"][0], results["buffered"][0]
+    print(f"\n加速比: {legacy / buffered:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
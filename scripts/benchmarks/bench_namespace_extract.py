@@ -0,0 +1,111 @@
+"""对比 Namespace.safe_extract 移除 deepcopy 前后的单作品提取耗时与峰值内存
+
+用法:
+    python scripts/benchmarks/bench_namespace_extract.py --notes 200
+
+每个作品依次执行 ``Explore.run``、``Image.get_image_link`` 与
+``Video.get_video_link``，与 ``XHS`` 处理单个作品时的调用一致。旧实现通过临时
+替换 ``Namespace`` 的内部查找函数复现，两种实现的提取结果会被校验为一致。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from copy import deepcopy
+from pathlib import Path
+from time import perf_counter
+
+SRC_PATH = Path(__file__).resolve().parents[2] / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from bench_state_decoder import build_synthetic_page  # noqa: E402
+
+from media_crawler.modules.xhs_downloader.core.application.explore import (  # noqa: E402
+    Explore,
+)
+from media_crawler.modules.xhs_downloader.core.application.image import (  # noqa: E402
+    Image,
+)
+from media_crawler.modules.xhs_downloader.core.application.video import (  # noqa: E402
+    Video,
+)
+from media_crawler.modules.xhs_downloader.core.expansion import (  # noqa: E402
+    Converter,
+    Namespace,
+)
+
+
+def legacy_safe_extract(data_object, attribute_chain: str, default=""):
+    data = deepcopy(data_object)
+    for attribute in attribute_chain.split("."):
+        if "[" in attribute:
+            parts = attribute.split("[", 1)
+            attribute = parts[0]
+            index = parts[1][:-1]
+            try:
+                index = int(index)
+                data = getattr(data, attribute, None)[index]
+            except (IndexError, TypeError, ValueError):
+                return default
+        else:
+            data = getattr(data, attribute, None)
+            if not data:
+                return default
+    return data or default
+
+
+@contextmanager
+def legacy_namespace():
+    current = Namespace.__dict__["_Namespace__safe_extract"]
+    Namespace._Namespace__safe_extract = staticmethod(legacy_safe_extract)
+    try:
+        yield
+    finally:
+        Namespace._Namespace__safe_extract = current
+
+
+def extract(note: Namespace) -> dict:
+    data = Explore().run(note)
+    data["下载地址"], data["动图地址"] = Image.get_image_link(note, "png")
+    data["视频地址"] = Video.get_video_link(note)
+    return data
+
+
+def measure(notes: list[Namespace]) -> tuple[float, int, list[dict]]:
+    tracemalloc.start()
+    start = perf_counter()
+    results = [extract(i) for i in notes]
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / len(notes), peak, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--notes", type=int, default=200, help="参与测试的作品数量")
+    args = parser.parse_args()
+
+    note = Converter().run(build_synthetic_page(1))
+    notes = [Namespace(note) for _ in range(args.notes)]
+
+    with legacy_namespace():
+        legacy_time, legacy_peak, legacy_results = measure(notes)
+    current_time, current_peak, current_results = measure(notes)
+
+    print(f"{'implementation':<16}{'per note(ms)':>14}{'peak(KB)':>12}")
+    print(f"{'deepcopy':<16}{legacy_time * 1000:>14.3f}{legacy_peak / 1024:>12.1f}")
+    print(f"{'compiled':<16}{current_time * 1000:>14.3f}{current_peak / 1024:>12.1f}")
+    print(
+        f"\n加速比: {legacy_time / current_time:.1f}x，结果一致: {legacy_results == current_results}"
+    )
+    return 0 if legacy_results == current_results else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
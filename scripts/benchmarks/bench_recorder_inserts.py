@@ -0,0 +1,89 @@
+"""对比逐条提交与批量提交（write-behind + WAL）的下载记录写入速度
+
+用法:
+    python scripts/benchmarks/bench_recorder_inserts.py --rows 5000 --batch-size 100
+
+逐条提交路径复现旧版 ``IDRecorder.add``：每条记录执行一次 ``execute`` 与
+``commit``，使用 SQLite 默认的回滚日志模式。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from types import SimpleNamespace
+
+from aiosqlite import connect
+
+SRC_PATH = Path(__file__).resolve().parents[2] / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from media_crawler.modules.xhs_downloader.core.module.recorder import (  # noqa: E402
+    IDRecorder,
+)
+
+
+async def legacy_inserts(file: Path, ids: list[str]) -> float:
+    database = await connect(file)
+    await database.execute(
+        "CREATE TABLE IF NOT EXISTS explore_id (ID TEXT PRIMARY KEY);"
+    )
+    await database.commit()
+    start = perf_counter()
+    for id_ in ids:
+        await database.execute("REPLACE INTO explore_id VALUES (?);", (id_,))
+        await database.commit()
+    elapsed = perf_counter() - start
+    await database.close()
+    return elapsed
+
+
+async def buffered_inserts(root: Path, ids: list[str], batch_size: int) -> float:
+    manager = SimpleNamespace(
+        root=root,
+        download_record=True,
+        record_batch_size=batch_size,
+        record_flush_interval=0.5,
+    )
+    recorder = IDRecorder(manager)
+    recorder.changed = True
+    await recorder.__aenter__()
+    start = perf_counter()
+    for id_ in ids:
+        await recorder.add(id_)
+    await recorder.flush()
+    elapsed = perf_counter() - start
+    await recorder.__aexit__(None, None, None)
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=5000, help="写入的记录数量")
+    parser.add_argument(
+        "--batch-size", type=int, default=100, help="批量提交的记录数量"
+    )
+    args = parser.parse_args()
+
+    ids = [f"{i:024x}" for i in range(args.rows)]
+    with (
+        tempfile.TemporaryDirectory() as legacy_dir,
+        tempfile.TemporaryDirectory() as buffered_dir,
+    ):
+        legacy = await legacy_inserts(Path(legacy_dir, "ExploreID.db"), ids)
+        buffered = await buffered_inserts(Path(buffered_dir), ids, args.batch_size)
+
+    print(f"{'mode':<16}{'rows/s':>12}{'total(s)':>12}")
+    print(f"{'per-row commit':<16}{args.rows / legacy:>12.0f}{legacy:>12.2f}")
+    print(f"{'write-behind':<16}{args.rows / buffered:>12.0f}{buffered:>12.2f}")
+    print(f"\n加速比: {legacy / buffered:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
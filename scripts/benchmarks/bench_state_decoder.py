@@ -0,0 +1,171 @@
+"""对比 __INITIAL_STATE__ 的 JSON 解析与原 YAML 解析路径
+
+用法:
+    python scripts/benchmarks/bench_state_decoder.py --pages /path/to/recorded_pages
+    python scripts/benchmarks/bench_state_decoder.py --synthetic 5
+
+``--pages`` 目录下的每个 ``*.html`` 文件视为一份录制的作品页面；未提供时使用
+结构与真实页面一致的合成页面。脚本会校验两条路径的解析结果是否一致，并输出
+每页平均耗时与加速比。YAML 会把 ``undefined`` 等 JavaScript 字面量当作字符串，
+新解析器将其转换为 ``None``，比较时视二者等价。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from statistics import mean
+from time import perf_counter
+
+SRC_PATH = Path(__file__).resolve().parents[2] / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from yaml import safe_load  # noqa: E402
+
+from media_crawler.modules.xhs_downloader.core.expansion.converter import (  # noqa: E402
+    Converter,
+)
+from media_crawler.modules.xhs_downloader.core.expansion.decoder import (  # noqa: E402
+    PREFIX,
+    decode_state,
+)
+
+JS_LITERALS = {"undefined", "NaN", "Infinity", "-Infinity"}
+
+
+def build_synthetic_page(notes: int = 120) -> str:
+    def note(index: int) -> dict:
+        return {
+            "noteId": f"66a{index:021x}",
+            "type": "normal" if index % 3 else "video",
+            "title": f"示例作品 {index} \\u002F “引号” undefined",
+            "desc": "描述 #话题[话题]# " * 20,
+            "time": 1718000000000 + index,
+            "lastUpdateTime": 1718000000000 + index,
+            "ipLocation": "上海",
+            "user": {
+                "userId": f"5b{index:022x}",
+                "nickname": f"作者{index}",
+                "avatar": "https:\\u002F\\u002Fsns-avatar-qc.xhscdn.com\\u002Favatar",
+            },
+            "interactInfo": {
+                "likedCount": str(index * 7),
+                "collectedCount": "10",
+                "commentCount": "3",
+                "shareCount": "1",
+                "followed": False,
+            },
+            "tagList": [
+                {"id": f"t{i}", "name": f"标签{i}", "type": "topic"} for i in range(6)
+            ],
+            "imageList": [
+                {
+                    "width": 1080,
+                    "height": 1440,
+                    "urlDefault": f"http:\\u002F\\u002Fsns-webpic-qc.xhscdn.com\\u002F202406\\u002Fabc\\u002F1040g{index:04d}{i:02d}!nd_dft_wlteh_webp_3",
+                    "livePhoto": False,
+                    "stream": {"h264": [], "h265": []},
+                }
+                for i in range(9)
+            ],
+            "video": None,
+        }
+
+    state = {
+        "global": {"appSettings": {"notificationInterval": 30}},
+        "user": {"loggedIn": False, "userInfo": "__UNDEFINED__"},
+        "feed": {"feeds": [note(i) for i in range(notes)]},
+        "note": {
+            "noteDetailMap": {
+                "-1": {"comments": {"list": [], "cursor": ""}},
+                note(0)["noteId"]: {"note": note(0), "comments": "__UNDEFINED__"},
+            },
+            "serverRequestInfo": {"state": "success", "errorCode": 0},
+        },
+    }
+    script = json.dumps(state, ensure_ascii=False).replace(
+        '"__UNDEFINED__"', "undefined"
+    )
+    script = script.replace("\\\\u002F", "\\u002F")
+    return f"<html><body><script>{PREFIX}{script}</script></body></html>"
+
+
+def load_pages(directory: Path | None, synthetic: int) -> list[tuple[str, str]]:
+    if directory:
+        return [
+            (p.name, p.read_text(encoding="utf-8"))
+            for p in sorted(directory.glob("*.html"))
+        ]
+    return [
+        (f"synthetic_{i}.html", build_synthetic_page(80 + i * 40))
+        for i in range(synthetic)
+    ]
+
+
+def equivalent(json_value, yaml_value) -> bool:
+    if isinstance(yaml_value, str) and yaml_value in JS_LITERALS:
+        return json_value is None
+    if isinstance(json_value, dict) and isinstance(yaml_value, dict):
+        return json_value.keys() == yaml_value.keys() and all(
+            equivalent(json_value[k], yaml_value[k]) for k in json_value
+        )
+    if isinstance(json_value, list) and isinstance(yaml_value, list):
+        return len(json_value) == len(yaml_value) and all(
+            equivalent(i, j) for i, j in zip(json_value, yaml_value)
+        )
+    return json_value == yaml_value
+
+
+def timed(function, text: str, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = perf_counter()
+        function(text)
+        samples.append(perf_counter() - start)
+    return mean(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=Path, default=None, help="录制的作品页面目录")
+    parser.add_argument(
+        "--synthetic", type=int, default=5, help="未提供页面时生成的合成页面数量"
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="每个页面的重复次数")
+    args = parser.parse_args()
+
+    converter = Converter()
+    pages = load_pages(args.pages, args.synthetic)
+    if not pages:
+        print("未找到可用的页面")
+        return 1
+
+    mismatches = 0
+    yaml_total = json_total = 0.0
+    print(
+        f"{'page':<28}{'size(KB)':>10}{'yaml(ms)':>12}{'json(ms)':>12}{'speedup':>10}  match"
+    )
+    for name, html in pages:
+        script = converter._extract_object(html)
+        yaml_time = timed(lambda t: safe_load(t.lstrip(PREFIX)), script, args.rounds)
+        json_time = timed(decode_state, script, args.rounds)
+        same = equivalent(decode_state(script), safe_load(script.lstrip(PREFIX)))
+        mismatches += not same
+        yaml_total += yaml_time
+        json_total += json_time
+        print(
+            f"{name:<28}{len(script) / 1024:>10.1f}{yaml_time * 1000:>12.2f}"
+            f"{json_time * 1000:>12.2f}{yaml_time / json_time:>9.1f}x  {'yes' if same else 'NO'}"
+        )
+    print(
+        f"\n平均加速比: {yaml_total / json_total:.1f}x，结果不一致页面数: {mismatches}"
+    )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from media_crawler.api.http_status import HTTPStatus
 from media_crawler.api.models.result_vo import ResultVO
 from media_crawler.log.logHelper import get_logger
 from media_crawler.modules.xhs_downloader.dependencies import get_xhs_downloader_service
 from media_crawler.modules.xhs_downloader.schemas import (
+    XHSDownloaderBatchRequest,
     XHSDownloaderDetail,
+    XHSDownloaderQueued,
     XHSDownloaderRequest,
 )
 from media_crawler.modules.xhs_downloader.services.xhs_downloader_service import (
@@ -42,3 +45,75 @@ async def fetch_detail(
             code=HTTPStatus.INTERNAL_SERVER_ERROR.code,
             message="获取作品数据失败",
         )
+
+
+@router.post("/details:batch")
+async def stream_details(
+    payload: XHSDownloaderBatchRequest,
+    service: XHSDownloaderService = Depends(get_xhs_downloader_service),
+):
+    """批量提取作品详情，以 NDJSON 格式按完成顺序逐行返回"""
+    if not service.enabled:
+        return ResultVO.error(
+            code=HTTPStatus.BAD_REQUEST.code,
+            message="XHS-Downloader 模块未启用",
+        )
+    if not service.started:
+        return ResultVO.error(
+            code=HTTPStatus.BAD_REQUEST.code,
+            message="XHS-Downloader 服务尚未初始化",
+        )
+
+    async def lines():
+        async for detail in service.stream_details(payload):
+            yield detail.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/queue")
+async def enqueue_links(
+    payload: XHSDownloaderRequest,
+    service: XHSDownloaderService = Depends(get_xhs_downloader_service),
+):
+    """将作品链接推送至监听队列，由后台工作协程并发处理"""
+    if not service.enabled:
+        return ResultVO.error(
+            code=HTTPStatus.BAD_REQUEST.code,
+            message="XHS-Downloader 模块未启用",
+        )
+    try:
+        result: XHSDownloaderQueued = await service.enqueue(payload)
+        return ResultVO.success(data=result.model_dump())
+    except XHSDownloaderError as exc:
+        return ResultVO.error(code=HTTPStatus.BAD_REQUEST.code, message=str(exc))
+
+
+@router.get("/stats")
+async def fetch_statistics(
+    service: XHSDownloaderService = Depends(get_xhs_downloader_service),
+):
+    """查看下载并发等运行时指标"""
+    if not service.enabled:
+        return ResultVO.error(
+            code=HTTPStatus.BAD_REQUEST.code,
+            message="XHS-Downloader 模块未启用",
+        )
+    return ResultVO.success(data=service.statistics())
+
+
+@router.post("/maintenance/sweep")
+async def sweep_directories(
+    service: XHSDownloaderService = Depends(get_xhs_downloader_service),
+):
+    """完整遍历下载目录并删除空文件夹，耗时与目录规模相关"""
+    if not service.enabled:
+        return ResultVO.error(
+            code=HTTPStatus.BAD_REQUEST.code,
+            message="XHS-Downloader 模块未启用",
+        )
+    try:
+        await service.sweep_directories()
+        return ResultVO.success(message="空文件夹清理完成")
+    except XHSDownloaderError as exc:
+        return ResultVO.error(code=HTTPStatus.BAD_REQUEST.code, message=str(exc))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -16,7 +16,7 @@ class XHSDownloaderSettings(BaseModel):
     storage: XHSDownloaderStorageSettings = XHSDownloaderStorageSettings()
     default_cookie: str = ""
     user_agent: Optional[str] = None
-    proxy: Optional[str] = None
+    proxy: Optional[Union[str, List[str]]] = None
     timeout_seconds: int = Field(default=10, ge=1, le=60)
     chunk_size: int = Field(default=2 * 1024 * 1024, ge=1024, le=50 * 1024 * 1024)
     max_retry: int = Field(default=5, ge=1, le=10)
@@ -34,6 +34,40 @@ class XHSDownloaderSettings(BaseModel):
     print_logs: bool = True
     mapping_file: Optional[str] = None
     mapping_data: Dict[str, str] = Field(default_factory=dict)
+    fetch_workers: int = Field(default=4, ge=1, le=32)
+    parse_workers: int = Field(default=2, ge=1, le=16)
+    download_workers: int = Field(default=2, ge=1, le=16)
+    queue_size: int = Field(default=8, ge=1, le=256)
+    monitor_workers: int = Field(default=4, ge=1, le=32)
+    monitor_queue_size: int = Field(default=64, ge=1, le=4096)
+    batch_concurrency: int = Field(default=8, ge=1, le=64)
+    segmented_download: bool = False
+    segment_threshold: int = Field(default=20 * 1024 * 1024, ge=1024 * 1024)
+    segment_count: int = Field(default=4, ge=1, le=16)
+    max_concurrency: int = Field(default=16, ge=1, le=64)
+    record_batch_size: int = Field(default=100, ge=1, le=10000)
+    record_flush_interval: float = Field(default=0.5, ge=0, le=60)
+    proxy_check_interval: float = Field(default=300, ge=10, le=3600)
+    request_rate: float = Field(default=0.5, gt=0, le=50)
+    request_burst: int = Field(default=3, ge=1, le=100)
+    link_cache_size: int = Field(default=1024, ge=1, le=1_000_000)
+    link_cache_ttl: float = Field(default=86400, ge=0)
+    link_cache_persist: bool = False
+    page_cache: bool = False
+    page_cache_ttl: float = Field(default=600, ge=0)
+    page_cache_size: int = Field(default=256 * 1024 * 1024, ge=0)
+    media_dedup: bool = False
+    write_buffer_size: int = Field(
+        default=4 * 1024 * 1024, ge=64 * 1024, le=64 * 1024 * 1024
+    )
+    io_threads: int = Field(default=2, ge=1, le=16)
+    retry_backoff: float = Field(default=0.5, ge=0, le=60)
+    retry_backoff_max: float = Field(default=30, ge=0, le=600)
+    retry_budget_ratio: float = Field(default=0.2, ge=0, le=1)
+    download_journal: bool = True
+    download_bandwidth: int = Field(default=0, ge=0)
+    verify_checksum: bool = False
+    etag_checksum: bool = False
 
 
 __all__ = ["XHSDownloaderSettings", "XHSDownloaderStorageSettings"]
@@ -44,6 +44,7 @@ class CLI:
         self.index = self.__format_index(ctx.params.pop("index"))
         self.path = ctx.params.pop("settings")
         self.update = ctx.params.pop("update_settings")
+        self.sweep = ctx.params.pop("sweep_directories")
         self.settings = Settings(self.__check_settings_path())
         self.parameter = self.settings.run() | self.__clean_params(ctx.params)
         self.APP = XHS(**self.parameter)
@@ -58,6 +59,8 @@ class CLI:
     async def run(self):
         if self.url:
             await self.APP.extract_cli(self.url, index=self.index)
+        if self.sweep:
+            await self.APP.sweep_directories()
         self.__update_settings()
 
     def __update_settings(self):
@@ -201,6 +204,12 @@ class CLI:
                 ),
             ),
             ("--update_settings", "-us", "flag", _("是否更新配置文件")),
+            (
+                "--sweep_directories",
+                "-sd",
+                "flag",
+                fill(_("遍历作品数据根路径与下载文件夹并删除全部空文件夹"), width=55),
+            ),
             ("--help", "-h", "flag", _("查看详细参数说明")),
             ("--version", "-v", "flag", _("查看 XHS-Downloader 版本")),
         )
@@ -327,6 +336,12 @@ class CLI:
     type=bool,
     is_flag=True,
 )
+@option(
+    "--sweep_directories",
+    "-sd",
+    type=bool,
+    is_flag=True,
+)
 @option(
     "-h",
     "--help",
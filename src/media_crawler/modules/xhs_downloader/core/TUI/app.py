@@ -118,7 +118,12 @@ class XHSDownloader(App):
         )
 
     async def close_database(self):
-        await self.APP.id_recorder.cursor.close()
-        await self.APP.id_recorder.database.close()
-        await self.APP.data_recorder.cursor.close()
-        await self.APP.data_recorder.database.close()
+        await self.APP.link_queue.close()
+        await self.APP.stop_resume()
+        await self.APP.id_recorder.close()
+        await self.APP.data_recorder.close()
+        await self.APP.map_recorder.close()
+        await self.APP.link_recorder.close()
+        await self.APP.media_recorder.close()
+        await self.APP.author_recorder.close()
+        await self.APP.journal_recorder.close()
@@ -1,13 +1,23 @@
-from asyncio import Event, Queue, QueueEmpty, create_task, gather, sleep
+from asyncio import (
+    CancelledError,
+    Event,
+    Queue,
+    Semaphore,
+    Task,
+    create_task,
+    gather,
+    sleep,
+    to_thread,
+)
 from contextlib import suppress
 from datetime import datetime
 from re import compile
 from urllib.parse import urlparse
 from textwrap import dedent
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 from fastmcp import FastMCP
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 from pydantic import Field
 
 # from aiohttp import web
@@ -31,21 +41,32 @@ from ..module import (
     VERSION_MAJOR,
     VERSION_MINOR,
     WARNING,
+    AuthorRecorder,
     DataRecorder,
+    ExtractBatchParams,
     ExtractData,
     ExtractParams,
+    ExtractResult,
     IDRecorder,
+    JournalRecorder,
+    LinkCache,
+    LinkRecorder,
     Manager,
     MapRecorder,
+    MediaRecorder,
+    MediaStore,
     logging,
     # sleep_time,
 )
 from ..translation import _, switch_language
 
 from ..module import Mapping
+from .author import Author, AuthorNote
 from .download import Download
 from .explore import Explore
 from .image import Image
+from .link_queue import LinkQueue
+from .pipeline import ExtractTask, Pipeline
 from .request import Html
 from .video import Video
 
@@ -76,6 +97,9 @@ class XHS:
     VERSION_BETA = VERSION_BETA
     LINK = compile(r"(?:https?://)?www\.xiaohongshu\.com/explore/\S+")
     USER = compile(r"(?:https?://)?www\.xiaohongshu\.com/user/profile/[a-z0-9]+/\S+")
+    AUTHOR = compile(
+        r"(?:https?://)?www\.xiaohongshu\.com/user/profile/[a-z0-9]+(?:\?\S*)?$"
+    )
     SHARE = compile(r"(?:https?://)?www\.xiaohongshu\.com/discovery/item/\S+")
     SHORT = compile(r"(?:https?://)?xhslink\.com/[^\s\"<>\\^`{|}，。；！？、【】《》]+")
     ID = compile(r"(?:explore|item)/(\S+)?\?")
@@ -96,7 +120,7 @@ class XHS:
         name_format="发布时间 作者昵称 作品标题",
         user_agent: str = None,
         cookie: str = "",
-        proxy: str | dict = None,
+        proxy: str | list | dict = None,
         timeout=10,
         chunk=1024 * 1024,
         max_retry=5,
@@ -112,6 +136,38 @@ class XHS:
         language="zh_CN",
         read_cookie: int | str = None,
         _print: bool = True,
+        fetch_workers=4,
+        parse_workers=2,
+        download_workers=2,
+        queue_size=8,
+        monitor_workers=4,
+        monitor_queue_size=64,
+        batch_concurrency=8,
+        segmented_download=False,
+        segment_threshold=20 * 1024 * 1024,
+        segment_count=4,
+        max_concurrency=16,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+        proxy_check_interval=300,
+        request_rate=0.5,
+        request_burst=3,
+        link_cache_size=1024,
+        link_cache_ttl=86400,
+        link_cache_persist=False,
+        page_cache=False,
+        page_cache_ttl=600,
+        page_cache_size=256 * 1024 * 1024,
+        media_dedup=False,
+        write_buffer_size=4 * 1024 * 1024,
+        io_threads=2,
+        retry_backoff=0.5,
+        retry_backoff_max=30,
+        retry_budget_ratio=0.2,
+        download_journal=True,
+        download_bandwidth=0,
+        verify_checksum=False,
+        etag_checksum=False,
         *args,
         **kwargs,
     ):
@@ -138,6 +194,31 @@ class XHS:
             write_mtime,
             _print,
             self.CLEANER,
+            segmented_download,
+            segment_threshold,
+            segment_count,
+            max_concurrency,
+            record_batch_size,
+            record_flush_interval,
+            proxy_check_interval,
+            request_rate,
+            request_burst,
+            link_cache_size,
+            link_cache_ttl,
+            link_cache_persist,
+            page_cache,
+            page_cache_ttl,
+            page_cache_size,
+            media_dedup,
+            write_buffer_size,
+            io_threads,
+            retry_backoff,
+            retry_backoff_max,
+            retry_budget_ratio,
+            download_journal,
+            download_bandwidth,
+            verify_checksum,
+            etag_checksum,
         )
         self.mapping_data = mapping_data or {}
         self.map_recorder = MapRecorder(
@@ -149,12 +230,43 @@ class XHS:
         self.video = Video()
         self.explore = Explore()
         self.convert = Converter()
-        self.download = Download(self.manager)
+        self.media_recorder = MediaRecorder(self.manager)
+        self.media_store = MediaStore(self.manager, self.media_recorder)
+        self.journal_recorder = JournalRecorder(self.manager)
+        self.download = Download(
+            self.manager,
+            self.media_store,
+            self.journal_recorder,
+        )
         self.id_recorder = IDRecorder(self.manager)
         self.data_recorder = DataRecorder(self.manager)
+        self.link_recorder = LinkRecorder(self.manager)
+        self.link_cache = LinkCache(
+            self.link_recorder,
+            self.manager.link_cache_size,
+            self.manager.link_cache_ttl,
+        )
+        self.author_recorder = AuthorRecorder(self.manager)
+        self.author = Author(self.html, self.author_recorder)
+        self.author_limit = Semaphore(max(1, int(fetch_workers)))
+        self.batch_limit = Semaphore(max(1, int(batch_concurrency)))
         self.clipboard_cache: str = ""
-        self.queue = Queue()
+        self.resume_task: Task | None = None
+        self.link_queue = LinkQueue(
+            self.__handle_link,
+            monitor_workers,
+            monitor_queue_size,
+        )
+        self.monitor_pushes: set[Task] = set()
         self.event = Event()
+        self.pipeline = Pipeline(
+            (
+                (self.__fetch_stage, fetch_workers),
+                (self.__parse_stage, parse_workers),
+                (self.__download_stage, download_workers),
+            ),
+            queue_size,
+        )
 
     def __extract_image(self, container: dict, data: Namespace):
         container["下载地址"], container["动图地址"] = self.image.get_image_link(
@@ -174,29 +286,39 @@ class XHS:
         index,
         log,
         bar,
-    ):
+        limit=None,
+    ) -> bool:
+        """返回作品文件是否全部下载成功，存在下载记录而跳过时视为成功"""
         name = self.__naming_rules(container)
+        success = True
         if (u := container["下载地址"]) and download:
             if await self.skip_download(i := container["作品ID"]):
                 logging(log, _("作品 {0} 存在下载记录，跳过下载").format(i))
             else:
-                path, result = await self.download.run(
-                    u,
-                    container["动图地址"],
-                    index,
-                    container["作者ID"]
-                    + "_"
-                    + self.CLEANER.filter_name(container["作者昵称"]),
-                    name,
-                    container["作品类型"],
-                    container["时间戳"],
-                    log,
-                    bar,
-                )
+                # 作者文件夹重命名期间等待重命名完成后再下载
+                async with self.mapping.downloading(container["作者ID"]):
+                    path, result = await self.download.run(
+                        u,
+                        container["动图地址"],
+                        index,
+                        container["作者ID"]
+                        + "_"
+                        + self.CLEANER.filter_name(container["作者昵称"]),
+                        name,
+                        container["作品类型"],
+                        container["时间戳"],
+                        log,
+                        bar,
+                        i,
+                        limit,
+                    )
                 await self.__add_record(i, result)
+                success = all(result)
         elif not u:
             logging(log, _("提取作品文件下载地址失败"), ERROR)
+            success = False
         await self.save_data(container)
+        return success
 
     @data_cache
     async def save_data(
@@ -226,11 +348,12 @@ class XHS:
         urls = await self.extract_links(url, log)
         if not urls:
             logging(log, _("提取小红书作品链接失败"), WARNING)
-        else:
-            logging(log, _("共 {0} 个小红书作品待处理...").format(len(urls)))
+            return []
+        urls, authors = await self.__expand_authors(urls, log)
+        logging(log, _("共 {0} 个小红书作品待处理...").format(len(urls)))
         # return urls  # 调试代码
-        return [
-            await self.__deal_extract(
+        tasks = [
+            ExtractTask(
                 i,
                 download,
                 index,
@@ -240,6 +363,80 @@ class XHS:
             )
             for i in urls
         ]
+        results = await self.pipeline.run(tasks)
+        if download:
+            await self.__commit_authors(authors, tasks)
+        return results
+
+    async def sync_authors(
+        self,
+        urls: list[str],
+        download=True,
+        log=None,
+        bar=None,
+        data=False,
+        cookie: str = None,
+        proxy: str = None,
+    ) -> list[dict]:
+        """增量同步作者主页：只处理上次同步之后发布的作品，全部处理成功后更新同步进度"""
+        urls, authors = await self.__expand_authors(urls, log, cookie, proxy)
+        tasks = [
+            ExtractTask(
+                i,
+                download,
+                None,
+                log,
+                bar,
+                data,
+                cookie,
+                proxy,
+            )
+            for i in urls
+        ]
+        results = await self.pipeline.run(tasks)
+        if download:
+            await self.__commit_authors(authors, tasks)
+        return results
+
+    async def __expand_authors(
+        self,
+        urls: list[str],
+        log,
+        cookie: str = None,
+        proxy: str = None,
+    ) -> tuple[list[str], list[tuple[str, list[AuthorNote]]]]:
+        """将作者主页链接替换为新发布的作品链接，作者的作品排在列表末尾"""
+
+        async def crawl(url: str) -> tuple[str, list[AuthorNote]]:
+            async with self.author_limit:
+                id_, notes = await self.author.run(url, log, cookie, proxy)
+            logging(log, _("作者 {0} 共 {1} 个新作品").format(id_, len(notes)))
+            return id_, notes
+
+        authors = await gather(*(crawl(i) for i in urls if self.AUTHOR.search(i)))
+        urls = [i for i in urls if not self.AUTHOR.search(i)]
+        for __, notes in authors:
+            urls.extend(i.url for i in notes)
+        return urls, [i for i in authors if i[0]]
+
+    async def __commit_authors(
+        self,
+        authors: list[tuple[str, list[AuthorNote]]],
+        tasks: list[ExtractTask],
+    ) -> None:
+        start = len(tasks) - sum(len(i) for __, i in authors)
+        for id_, notes in authors:
+            failed = [
+                note.id
+                for note, task in zip(notes, tasks[start : start + len(notes)])
+                if not task.success
+            ]
+            # 同步进度只推进到最早的失败作品之前，失败的作品在下次同步时重新处理
+            await self.author.commit(
+                id_,
+                [i for i in notes if not failed or i.id < min(failed)],
+            )
+            start += len(notes)
 
     async def extract_cli(
         self,
@@ -254,7 +451,9 @@ class XHS:
         if not url:
             logging(log, _("提取小红书作品链接失败"), WARNING)
             return
-        if index:
+        if any(self.AUTHOR.search(i) for i in url):
+            await self.sync_authors(url, download, log, bar, data)
+        elif index:
             await self.__deal_extract(
                 url[0],
                 download,
@@ -264,26 +463,31 @@ class XHS:
                 data,
             )
         else:
-            [
-                await self.__deal_extract(
-                    u,
-                    download,
-                    index,
-                    log,
-                    bar,
-                    data,
-                )
-                for u in url
-            ]
+            await self.pipeline.run(
+                [
+                    ExtractTask(
+                        u,
+                        download,
+                        index,
+                        log,
+                        bar,
+                        data,
+                    )
+                    for u in url
+                ]
+            )
 
     async def extract_links(self, url: str, log) -> list:
         urls = []
         for i in url.split():
             if u := self.SHORT.search(i):
-                i = await self.html.request_url(
+                i = await self.link_cache.resolve(
                     u.group(),
-                    False,
-                    log,
+                    lambda x: self.html.request_url(
+                        x,
+                        False,
+                        log,
+                    ),
                 )
             if u := self.SHARE.search(i):
                 urls.append(u.group())
@@ -291,6 +495,8 @@ class XHS:
                 urls.append(u.group())
             elif u := self.USER.search(i):
                 urls.append(u.group())
+            elif u := self.AUTHOR.search(i):
+                urls.append(u.group())
         return urls
 
     def extract_id(self, links: list[str]) -> list[str]:
@@ -312,27 +518,141 @@ class XHS:
         data: bool,
         cookie: str = None,
         proxy: str = None,
+        bandwidth: int = None,
     ):
-        if await self.skip_download(i := self.__extract_link_id(url)) and not data:
-            msg = _("作品 {0} 存在下载记录，跳过处理").format(i)
-            logging(log, msg)
-            return {"message": msg}
-        logging(log, _("开始处理作品：{0}").format(i))
-        html = await self.html.request_url(
+        task = ExtractTask(
             url,
-            log=log,
-            cookie=cookie,
-            proxy=proxy,
+            download,
+            index,
+            log,
+            bar,
+            data,
+            cookie,
+            proxy,
+            limit=self.manager.bandwidth.job(bandwidth),
+        )
+        return await self.__run_task(task)
+
+    async def __run_task(self, task: ExtractTask) -> dict:
+        for stage in (
+            self.__fetch_stage,
+            self.__parse_stage,
+            self.__download_stage,
+        ):
+            await stage(task)
+            if task.done:
+                break
+        return task.result
+
+    async def extract_stream(
+        self,
+        urls: list[str],
+        download=False,
+        index: list | tuple = None,
+        log=None,
+        bar=None,
+        data=True,
+        cookie: str = None,
+        proxy: str = None,
+        bandwidth: int = None,
+    ) -> AsyncIterator[tuple[str, dict | None]]:
+        """并发处理多个作品链接，按完成顺序逐个返回链接与作品数据
+
+        提取链接失败时返回原始文本与 None，处理失败时返回空字典。
+        """
+        results = Queue()
+        limit = self.manager.bandwidth.job(bandwidth)
+
+        async def run(text: str) -> None:
+            async with self.batch_limit:
+                try:
+                    links = await self.extract_links(text, log)
+                except Exception as error:
+                    logging(
+                        log,
+                        _("{0} 处理异常，错误信息: {1}").format(text, repr(error)),
+                        ERROR,
+                    )
+                    links = []
+                if not links:
+                    await results.put((text, None))
+                for url in links:
+                    try:
+                        result = await self.__run_task(
+                            ExtractTask(
+                                url,
+                                download,
+                                index,
+                                log,
+                                bar,
+                                data,
+                                cookie,
+                                proxy,
+                                limit=limit,
+                            )
+                        )
+                    except Exception as error:
+                        logging(
+                            log,
+                            _("{0} 处理异常，错误信息: {1}").format(url, repr(error)),
+                            ERROR,
+                        )
+                        result = {}
+                    await results.put((url, result))
+
+        async def close() -> None:
+            await gather(*tasks)
+            await results.put(None)
+
+        tasks = [create_task(run(i)) for i in urls]
+        closer = create_task(close())
+        try:
+            while (item := await results.get()) is not None:
+                yield item
+        finally:
+            # 客户端断开连接时取消尚未完成的链接，并等待其释放信号量与文件
+            for task in (*tasks, closer):
+                task.cancel()
+            await gather(*tasks, closer, return_exceptions=True)
+
+    async def __fetch_stage(self, task: ExtractTask) -> None:
+        if (
+            await self.skip_download(i := self.__extract_link_id(task.url))
+            and not task.data
+        ):
+            msg = _("作品 {0} 存在下载记录，跳过处理").format(i)
+            logging(task.log, msg)
+            task.success = True
+            task.finish({"message": msg})
+            return
+        task.id = i
+        logging(task.log, _("开始处理作品：{0}").format(i))
+        if task.data and (html := await self.manager.page_cache.get(i)):
+            task.html, task.cached = html, True
+            return
+        task.html = await self.html.request_url(
+            task.url,
+            log=task.log,
+            cookie=task.cookie,
+            proxy=task.proxy,
         )
-        namespace = self.__generate_data_object(html)
+
+    async def __parse_stage(self, task: ExtractTask) -> None:
+        html, task.html = task.html, ""
+        namespace = await to_thread(self.__generate_data_object, html)
         if not namespace:
-            logging(log, _("{0} 获取数据失败").format(i), ERROR)
-            return {}
+            logging(task.log, _("{0} 获取数据失败").format(task.id), ERROR)
+            task.finish({})
+            return
         data = self.explore.run(namespace)
         # logging(log, data)  # 调试代码
         if not data:
-            logging(log, _("{0} 提取数据失败").format(i), ERROR)
-            return {}
+            logging(task.log, _("{0} 提取数据失败").format(task.id), ERROR)
+            task.finish({})
+            return
+        if not task.cached:
+            # 仅缓存能够成功提取数据的页面，避免缓存风控页面
+            await self.manager.page_cache.put(task.id, html)
         if data["作品类型"] == _("视频"):
             self.__extract_video(data, namespace)
         elif data["作品类型"] in {
@@ -341,14 +661,25 @@ class XHS:
         }:
             self.__extract_image(data, namespace)
         else:
-            logging(log, _("未知的作品类型：{0}").format(i), WARNING)
+            logging(task.log, _("未知的作品类型：{0}").format(task.id), WARNING)
             data["下载地址"] = []
             data["动图地址"] = []
-        await self.update_author_nickname(data, log)
-        await self.__download_files(data, download, index, log, bar)
-        logging(log, _("作品处理完成：{0}").format(i))
+        await self.update_author_nickname(data, task.log)
+        task.container = data
+
+    async def __download_stage(self, task: ExtractTask) -> None:
+        data = task.container
+        task.success = await self.__download_files(
+            data,
+            task.download,
+            task.index,
+            task.log,
+            task.bar,
+            task.limit,
+        )
+        logging(task.log, _("作品处理完成：{0}").format(task.id))
         # await sleep_time()
-        return data
+        task.finish(data)
 
     async def update_author_nickname(
         self,
@@ -430,50 +761,140 @@ class XHS:
         )
         self.event.clear()
         copy("")
-        await gather(
-            self.__get_link(delay),
-            self.__receive_link(delay, download, None, log, bar, data),
-        )
+        await self.__get_link(delay, download, log, bar, data)
+        # 停止监听后等待已读取的链接处理完成
+        await gather(*self.monitor_pushes)
+        await self.link_queue.join()
 
-    async def __get_link(self, delay: int):
+    async def __get_link(self, delay: int, *args):
         while not self.event.is_set():
             if (t := paste()).lower() == "close":
                 self.stop_monitor()
             elif t != self.clipboard_cache:
                 self.clipboard_cache = t
-                create_task(self.__push_link(t))
+                push = create_task(self.enqueue_links(t, *args))
+                self.monitor_pushes.add(push)
+                push.add_done_callback(self.monitor_pushes.discard)
             await sleep(delay)
 
-    async def __push_link(
+    async def enqueue_links(
         self,
         content: str,
-    ):
-        await gather(
-            *[self.queue.put(i) for i in await self.extract_links(content, None)]
-        )
+        download=False,
+        log=None,
+        bar=None,
+        data=True,
+        index: list | tuple = None,
+        cookie: str = None,
+        proxy: str = None,
+        bandwidth: int = None,
+    ) -> list[str]:
+        """将文本中的作品链接或作者主页链接加入监听队列，返回成功入队的链接"""
+        urls = []
+        # 同一次推送的作品共享带宽上限
+        limit = self.manager.bandwidth.job(bandwidth)
+        for url in await self.extract_links(content, log):
+            if await self.link_queue.put(
+                ExtractTask(
+                    url,
+                    download,
+                    index,
+                    log,
+                    bar,
+                    data,
+                    cookie,
+                    proxy,
+                    limit=limit,
+                )
+            ):
+                urls.append(url)
+        return urls
 
-    async def __receive_link(self, delay: int, *args, **kwargs):
-        while not self.event.is_set() or self.queue.qsize() > 0:
-            with suppress(QueueEmpty):
-                await self.__deal_extract(self.queue.get_nowait(), *args, **kwargs)
-            await sleep(delay)
+    async def __handle_link(self, task: ExtractTask) -> None:
+        if self.AUTHOR.search(task.url):
+            await self.sync_authors(
+                [task.url],
+                task.download,
+                task.log,
+                task.bar,
+                task.data,
+                task.cookie,
+                task.proxy,
+            )
+        else:
+            await self.__run_task(task)
 
     def stop_monitor(self):
         self.event.set()
 
+    def statistics(self) -> dict:
+        return {
+            "download_concurrency": self.manager.download_concurrency.stats(),
+            "proxy_pool": self.manager.proxy_pool.stats(),
+            "request_rate": self.manager.rate_limiter.stats(),
+            "link_cache": self.link_cache.stats(),
+            "page_cache": self.manager.page_cache.stats(),
+            "media_store": self.media_store.stats(),
+            "retry": self.manager.retry_policy.stats(),
+            "bandwidth": self.manager.bandwidth.stats(),
+            "directory_index": self.manager.directory_index.stats(),
+            "rename": self.mapping.stats(),
+            "link_queue": self.link_queue.stats(),
+        }
+
+    async def resume_downloads(self, log=None, bar=None) -> None:
+        """继续下载上次运行中断时未完成的文件，作品的文件全部下载成功后写入下载记录"""
+        for id_, result in (await self.download.resume(log, bar)).items():
+            # 作品的其他文件可能在上次运行中下载失败，仅在日志中全部文件完成时写入记录
+            if all(result) and await self.journal_recorder.completed(id_):
+                await self.__add_record(id_, result)
+
+    async def stop_resume(self) -> None:
+        if self.resume_task:
+            self.resume_task.cancel()
+            with suppress(CancelledError):
+                await self.resume_task
+            self.resume_task = None
+
+    async def sweep_directories(self, log=None) -> bool:
+        """完整遍历作品数据根路径与下载文件夹并删除空文件夹，用于手动维护；存在进行中的下载时不清理"""
+        async with self.download.sweeping:
+            if self.download.running:
+                logging(log, _("存在进行中的下载任务，跳过清理空文件夹"), WARNING)
+                return False
+            logging(log, _("开始清理空文件夹"))
+            await to_thread(self.manager.sweep_directories)
+        logging(log, _("空文件夹清理完成"))
+        return True
+
     async def skip_download(self, id_: str) -> bool:
         return bool(await self.id_recorder.select(id_))
 
     async def __aenter__(self):
+        self.manager.proxy_pool.start()
         await self.id_recorder.__aenter__()
         await self.data_recorder.__aenter__()
         await self.map_recorder.__aenter__()
+        await self.link_recorder.__aenter__()
+        await self.media_recorder.__aenter__()
+        await self.author_recorder.__aenter__()
+        await self.journal_recorder.__aenter__()
+        await self.mapping.resume()
+        if self.manager.download_journal:
+            self.resume_task = create_task(self.resume_downloads())
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
+        # 先停止后台任务，避免其在数据库关闭后继续写入
+        await self.link_queue.close()
+        await self.stop_resume()
         await self.id_recorder.__aexit__(exc_type, exc_value, traceback)
         await self.data_recorder.__aexit__(exc_type, exc_value, traceback)
         await self.map_recorder.__aexit__(exc_type, exc_value, traceback)
+        await self.link_recorder.__aexit__(exc_type, exc_value, traceback)
+        await self.media_recorder.__aexit__(exc_type, exc_value, traceback)
+        await self.author_recorder.__aexit__(exc_type, exc_value, traceback)
+        await self.journal_recorder.__aexit__(exc_type, exc_value, traceback)
         await self.close()
 
     async def close(self):
@@ -612,6 +1033,49 @@ class XHS:
                     msg = _("获取小红书作品数据失败")
             return ExtractData(message=msg, params=extract, data=data)
 
+        @server.post(
+            "/xhs/detail/batch",
+            summary=_("批量获取作品数据及下载地址"),
+            description=_(
+                dedent("""
+                **参数**:
+
+                - **urls**: 小红书作品链接列表，每一项可包含多个链接；必需参数
+                - **download**: 是否下载作品文件；可选参数
+                - **index**: 下载指定序号的图片文件，仅对图文作品生效；可选参数
+                - **cookie**: 请求数据时使用的 Cookie；可选参数
+                - **proxy**: 请求数据时使用的代理；可选参数
+                - **skip**: 是否跳过存在下载记录的作品；可选参数
+
+                **返回**: NDJSON 数据流，每个作品处理完成后立即返回一行，行的顺序与链接顺序无关
+                """)
+            ),
+            tags=["API"],
+        )
+        async def handle_batch(extract: ExtractBatchParams):
+            async def stream():
+                async for url, data in self.extract_stream(
+                    extract.urls,
+                    extract.download,
+                    extract.index,
+                    None,
+                    None,
+                    not extract.skip,
+                    extract.cookie,
+                    extract.proxy,
+                ):
+                    if data is None:
+                        msg = _("提取小红书作品链接失败")
+                    elif data:
+                        msg = _("获取小红书作品数据成功")
+                    else:
+                        msg = _("获取小红书作品数据失败")
+                    yield ExtractResult(
+                        url=url, message=msg, data=data
+                    ).model_dump_json() + "\n"
+
+            return StreamingResponse(stream(), media_type="application/x-ndjson")
+
     async def run_mcp_server(
         self,
         transport="streamable-http",
@@ -0,0 +1,180 @@
+from json import JSONDecodeError, loads
+from re import compile
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode
+
+from ..expansion import Converter
+from ..module import ERROR, WARNING, logging
+from ..translation import _
+
+if TYPE_CHECKING:
+    from ..module import AuthorRecorder
+    from .request import Html
+
+__all__ = ["Author", "AuthorNote"]
+
+
+class AuthorNote:
+    def __init__(self, id_: str, token: str = "", sticky: bool = False):
+        self.id = id_
+        self.token = token
+        self.sticky = sticky
+
+    @property
+    def url(self) -> str:
+        query = (
+            "?" + urlencode({"xsec_token": self.token, "xsec_source": "pc_user"})
+            if self.token
+            else ""
+        )
+        return f"https://www.xiaohongshu.com/explore/{self.id}{query}"
+
+
+class AuthorConverter(Converter):
+    KEYS_LINK = ("user",)
+
+
+class Author:
+    """分页获取作者发布的作品，遇到上次同步时的最新作品后停止
+
+    作品 ID 的前 8 位为十六进制发布时间戳，ID 的字典序即发布先后顺序，
+    因此每位作者只需记录已处理的最新作品 ID；置顶作品不受排序约束，不作为停止条件。
+    """
+
+    PROFILE = compile(r"user/profile/([a-z0-9]+)")
+    POSTED = "https://edith.xiaohongshu.com/api/sns/web/v1/user_posted"
+    PAGE_SIZE = 30
+    MAX_PAGES = 100
+
+    def __init__(
+        self,
+        html: "Html",
+        recorder: "AuthorRecorder",
+    ):
+        self.html = html
+        self.recorder = recorder
+        self.convert = AuthorConverter()
+
+    async def run(
+        self,
+        url: str,
+        log=None,
+        cookie: str = None,
+        proxy: str = None,
+    ) -> tuple[str, list[AuthorNote]]:
+        """返回作者 ID 与上次同步之后发布的作品，按发布时间从新到旧排列"""
+        if not (id_ := self.extract_id(url)):
+            return "", []
+        mark = row[0] if (row := await self.recorder.select(id_)) else ""
+        html = await self.html.request_url(
+            url,
+            log=log,
+            cookie=cookie,
+            proxy=proxy,
+        )
+        if not (user := self.convert.run(html)):
+            logging(log, _("获取作者 {0} 主页数据失败").format(id_), ERROR)
+            return id_, []
+        notes, cursor, more = self.parse_profile(user)
+        result, seen = [], set()
+        for __ in range(self.MAX_PAGES):
+            for note in notes:
+                if note.id <= mark:
+                    if note.sticky:
+                        continue
+                    return id_, result
+                if note.id not in seen:
+                    seen.add(note.id)
+                    result.append(note)
+            if not (more and cursor):
+                break
+            notes, cursor, more = await self.__request_page(
+                id_,
+                cursor,
+                log,
+                cookie,
+                proxy,
+            )
+        return id_, result
+
+    async def commit(self, id_: str, notes: list[AuthorNote]) -> None:
+        """作品全部处理成功后更新作者的高水位线"""
+        if notes:
+            mark = row[0] if (row := await self.recorder.select(id_)) else ""
+            await self.recorder.add(id_, max(mark, *(i.id for i in notes)))
+
+    @classmethod
+    def extract_id(cls, url: str) -> str:
+        return i.group(1) if (i := cls.PROFILE.search(url)) else ""
+
+    @staticmethod
+    def parse_profile(user: dict) -> tuple[list[AuthorNote], str, bool]:
+        notes = Converter.deep_get(user, ("notes", "[0]")) or []
+        query = Converter.deep_get(user, ("noteQueries", "[0]")) or {}
+        return (
+            [
+                AuthorNote(
+                    i.get("id") or Converter.deep_get(i, ("noteCard", "noteId")),
+                    i.get("xsecToken", ""),
+                    bool(Converter.deep_get(i, ("noteCard", "interactInfo", "sticky"))),
+                )
+                for i in notes
+                if i.get("id") or Converter.deep_get(i, ("noteCard", "noteId"))
+            ],
+            query.get("cursor", ""),
+            bool(query.get("hasMore")),
+        )
+
+    @staticmethod
+    def parse_page(data: dict) -> tuple[list[AuthorNote], str, bool]:
+        return (
+            [
+                AuthorNote(
+                    i["note_id"],
+                    i.get("xsec_token", ""),
+                    bool(Converter.deep_get(i, ("interact_info", "sticky"))),
+                )
+                for i in data.get("notes", [])
+                if i.get("note_id")
+            ],
+            data.get("cursor", ""),
+            bool(data.get("has_more")),
+        )
+
+    async def __request_page(
+        self,
+        id_: str,
+        cursor: str,
+        log,
+        cookie: str = None,
+        proxy: str = None,
+    ) -> tuple[list[AuthorNote], str, bool]:
+        url = f"{self.POSTED}?" + urlencode(
+            {
+                "num": self.PAGE_SIZE,
+                "cursor": cursor,
+                "user_id": id_,
+                "image_formats": "jpg,webp,avif",
+            }
+        )
+        text = await self.html.request_url(
+            url,
+            log=log,
+            cookie=cookie,
+            proxy=proxy,
+        )
+        try:
+            data = loads(text)
+        except JSONDecodeError:
+            data = {}
+        if not data.get("success"):
+            # 作品列表接口需要有效的登录 Cookie，无法访问时仅同步主页中的作品
+            logging(
+                log,
+                _("获取作者 {0} 作品列表失败: {1}").format(
+                    id_, data.get("msg") or text[:64]
+                ),
+                WARNING,
+            )
+            return [], "", False
+        return self.parse_page(data.get("data") or {})
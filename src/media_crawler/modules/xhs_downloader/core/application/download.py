@@ -1,34 +1,70 @@
-from asyncio import Semaphore, gather
+from asyncio import Lock, gather, shield, to_thread
+from contextlib import asynccontextmanager
+from json import JSONDecodeError, dumps, loads
+from os import replace, truncate
 from pathlib import Path
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
 from aiofiles import open
 from httpx import HTTPError
 
-from ..expansion import CacheError
+from ..expansion import CacheError, IntegrityError
 
 # from ..module import WARNING
 from ..module import (
     ERROR,
     FILE_SIGNATURES,
+    Failure,
     FILE_SIGNATURES_LENGTH,
-    MAX_WORKERS,
+    WARNING,
     logging,
     # sleep_time,
 )
 from ..module import retry as re_download
+from ..module.integrity import StreamVerifier
 from ..translation import _
 
 if TYPE_CHECKING:
     from httpx import AsyncClient
 
-    from ..module import Manager
+    from ..module import JournalRecorder, Manager, MediaStore
+    from ..module.concurrency import Slot
+    from ..module.rate_limit import TokenBucket
 
 __all__ = ["Download"]
 
 
+class SegmentProgress:
+    """分段下载进度文件，按时间间隔在工作线程中保存，避免在下载循环中执行同步文件 I/O
+
+    分段完成或中断时立即保存；进度文件先写入临时文件再替换，读取时不会得到不完整的内容。
+    """
+
+    INTERVAL = 1
+
+    def __init__(self, file: Path, segments: dict):
+        self.file = file
+        self.segments = segments
+        self.lock = Lock()
+        self.saved = 0.0
+
+    async def update(self) -> None:
+        if monotonic() - self.saved >= self.INTERVAL:
+            await self.save()
+
+    async def save(self) -> None:
+        async with self.lock:
+            self.saved = monotonic()
+            await to_thread(self.__write, dumps(self.segments))
+
+    def __write(self, data: str) -> None:
+        temp = self.file.with_name(f"{self.file.name}.tmp")
+        temp.write_text(data, encoding="utf-8")
+        replace(temp, self.file)
+
+
 class Download:
-    SEMAPHORE = Semaphore(MAX_WORKERS)
     CONTENT_TYPE_MAP = {
         "image/png": "png",
         "image/jpeg": "jpeg",
@@ -42,14 +78,19 @@ class Download:
     def __init__(
         self,
         manager: "Manager",
+        store: "MediaStore",
+        journal: "JournalRecorder",
     ):
         self.manager = manager
+        self.store = store
+        self.journal = journal
         self.folder = manager.folder
         self.temp = manager.temp
         self.chunk = manager.chunk
         self.client: "AsyncClient" = manager.download_client
         self.headers = manager.blank_headers
         self.retry = manager.retry
+        self.retry_policy = manager.retry_policy
         self.folder_mode = manager.folder_mode
         self.video_format = "mp4"
         self.live_format = "mp4"
@@ -66,6 +107,29 @@ class Download:
         self.live_download = manager.live_download
         self.author_archive = manager.author_archive
         self.write_mtime = manager.write_mtime
+        self.segmented_download = manager.segmented_download
+        self.segment_threshold = manager.segment_threshold
+        self.segment_count = manager.segment_count
+        self.concurrency = manager.download_concurrency
+        self.writer = manager.writer_pool
+        self.write_buffer_size = manager.write_buffer_size
+        self.bandwidth = manager.bandwidth
+        self.verify_checksum = manager.verify_checksum
+        self.etag_checksum = manager.etag_checksum
+        self.requeue: set[str] = set()
+        self.index = manager.directory_index
+        self.running = 0
+        self.sweeping = Lock()
+
+    @asynccontextmanager
+    async def active(self):
+        """记录进行中的下载；清理空文件夹期间持有 sweeping 锁，新的下载等待清理结束后开始"""
+        async with self.sweeping:
+            self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
 
     async def run(
         self,
@@ -78,43 +142,98 @@ class Download:
         mtime: int,
         log,
         bar,
+        id_: str = "",
+        limit: "TokenBucket" = None,
     ) -> tuple[Path, list[Any]]:
-        path = self.__generate_path(nickname, filename)
-        if type_ == _("视频"):
-            tasks = self.__ready_download_video(
-                urls,
-                path,
-                filename,
-                log,
-            )
-        elif type_ in {
-            _("图文"),
-            _("图集"),
-        }:
-            tasks = self.__ready_download_image(
-                urls,
-                lives,
-                index,
-                path,
-                filename,
-                log,
-            )
-        else:
-            raise ValueError
-        tasks = [
-            self.__download(
-                url,
-                path,
-                name,
-                format_,
-                mtime,
-                log,
-                bar,
+        async with self.active():
+            path = self.__generate_path(nickname, filename)
+            if type_ == _("视频"):
+                tasks = self.__ready_download_video(
+                    urls,
+                    path,
+                    filename,
+                    log,
+                )
+            elif type_ in {
+                _("图文"),
+                _("图集"),
+            }:
+                tasks = self.__ready_download_image(
+                    urls,
+                    lives,
+                    index,
+                    path,
+                    filename,
+                    log,
+                )
+            else:
+                raise ValueError
+            for url, name, format_ in tasks:
+                await self.journal.add(id_, name, url, path, format_, mtime)
+            tasks = [
+                self.__track(
+                    url,
+                    path,
+                    name,
+                    format_,
+                    mtime,
+                    log,
+                    bar,
+                    limit,
+                )
+                for url, name, format_ in tasks
+            ]
+            tasks = await gather(*tasks)
+            return path, tasks
+
+    async def resume(self, log=None, bar=None) -> dict[str, list[Any]]:
+        """继续下载日志中未完成的文件任务，返回每个作品的下载结果"""
+        notes: dict[str, list] = {}
+        for row in await self.journal.unfinished():
+            notes.setdefault(row["NOTE"], []).append(row)
+        results = {}
+        for id_, rows in notes.items():
+            logging(log, _("继续下载作品 {0} 的 {1} 个文件").format(id_, len(rows)))
+            async with self.active():
+                results[id_] = await gather(
+                    *(
+                        self.__resume_file(
+                            i["URL"],
+                            Path(i["PATH"]),
+                            i["NAME"],
+                            i["FORMAT"],
+                            i["MTIME"],
+                            log,
+                            bar,
+                        )
+                        for i in rows
+                    )
+                )
+        return results
+
+    async def __resume_file(
+        self,
+        url: str,
+        path: Path,
+        name: str,
+        format_: str,
+        mtime: int,
+        log,
+        bar,
+    ):
+        formats = (
+            self.image_format_list if format_ in self.image_format_list else (format_,)
+        )
+        # 文件已保存但完成状态尚未写入日志时直接标记完成
+        if any(self.__check_exists_path(path, f"{name}.{s}", log) for s in formats):
+            await self.journal.update(
+                self.journal.key(path, name, format_),
+                self.journal.COMPLETED,
             )
-            for url, name, format_ in tasks
-        ]
-        tasks = await gather(*tasks)
-        return path, tasks
+            return True
+        path.mkdir(parents=True, exist_ok=True)
+        self.manager.record_directory(path)
+        return await self.__track(url, path, name, format_, mtime, log, bar)
 
     def __generate_path(self, nickname: str, filename: str):
         if self.author_archive:
@@ -124,6 +243,7 @@ class Download:
             folder = self.folder
         path = self.manager.archive(folder, filename, self.folder_mode)
         path.mkdir(exist_ok=True)
+        self.manager.record_directory(path)
         return path
 
     def __ready_download_video(
@@ -186,17 +306,54 @@ class Download:
             return True
         return False
 
-    @staticmethod
     def __check_exists_path(
+        self,
         path: Path,
         name: str,
         log,
     ) -> bool:
-        if path.joinpath(name).exists():
+        if self.index.exists(path, name):
             logging(log, _("{0} 文件已存在，跳过下载").format(name))
             return True
         return False
 
+    async def __track(
+        self,
+        url: str,
+        path: Path,
+        name: str,
+        format_: str,
+        mtime: int,
+        log,
+        bar,
+        limit: "TokenBucket" = None,
+    ):
+        key = self.journal.key(path, name, format_)
+        self.requeue.discard(key)
+        if self.journal.running(key):
+            logging(log, _("文件 {0} 正在下载，跳过下载").format(name), WARNING)
+            return False
+        await self.journal.update(key, self.journal.RUNNING)
+        if result := await self.__download(
+            url,
+            path,
+            name,
+            format_,
+            mtime,
+            log,
+            bar,
+            limit,
+        ):
+            return result
+        # 完整性校验失败的文件重新排队，下次启动时继续下载
+        await self.journal.update(
+            key,
+            self.journal.QUEUED if key in self.requeue else self.journal.FAILED,
+            self.__get_resume_byte_position(self.temp.joinpath(f"{name}.{format_}")),
+        )
+        self.requeue.discard(key)
+        return result
+
     @re_download
     async def __download(
         self,
@@ -207,8 +364,9 @@ class Download:
         mtime: int,
         log,
         bar,
+        limit: "TokenBucket" = None,
     ):
-        async with self.SEMAPHORE:
+        async with self.concurrency.slot(url) as slot:
             headers = self.headers.copy()
             # try:
             #     length, suffix = await self.__head_file(
@@ -226,32 +384,35 @@ class Download:
             #     return False
             # temp = self.temp.joinpath(f"{name}.{suffix}")
             temp = self.temp.joinpath(f"{name}.{format_}")
-            self.__update_headers_range(
-                headers,
-                temp,
-            )
+            head, digest = b"", None
             try:
-                async with self.client.stream(
-                    "GET",
+                if segments := await self.__ready_segments(
                     url,
-                    headers=headers,
-                ) as response:
-                    # await sleep_time()
-                    if response.status_code == 416:
-                        raise CacheError(
-                            _("文件 {0} 缓存异常，重新下载").format(temp.name),
+                    headers,
+                    temp,
+                ):
+                    if not await self.__download_segments(
+                        url,
+                        headers,
+                        temp,
+                        segments,
+                        slot,
+                        limit,
+                    ):
+                        logging(
+                            log,
+                            _("文件 {0} 分段下载未完成").format(name),
+                            ERROR,
                         )
-                    response.raise_for_status()
-                    # self.__create_progress(
-                    #     bar,
-                    #     int(
-                    #         response.headers.get(
-                    #             'content-length', 0)) or None,
-                    # )
-                    async with open(temp, "ab") as f:
-                        async for chunk in response.aiter_bytes(self.chunk):
-                            await f.write(chunk)
-                            # self.__update_progress(bar, len(chunk))
+                        return False
+                else:
+                    head, digest = await self.__download_stream(
+                        url,
+                        headers,
+                        temp,
+                        slot,
+                        limit,
+                    )
                 real = await self.__suffix_with_file(
                     temp,
                     path,
@@ -259,17 +420,25 @@ class Download:
                     # suffix,
                     format_,
                     log,
+                    head,
                 )
-                self.manager.move(
+                await self.__save_file(
                     temp,
                     real,
                     mtime,
-                    self.write_mtime,
+                    digest,
+                )
+                self.index.add(path, real.name)
+                await self.journal.update(
+                    self.journal.key(path, name, format_),
+                    self.journal.COMPLETED,
+                    real.stat().st_size,
                 )
                 # self.__create_progress(bar, None)
                 logging(log, _("文件 {0} 下载成功").format(real.name))
                 return True
             except HTTPError as error:
+                slot.error(error)
                 # self.__create_progress(bar, None)
                 logging(
                     log,
@@ -278,15 +447,252 @@ class Download:
                     ),
                     ERROR,
                 )
-                return False
+                return Failure(error, False)
+            except IntegrityError as error:
+                if not error.truncated:
+                    self.manager.delete(temp)
+                    self.manager.delete(self.__segments_file(temp))
+                self.requeue.add(self.journal.key(path, name, format_))
+                logging(
+                    log,
+                    str(error),
+                    ERROR,
+                )
+                return Failure(error, False)
             except CacheError as error:
                 self.manager.delete(temp)
+                self.manager.delete(self.__segments_file(temp))
                 logging(
                     log,
                     str(error),
                     ERROR,
                 )
 
+    async def __download_stream(
+        self,
+        url: str,
+        headers: dict[str, str],
+        temp: Path,
+        slot: "Slot",
+        limit: "TokenBucket" = None,
+    ) -> tuple[bytes, str | None]:
+        """返回文件起始字节与流式计算的内容哈希；断点续传时起始字节为空、哈希为 None"""
+        position = self.__update_headers_range(
+            headers,
+            temp,
+        )
+        head = b""
+        async with self.client.stream(
+            "GET",
+            url,
+            headers=headers,
+        ) as response:
+            slot.response(response.status_code)
+            # await sleep_time()
+            if response.status_code == 416:
+                raise CacheError(
+                    _("文件 {0} 缓存异常，重新下载").format(temp.name),
+                )
+            response.raise_for_status()
+            if position and response.status_code == 200:
+                # 服务端忽略 Range 请求头时返回完整文件，从头写入
+                position = 0
+                truncate(temp, 0)
+            hasher = (
+                self.store.hasher() if self.store.enabled and not position else None
+            )
+            verifier = StreamVerifier(
+                temp.name,
+                response,
+                position,
+                self.verify_checksum,
+                self.etag_checksum,
+            )
+            # self.__create_progress(
+            #     bar,
+            #     int(
+            #         response.headers.get(
+            #             'content-length', 0)) or None,
+            # )
+            async with self.writer.writer(
+                temp,
+                position,
+                self.write_buffer_size,
+            ) as f:
+                async for chunk in response.aiter_bytes(self.chunk):
+                    await self.bandwidth.consume(len(chunk), limit)
+                    await f.write(chunk)
+                    verifier.update(chunk)
+                    if hasher:
+                        hasher.update(chunk)
+                    if not position and len(head) < FILE_SIGNATURES_LENGTH:
+                        head += chunk[: FILE_SIGNATURES_LENGTH - len(head)]
+                    # self.__update_progress(bar, len(chunk))
+            verifier.verify(f.written)
+        return head, hasher.hexdigest() if hasher else None
+
+    async def __save_file(
+        self,
+        temp: Path,
+        path: Path,
+        mtime: int,
+        digest: str = None,
+    ) -> None:
+        if not self.store.enabled:
+            self.manager.move(
+                temp,
+                path,
+                mtime,
+                self.write_mtime,
+            )
+            return
+        await self.store.commit(
+            temp,
+            path,
+            digest,
+        )
+        if self.write_mtime and mtime:
+            self.manager.update_mtime(path.resolve(), mtime)
+
+    async def __ready_segments(
+        self,
+        url: str,
+        headers: dict[str, str],
+        temp: Path,
+    ) -> dict | None:
+        """返回分段下载进度，文件不满足分段下载条件时返回 None"""
+        if not self.segmented_download or self.segment_count < 2:
+            return None
+        if segments := self.__read_segments(temp):
+            return segments
+        if self.__get_resume_byte_position(temp):
+            return None
+        response = await self.client.head(
+            url,
+            headers=headers,
+        )
+        if (
+            response.status_code >= 400
+            or response.headers.get("Accept-Ranges", "").lower() != "bytes"
+            or (length := int(response.headers.get("Content-Length", 0)))
+            < self.segment_threshold
+        ):
+            return None
+        size = (length + self.segment_count - 1) // self.segment_count
+        segments = {
+            "length": length,
+            "ranges": [
+                [start, min(start + size, length) - 1, 0]
+                for start in range(0, length, size)
+            ],
+        }
+        async with open(temp, "wb") as f:
+            await f.truncate(length)
+        await SegmentProgress(self.__segments_file(temp), segments).save()
+        return segments
+
+    async def __download_segments(
+        self,
+        url: str,
+        headers: dict[str, str],
+        temp: Path,
+        segments: dict,
+        slot: "Slot",
+        limit: "TokenBucket" = None,
+    ) -> bool:
+        progress = SegmentProgress(self.__segments_file(temp), segments)
+        results = await gather(
+            *[
+                self.__download_segment(
+                    url,
+                    headers.copy(),
+                    temp,
+                    progress,
+                    item,
+                    slot,
+                    limit,
+                )
+                for item in segments["ranges"]
+                if item[0] + item[2] <= item[1]
+            ],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        if any(start + written <= end for start, end, written in segments["ranges"]):
+            return False
+        self.manager.delete(self.__segments_file(temp))
+        return True
+
+    async def __download_segment(
+        self,
+        url: str,
+        headers: dict[str, str],
+        temp: Path,
+        progress: SegmentProgress,
+        item: list[int],
+        slot: "Slot",
+        limit: "TokenBucket" = None,
+    ) -> None:
+        start, end = item[0], item[1]
+        headers["Range"] = f"bytes={start + item[2]}-{end}"
+        async with self.client.stream(
+            "GET",
+            url,
+            headers=headers,
+        ) as response:
+            slot.response(response.status_code)
+            if response.status_code == 416:
+                raise CacheError(
+                    _("文件 {0} 缓存异常，重新下载").format(temp.name),
+                )
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise CacheError(
+                    _("文件 {0} 分段下载异常，重新下载").format(temp.name),
+                )
+            # 分段的完整性由各分段写入的字节数保证，此处只核对响应范围的起始位置
+            StreamVerifier(temp.name, response, start + item[2])
+            base, received = item[2], 0
+            f = self.writer.writer(
+                temp,
+                start + base,
+                self.write_buffer_size,
+            )
+            try:
+                async with f:
+                    async for chunk in response.aiter_bytes(self.chunk):
+                        chunk = chunk[: end - start + 1 - base - received]
+                        received += len(chunk)
+                        await self.bandwidth.consume(len(chunk), limit)
+                        await f.write(chunk)
+                        # 仅记录已经写入文件的进度
+                        if base + f.written != item[2]:
+                            item[2] = base + f.written
+                            await progress.update()
+            finally:
+                # 分段完成、失败或被取消时保存最终进度
+                item[2] = base + f.written
+                await shield(progress.save())
+
+    @staticmethod
+    def __segments_file(temp: Path) -> Path:
+        return temp.with_name(f"{temp.name}.segments")
+
+    def __read_segments(self, temp: Path) -> dict | None:
+        if not (file := self.__segments_file(temp)).is_file():
+            return None
+        try:
+            segments = loads(file.read_text(encoding="utf-8"))
+            if temp.stat().st_size == segments["length"]:
+                return segments
+        except (OSError, JSONDecodeError, KeyError, TypeError):
+            pass
+        self.manager.delete(file)
+        self.manager.delete(temp)
+        return None
+
     @staticmethod
     def __create_progress(
         bar,
@@ -341,10 +747,13 @@ class Download:
         name: str,
         default_suffix: str,
         log,
+        file_start: bytes = b"",
     ) -> Path:
+        """根据文件签名判断格式；未提供下载时捕获的起始字节时读取缓存文件"""
         try:
-            async with open(temp, "rb") as f:
-                file_start = await f.read(FILE_SIGNATURES_LENGTH)
+            if not file_start:
+                async with open(temp, "rb") as f:
+                    file_start = await f.read(FILE_SIGNATURES_LENGTH)
             for offset, signature, suffix in FILE_SIGNATURES:
                 if file_start[offset : offset + len(signature)] == signature:
                     return path.joinpath(f"{name}.{suffix}")
@@ -0,0 +1,87 @@
+from asyncio import CancelledError, Queue, Task, create_task, gather
+from typing import Awaitable, Callable
+
+from ..module import ERROR, logging
+from ..translation import _
+from .pipeline import ExtractTask
+
+__all__ = ["LinkQueue"]
+
+
+class LinkQueue:
+    """剪贴板监听与接口推送共用的作品链接队列，由固定数量的工作协程并发处理
+
+    队列有界，已满时推送方等待；排队中或处理中的链接不会重复入队。
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[ExtractTask], Awaitable],
+        workers: int = 4,
+        size: int = 64,
+    ):
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.queue: Queue[ExtractTask] = Queue(max(1, int(size)))
+        # 排队中与处理中的链接
+        self.pending: set[str] = set()
+        self.tasks: list[Task] = []
+        self.active = 0
+        self.processed = 0
+        self.duplicated = 0
+
+    async def put(self, task: ExtractTask) -> bool:
+        """加入队列，链接已在排队或处理中时返回 False"""
+        if task.url in self.pending:
+            self.duplicated += 1
+            return False
+        self.pending.add(task.url)
+        self.start()
+        try:
+            await self.queue.put(task)
+        except CancelledError:
+            # 等待入队时被取消，链接未进入队列
+            self.pending.discard(task.url)
+            raise
+        return True
+
+    def start(self) -> None:
+        if not self.tasks:
+            self.tasks = [create_task(self.__work()) for __ in range(self.workers)]
+
+    async def join(self) -> None:
+        """等待队列中的链接全部处理完成"""
+        await self.queue.join()
+
+    async def close(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self.tasks),
+            "queued": len(self.pending) - self.active,
+            "in_flight": self.active,
+            "processed": self.processed,
+            "duplicated": self.duplicated,
+        }
+
+    async def __work(self) -> None:
+        while True:
+            task = await self.queue.get()
+            self.active += 1
+            try:
+                await self.handler(task)
+            except Exception as error:
+                logging(
+                    task.log,
+                    _("{0} 处理异常，错误信息: {1}").format(task.url, repr(error)),
+                    ERROR,
+                )
+            finally:
+                self.pending.discard(task.url)
+                self.active -= 1
+                self.processed += 1
+                self.queue.task_done()
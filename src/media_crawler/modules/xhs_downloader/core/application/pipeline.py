@@ -0,0 +1,137 @@
+from asyncio import Queue, create_task, gather
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable
+
+from ..module import ERROR, logging
+from ..translation import _
+
+if TYPE_CHECKING:
+    from ..module.rate_limit import TokenBucket
+
+__all__ = ["ExtractTask", "Pipeline"]
+
+
+class ExtractTask:
+    def __init__(
+        self,
+        url: str,
+        download: bool,
+        index: list | tuple | None,
+        log,
+        bar,
+        data: bool,
+        cookie: str = None,
+        proxy: str = None,
+        order: int = 0,
+        limit: "TokenBucket" = None,
+    ):
+        self.url = url
+        self.download = download
+        self.index = index
+        self.log = log
+        self.bar = bar
+        self.data = data
+        self.cookie = cookie
+        self.proxy = proxy
+        self.order = order
+        # 单次请求的下载带宽令牌桶，同一请求的作品共享
+        self.limit = limit
+        self.id = ""
+        self.html = ""
+        self.cached = False
+        self.container: dict = {}
+        self.result = {}
+        self.done = False
+        # 作品文件全部下载成功，或存在下载记录而跳过
+        self.success = False
+
+    def finish(self, result: dict) -> None:
+        self.result = result
+        self.done = True
+
+
+Stage = Callable[[ExtractTask], Awaitable[None]]
+
+
+class Pipeline:
+    """按阶段并发处理作品，阶段之间使用有界队列连接以形成背压"""
+
+    def __init__(
+        self,
+        stages: Iterable[tuple[Stage, int]],
+        queue_size: int = 8,
+    ):
+        self.stages = [(stage, max(1, int(workers))) for stage, workers in stages]
+        self.queue_size = max(1, int(queue_size))
+
+    async def run(self, tasks: list[ExtractTask]) -> list[dict]:
+        results = [{} for __ in tasks]
+        queues = [Queue(self.queue_size) for __ in self.stages]
+        consumers = [
+            create_task(
+                self.__run_stage(
+                    index,
+                    queues,
+                    results,
+                )
+            )
+            for index in range(len(self.stages))
+        ]
+        try:
+            for order, task in enumerate(tasks):
+                task.order = order
+                await queues[0].put(task)
+            await self.__close_queue(queues[0], self.stages[0][1])
+            await gather(*consumers)
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+        return results
+
+    async def __run_stage(
+        self,
+        index: int,
+        queues: list[Queue],
+        results: list[dict],
+    ) -> None:
+        stage, workers = self.stages[index]
+        target = queues[index + 1] if index + 1 < len(queues) else None
+        await gather(
+            *[
+                self.__work(
+                    stage,
+                    queues[index],
+                    target,
+                    results,
+                )
+                for __ in range(workers)
+            ]
+        )
+        if target:
+            await self.__close_queue(target, self.stages[index + 1][1])
+
+    @staticmethod
+    async def __work(
+        stage: Stage,
+        source: Queue,
+        target: Queue | None,
+        results: list[dict],
+    ) -> None:
+        while (task := await source.get()) is not None:
+            try:
+                await stage(task)
+            except Exception as error:
+                logging(
+                    task.log,
+                    _("{0} 处理异常，错误信息: {1}").format(task.url, repr(error)),
+                    ERROR,
+                )
+                task.finish({})
+            if task.done or not target:
+                results[task.order] = task.result
+            else:
+                await target.put(task)
+
+    @staticmethod
+    async def __close_queue(queue: Queue, workers: int) -> None:
+        for __ in range(workers):
+            await queue.put(None)
@@ -1,9 +1,8 @@
 from typing import TYPE_CHECKING
 
 from httpx import HTTPError
-from httpx import get
 
-from ..module import ERROR, Manager, logging, retry, sleep_time
+from ..module import ERROR, Failure, Manager, logging, retry
 from ..translation import _
 
 if TYPE_CHECKING:
@@ -18,7 +17,10 @@ class Html:
         manager: "Manager",
     ):
         self.retry = manager.retry
+        self.retry_policy = manager.retry_policy
         self.client = manager.request_client
+        self.proxy_clients = manager.proxy_clients
+        self.rate_limiter = manager.rate_limiter
         self.headers = manager.headers
         self.timeout = manager.timeout
 
@@ -37,6 +39,7 @@ class Html:
         headers = self.update_cookie(
             cookie,
         )
+        await self.rate_limiter.acquire(url)
         try:
             match bool(proxy):
                 case False:
@@ -45,7 +48,6 @@ class Html:
                         headers,
                         **kwargs,
                     )
-                    await sleep_time()
                     response.raise_for_status()
                     return response.text if content else str(response.url)
                 case True:
@@ -55,7 +57,6 @@ class Html:
                         proxy,
                         **kwargs,
                     )
-                    await sleep_time()
                     response.raise_for_status()
                     return response.text if content else str(response.url)
                 case _:
@@ -64,7 +65,7 @@ class Html:
             logging(
                 log, _("网络异常，{0} 请求失败: {1}").format(url, repr(error)), ERROR
             )
-            return ""
+            return Failure(error, "")
 
     @staticmethod
     def format_url(url: str) -> str:
@@ -95,15 +96,12 @@ class Html:
         proxy: str,
         **kwargs,
     ):
-        return await self.client.head(
-            url,
-            headers=headers,
-            proxy=proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
-            **kwargs,
-        )
+        async with self.proxy_clients.client(proxy) as client:
+            return await client.head(
+                url,
+                headers=headers,
+                **kwargs,
+            )
 
     async def __request_url_get(
         self,
@@ -124,12 +122,9 @@ class Html:
         proxy: str,
         **kwargs,
     ):
-        return get(
-            url,
-            headers=headers,
-            proxy=proxy,
-            follow_redirects=True,
-            verify=False,
-            timeout=self.timeout,
-            **kwargs,
-        )
+        async with self.proxy_clients.client(proxy) as client:
+            return await client.get(
+                url,
+                headers=headers,
+                **kwargs,
+            )
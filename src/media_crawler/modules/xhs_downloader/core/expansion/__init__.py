@@ -1,8 +1,11 @@
 from .browser import BrowserCookie
 from .cleaner import Cleaner
 from .converter import Converter
+from .decoder import decode_state
 from .error import CacheError
+from .error import IntegrityError
 from .file_folder import file_switch
+from .file_folder import remove_candidate_directories
 from .file_folder import remove_empty_directories
 from .namespace import Namespace
 from .truncate import beautify_string
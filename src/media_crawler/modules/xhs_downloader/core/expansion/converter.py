@@ -1,7 +1,8 @@
 from typing import Union
 
 from lxml.etree import HTML
-from yaml import safe_load
+
+from .decoder import decode_state
 
 __all__ = ["Converter"]
 
@@ -27,7 +28,7 @@ class Converter:
 
     @staticmethod
     def _convert_object(text: str) -> dict:
-        return safe_load(text.lstrip("window.__INITIAL_STATE__="))
+        return decode_state(text)
 
     @classmethod
     def _filter_object(cls, data: dict) -> dict:
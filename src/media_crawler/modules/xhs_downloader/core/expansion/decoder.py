@@ -0,0 +1,34 @@
+from re import compile
+
+from yaml import safe_load
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+__all__ = ["decode_state", "sanitize_state"]
+
+PREFIX = "window.__INITIAL_STATE__="
+# 匹配 JSON 字符串字面量或 JavaScript 特有的字面量，字符串内容保持不变
+JS_LITERAL = compile(r'"(?:[^"\\]|\\.)*"|-?\b(?:undefined|NaN|Infinity)\b')
+
+
+def _replace_literal(match) -> str:
+    return token if (token := match.group()).startswith('"') else "null"
+
+
+def sanitize_state(text: str) -> str:
+    """将 __INITIAL_STATE__ 脚本转换为合法的 JSON 文本"""
+    text = text.strip().removeprefix(PREFIX).rstrip("; \n")
+    return JS_LITERAL.sub(_replace_literal, text)
+
+
+def decode_state(text: str):
+    """优先使用 JSON 解析 __INITIAL_STATE__，解析失败时回退至 YAML"""
+    if not text:
+        return None
+    try:
+        return loads(sanitize_state(text))
+    except ValueError:
+        return safe_load(text.lstrip(PREFIX))
@@ -5,3 +5,11 @@ class CacheError(Exception):
 
     def __str__(self):
         return self.message
+
+
+class IntegrityError(CacheError):
+    """下载内容与响应声明不一致；truncated 为 True 时已写入的数据有效，可以断点续传"""
+
+    def __init__(self, message: str, truncated: bool = False):
+        super().__init__(message)
+        self.truncated = truncated
@@ -1,5 +1,6 @@
 from contextlib import suppress
 from pathlib import Path
+from typing import Iterable
 
 
 def file_switch(path: Path) -> None:
@@ -9,17 +10,44 @@ def file_switch(path: Path) -> None:
         path.touch()
 
 
-def remove_empty_directories(path: Path) -> None:
+def remove_empty_directories(path: Path, keep: Iterable[Path] = ()) -> None:
+    """删除空文件夹，keep 中的文件夹及其子文件夹保持不变"""
     exclude = {
         "\\.",
         "\\_",
         "\\__",
     }
+    keep = {i.resolve() for i in keep}
     for dir_path, dir_names, file_names in path.walk(
         top_down=False,
     ):
         if any(i in str(dir_path) for i in exclude):
             continue
+        if any(dir_path.resolve().is_relative_to(i) for i in keep):
+            continue
         if not dir_names and not file_names:
             with suppress(OSError):
                 dir_path.rmdir()
+
+
+def remove_candidate_directories(
+    candidates: Iterable[Path],
+    boundaries: Iterable[Path],
+) -> None:
+    """仅检查候选文件夹及其上级文件夹，逐级向上删除空文件夹，不会删除边界文件夹本身"""
+    boundaries = {i.resolve() for i in boundaries}
+    for path in sorted(
+        {i.resolve() for i in candidates},
+        key=lambda i: len(i.parts),
+        reverse=True,
+    ):
+        while path not in boundaries and any(
+            path.is_relative_to(i) for i in boundaries
+        ):
+            try:
+                path.rmdir()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                break
+            path = path.parent
@@ -1,10 +1,28 @@
 from copy import deepcopy
+from functools import lru_cache
 from types import SimpleNamespace
 from typing import Union
 
 __all__ = ["Namespace"]
 
 
+@lru_cache(maxsize=512)
+def compile_chain(attribute_chain: str) -> tuple[tuple[str, int | None, bool], ...]:
+    """将属性链解析为 (属性名, 索引, 是否索引访问) 步骤，结果缓存以供重复使用"""
+    steps = []
+    for attribute in attribute_chain.split("."):
+        if "[" in attribute:
+            attribute, index = attribute.split("[", 1)
+            try:
+                index = int(index[:-1])
+            except ValueError:
+                index = None
+            steps.append((attribute, index, True))
+        else:
+            steps.append((attribute, None, False))
+    return tuple(steps)
+
+
 class Namespace:
     def __init__(self, data: dict) -> None:
         self.data: SimpleNamespace = self.generate_data_object(data)
@@ -36,23 +54,21 @@ class Namespace:
         attribute_chain: str,
         default: Union[str, int, list, dict, SimpleNamespace] = "",
     ):
-        data = deepcopy(data_object)
-        attributes = attribute_chain.split(".")
-        for attribute in attributes:
-            if "[" in attribute:
-                parts = attribute.split("[", 1)
-                attribute = parts[0]
-                index = parts[1][:-1]
+        data = data_object
+        for attribute, index, indexed in compile_chain(attribute_chain):
+            if indexed:
                 try:
-                    index = int(index)
                     data = getattr(data, attribute, None)[index]
-                except (IndexError, TypeError, ValueError):
+                except (IndexError, TypeError):
                     return default
             else:
                 data = getattr(data, attribute, None)
                 if not data:
                     return default
-        return data or default
+        if not data:
+            return default
+        # 只复制返回的可变对象，调用方修改返回值不会影响原始数据
+        return deepcopy(data) if isinstance(data, (list, SimpleNamespace)) else data
 
     @classmethod
     def object_extract(
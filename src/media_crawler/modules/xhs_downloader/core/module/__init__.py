@@ -1,12 +1,22 @@
 from .extend import Account
 from .manager import Manager
 from .model import (
+    ExtractBatchParams,
     ExtractData,
     ExtractParams,
+    ExtractResult,
 )
 from .recorder import DataRecorder
 from .recorder import IDRecorder
 from .recorder import MapRecorder
+from .recorder import LinkRecorder
+from .recorder import MediaRecorder
+from .recorder import AuthorRecorder
+from .recorder import JournalRecorder
+from .link_cache import LinkCache
+from .media_store import MediaStore
+from .retry_policy import Failure
+from .retry_policy import RetryPolicy
 from .mapping import Mapping
 from .settings import Settings
 from .static import (
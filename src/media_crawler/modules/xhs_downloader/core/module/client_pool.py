@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from time import monotonic
+
+from httpx import AsyncClient
+
+__all__ = ["ProxyClientPool"]
+
+
+class PooledClient:
+    def __init__(self, client: AsyncClient):
+        self.client = client
+        self.active = 0
+        self.used = monotonic()
+        self.evicted = False
+
+
+class ProxyClientPool:
+    """按代理地址缓存 AsyncClient，复用连接；超过容量时淘汰最久未使用的客户端，空闲超时的客户端会被关闭"""
+
+    def __init__(
+        self,
+        timeout: int,
+        max_clients: int = 16,
+        idle_timeout: float = 300,
+    ):
+        self.timeout = timeout
+        self.max_clients = max(max_clients, 1)
+        self.idle_timeout = idle_timeout
+        self.clients: OrderedDict[str, PooledClient] = OrderedDict()
+
+    @asynccontextmanager
+    async def client(self, proxy: str):
+        if not (item := self.clients.get(proxy)):
+            item = self.clients[proxy] = PooledClient(self.__create_client(proxy))
+        self.clients.move_to_end(proxy)
+        item.active += 1
+        try:
+            await self.__evict_idle()
+            await self.__evict_overflow()
+            yield item.client
+        finally:
+            item.active -= 1
+            item.used = monotonic()
+            if item.evicted and not item.active:
+                await item.client.aclose()
+
+    async def close(self) -> None:
+        for item in self.clients.values():
+            await item.client.aclose()
+        self.clients.clear()
+
+    def __create_client(self, proxy: str) -> AsyncClient:
+        return AsyncClient(
+            proxy=proxy,
+            follow_redirects=True,
+            verify=False,
+            timeout=self.timeout,
+        )
+
+    async def __evict_idle(self) -> None:
+        now = monotonic()
+        for proxy, item in list(self.clients.items()):
+            if not item.active and now - item.used > self.idle_timeout:
+                await self.__evict(proxy)
+
+    async def __evict_overflow(self) -> None:
+        for proxy in list(self.clients)[: max(len(self.clients) - self.max_clients, 0)]:
+            await self.__evict(proxy)
+
+    async def __evict(self, proxy: str) -> None:
+        if not (item := self.clients.pop(proxy, None)):
+            return
+        item.evicted = True
+        if not item.active:
+            await item.client.aclose()
@@ -0,0 +1,141 @@
+from asyncio import CancelledError, Future, get_running_loop
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from urllib.parse import urlparse
+
+from httpx import TimeoutException, TransportError
+
+__all__ = ["AdaptiveConcurrency"]
+
+
+class HostState:
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.active = 0
+        self.waiters: deque[Future] = deque()
+        self.latency = 0.0
+        self.baseline = 0.0
+        self.decreased = 0.0
+        self.success = 0
+        self.throttled = 0
+        self.failure = 0
+
+
+class Slot:
+    def __init__(self, controller: "AdaptiveConcurrency", state: HostState):
+        self.controller = controller
+        self.state = state
+        self.start = monotonic()
+
+    def response(self, status_code: int) -> None:
+        """记录响应状态码，响应头到达的耗时作为延迟样本"""
+        self.controller.observe(self.state, status_code, monotonic() - self.start)
+
+    def error(self, error: BaseException) -> None:
+        if isinstance(error, (TimeoutException, TransportError)):
+            self.controller.decrease(self.state)
+            self.state.failure += 1
+
+
+class AdaptiveConcurrency:
+    """按主机划分的 AIMD 并发控制：响应健康时加性增加并发，限流、服务端错误或超时时乘性减少"""
+
+    THROTTLE_STATUS = 429
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 16,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        factor: float = 0.5,
+    ):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.initial = min(max(initial, self.minimum), self.maximum)
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.factor = factor
+        self.hosts: dict[str, HostState] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        state = self.__state(url)
+        await self.__acquire(state)
+        try:
+            yield Slot(self, state)
+        finally:
+            state.active -= 1
+            self.__wake(state)
+
+    def observe(self, state: HostState, status_code: int, latency: float) -> None:
+        if status_code == self.THROTTLE_STATUS or status_code >= 500:
+            state.throttled += 1
+            self.decrease(state)
+            return
+        state.success += 1
+        if state.latency:
+            state.latency += (latency - state.latency) * self.smoothing
+            state.baseline = min(
+                state.baseline + (latency - state.baseline) * self.smoothing / 10,
+                latency,
+            )
+        else:
+            state.latency = state.baseline = latency
+        if state.latency <= state.baseline * self.tolerance:
+            self.increase(state)
+
+    def increase(self, state: HostState) -> None:
+        state.limit = min(state.limit + 1 / state.limit, self.maximum)
+        self.__wake(state)
+
+    def decrease(self, state: HostState) -> None:
+        # 同一批在途请求的失败只触发一次退避
+        if monotonic() - state.decreased < max(state.latency, 1.0):
+            return
+        state.decreased = monotonic()
+        state.limit = max(state.limit * self.factor, self.minimum)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            host: {
+                "limit": int(state.limit),
+                "active": state.active,
+                "waiting": len(state.waiters),
+                "latency_ms": round(state.latency * 1000, 2),
+                "success": state.success,
+                "throttled": state.throttled,
+                "failure": state.failure,
+            }
+            for host, state in self.hosts.items()
+        }
+
+    def __state(self, url: str) -> HostState:
+        host = urlparse(url).hostname or ""
+        if host not in self.hosts:
+            self.hosts[host] = HostState(self.initial)
+        return self.hosts[host]
+
+    async def __acquire(self, state: HostState) -> None:
+        while state.active >= int(state.limit):
+            waiter = get_running_loop().create_future()
+            state.waiters.append(waiter)
+            try:
+                await waiter
+            except CancelledError:
+                if waiter in state.waiters:
+                    state.waiters.remove(waiter)
+                else:
+                    self.__wake(state)
+                raise
+        state.active += 1
+
+    @staticmethod
+    def __wake(state: HostState) -> None:
+        free = int(state.limit) - state.active
+        while free > 0 and state.waiters:
+            if not (waiter := state.waiters.popleft()).done():
+                waiter.set_result(None)
+                free -= 1
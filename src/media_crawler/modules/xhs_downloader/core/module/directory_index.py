@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from os import scandir
+from pathlib import Path
+from time import monotonic
+
+__all__ = ["DirectoryIndex"]
+
+
+class DirectoryIndex:
+    """下载文件夹的文件名索引：每个文件夹只调用一次 scandir，之后的存在性检查均在内存中完成
+
+    下载保存文件后调用 ``add`` 更新索引；索引超过 ``ttl`` 秒后重新扫描，以发现程序外部的修改。
+    所有操作均为同步调用，在事件循环中不会被其他协程打断，多个作品同时写入同一文件夹时索引保持一致。
+    """
+
+    def __init__(self, max_folders: int = 256, ttl: float = 60):
+        self.max_folders = max(max_folders, 1)
+        self.ttl = ttl
+        self.folders: OrderedDict[str, tuple[float, set[str]]] = OrderedDict()
+        self.scans = 0
+        self.lookups = 0
+
+    def exists(self, path: Path, name: str) -> bool:
+        self.lookups += 1
+        return name in self.__names(path)
+
+    def add(self, path: Path, name: str) -> None:
+        if (key := str(path)) in self.folders:
+            self.folders[key][1].add(name)
+
+    def discard(self, path: Path, name: str) -> None:
+        if (key := str(path)) in self.folders:
+            self.folders[key][1].discard(name)
+
+    def invalidate(self, path: Path = None) -> None:
+        if path is None:
+            self.folders.clear()
+        else:
+            self.folders.pop(str(path), None)
+
+    def stats(self) -> dict:
+        return {
+            "folders": len(self.folders),
+            "scans": self.scans,
+            "lookups": self.lookups,
+        }
+
+    def __names(self, path: Path) -> set[str]:
+        key = str(path)
+        if (item := self.folders.get(key)) and monotonic() - item[0] < self.ttl:
+            self.folders.move_to_end(key)
+            return item[1]
+        names = self.__scan(path)
+        self.folders[key] = (monotonic(), names)
+        self.folders.move_to_end(key)
+        while len(self.folders) > self.max_folders:
+            self.folders.popitem(last=False)
+        return names
+
+    def __scan(self, path: Path) -> set[str]:
+        self.scans += 1
+        try:
+            with scandir(path) as entries:
+                return {i.name for i in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
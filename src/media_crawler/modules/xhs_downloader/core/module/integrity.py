@@ -0,0 +1,92 @@
+from base64 import b64decode
+from binascii import Error as Base64Error
+from hashlib import md5
+from re import compile
+from typing import TYPE_CHECKING
+
+from ..expansion import IntegrityError
+from ..translation import _
+
+if TYPE_CHECKING:
+    from httpx import Response
+
+__all__ = ["StreamVerifier"]
+
+
+class StreamVerifier:
+    """流式完整性校验：核对响应声明的文件总大小，可选在写入时同步计算 MD5 并与响应头比对
+
+    校验值取自 ``Content-MD5``；许多 CDN 的 ``ETag`` 并非内容 MD5，
+    仅在 etag 为 True 时将形如 32 位十六进制的强 ``ETag`` 视为校验值；
+    仅从文件起始位置下载时计算校验值，不需要再次读取文件。
+    """
+
+    CONTENT_RANGE = compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+    ETAG = compile(r'"?([0-9a-fA-F]{32})"?')
+
+    def __init__(
+        self,
+        name: str,
+        response: "Response",
+        position: int = 0,
+        checksum: bool = False,
+        etag: bool = False,
+    ):
+        self.name = name
+        self.etag = etag
+        self.position = position
+        self.expected = self.__expected_size(response, position)
+        self.digest = self.__expected_digest(response) if checksum else None
+        self.hasher = md5() if self.digest and not position else None
+
+    def update(self, chunk: bytes) -> None:
+        if self.hasher:
+            self.hasher.update(chunk)
+
+    def verify(self, written: int) -> None:
+        """written 为本次写入的字节数，大小或校验值不一致时抛出 IntegrityError"""
+        size = self.position + written
+        if self.expected is not None and size != self.expected:
+            raise IntegrityError(
+                _("文件 {0} 大小校验失败，预期 {1} 字节，实际 {2} 字节").format(
+                    self.name, self.expected, size
+                ),
+                size < self.expected,
+            )
+        if self.hasher and self.hasher.hexdigest() != self.digest:
+            raise IntegrityError(_("文件 {0} 校验值不一致").format(self.name))
+
+    def __expected_size(self, response: "Response", position: int) -> int | None:
+        if response.status_code == 206:
+            if not (
+                match := self.CONTENT_RANGE.fullmatch(
+                    response.headers.get("Content-Range", "")
+                )
+            ):
+                return None
+            if int(match.group(1)) != position:
+                raise IntegrityError(
+                    _("文件 {0} 响应范围与请求不一致").format(self.name)
+                )
+            if match.group(3) != "*":
+                return int(match.group(3))
+            return int(match.group(2)) + 1
+        # 响应经过压缩时 Content-Length 为压缩后的大小，无法用于校验
+        if response.headers.get("Content-Encoding", "identity") != "identity":
+            return None
+        if length := response.headers.get("Content-Length"):
+            return position + int(length)
+        return None
+
+    def __expected_digest(self, response: "Response") -> str | None:
+        if value := response.headers.get("Content-MD5"):
+            try:
+                return b64decode(value, validate=True).hex()
+            except (Base64Error, ValueError):
+                return None
+        if not self.etag:
+            return None
+        etag = response.headers.get("ETag", "")
+        if not etag.startswith("W/") and (match := self.ETAG.fullmatch(etag)):
+            return match.group(1).lower()
+        return None
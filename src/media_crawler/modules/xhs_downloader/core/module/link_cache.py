@@ -0,0 +1,87 @@
+from asyncio import Task, create_task, shield
+from collections import OrderedDict
+from time import time
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from .recorder import LinkRecorder
+
+__all__ = ["LinkCache"]
+
+
+class LinkCache:
+    """短链接解析结果的 LRU 缓存，条目超过有效期后失效；同一短链接的并发解析共享一次请求"""
+
+    def __init__(
+        self,
+        recorder: "LinkRecorder",
+        max_size: int = 1024,
+        ttl: float = 86400,
+    ):
+        self.recorder = recorder
+        self.max_size = max(max_size, 1)
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.pending: dict[str, Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return url.split("://", 1)[-1]
+
+    async def resolve(
+        self,
+        url: str,
+        resolver: Callable[[str], Awaitable[str]],
+    ) -> str:
+        key = self.key(url)
+        if target := self.__get(key):
+            self.hits += 1
+            return target
+        if task := self.pending.get(key):
+            self.shared += 1
+        else:
+            self.misses += 1
+            task = self.pending[key] = create_task(self.__resolve(key, url, resolver))
+            task.add_done_callback(lambda __: self.pending.pop(key, None))
+        return await shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+        }
+
+    async def __resolve(
+        self,
+        key: str,
+        url: str,
+        resolver: Callable[[str], Awaitable[str]],
+    ) -> str:
+        if row := await self.recorder.select(key):
+            self.__put(key, *row)
+            return row[0]
+        if target := await resolver(url):
+            created = time()
+            self.__put(key, target, created)
+            await self.recorder.add(key, target, created)
+        return target
+
+    def __get(self, key: str) -> str | None:
+        if not (entry := self.entries.get(key)):
+            return None
+        if time() - entry[1] > self.ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def __put(self, key: str, target: str, created: float) -> None:
+        self.entries[key] = (target, created)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
@@ -1,20 +1,21 @@
 from pathlib import Path
 from re import compile, sub
 from shutil import move, rmtree
-from os import utime
-from httpx import (
-    AsyncClient,
-    AsyncHTTPTransport,
-    HTTPStatusError,
-    RequestError,
-    TimeoutException,
-    get,
-)
-
-from ..expansion import remove_empty_directories
+from os import replace, utime
+from httpx import AsyncClient, Proxy
 
+from ..expansion import remove_candidate_directories, remove_empty_directories
 from ..translation import _
-from .static import HEADERS, USERAGENT, WARNING
+
+from .client_pool import ProxyClientPool
+from .concurrency import AdaptiveConcurrency
+from .page_cache import PageCache
+from .proxy_pool import ProxyPool, ProxyPoolTransport
+from .directory_index import DirectoryIndex
+from .rate_limit import BandwidthLimiter, RateLimiter
+from .retry_policy import RetryPolicy
+from .static import HEADERS, MAX_WORKERS, USERAGENT, WARNING
+from .writer import WriterPool
 from .tools import logging
 from typing import TYPE_CHECKING
 
@@ -58,7 +59,7 @@ class Manager:
         chunk: int,
         user_agent: str,
         cookie: str,
-        proxy: str | dict,
+        proxy: str | list | dict,
         timeout: int,
         retry: int,
         record_data: bool,
@@ -72,12 +73,40 @@ class Manager:
         write_mtime: bool,
         _print: bool,
         cleaner: "Cleaner",
+        segmented_download: bool = False,
+        segment_threshold: int = 20 * 1024 * 1024,
+        segment_count: int = 4,
+        max_concurrency: int = 16,
+        record_batch_size: int = 100,
+        record_flush_interval: float = 0.5,
+        proxy_check_interval: float = 300,
+        request_rate: float = 0.5,
+        request_burst: int = 3,
+        link_cache_size: int = 1024,
+        link_cache_ttl: float = 86400,
+        link_cache_persist: bool = False,
+        page_cache: bool = False,
+        page_cache_ttl: float = 600,
+        page_cache_size: int = 256 * 1024 * 1024,
+        media_dedup: bool = False,
+        write_buffer_size: int = 4 * 1024 * 1024,
+        io_threads: int = 2,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 30,
+        retry_budget_ratio: float = 0.2,
+        download_journal: bool = True,
+        download_bandwidth: int = 0,
+        verify_checksum: bool = False,
+        etag_checksum: bool = False,
     ):
         self.root = root
         self.cleaner = cleaner
-        self.temp = root.joinpath("Temp")
+        # 本次运行中创建或清空的文件夹，关闭时仅检查这些文件夹
+        self.directories: set[Path] = set()
         self.path = self.__check_path(path)
         self.folder = self.__check_folder(folder)
+        # 缓存文件与下载文件位于同一文件系统，完成下载时只需重命名
+        self.temp = self.folder.joinpath(".temp")
         self.compatible()
         self.blank_headers = HEADERS | {
             "user-agent": user_agent or USERAGENT,
@@ -86,14 +115,25 @@ class Manager:
             "cookie": cookie,
         }
         self.retry = retry
+        self.download_journal = download_journal
+        self.verify_checksum = verify_checksum
+        self.etag_checksum = etag_checksum
+        self.retry_policy = RetryPolicy(
+            retry_backoff,
+            retry_backoff_max,
+            retry_budget_ratio,
+        )
         self.chunk = chunk
         self.name_format = self.__check_name_format(name_format)
         self.record_data = self.check_bool(record_data, False)
         self.image_format = self.__check_image_format(image_format)
         self.folder_mode = self.check_bool(folder_mode, False)
         self.download_record = self.check_bool(download_record, True)
-        self.proxy_tip = None
-        self.proxy = self.__check_proxy(proxy)
+        self.proxy_pool = ProxyPool(
+            self.__check_proxy(proxy),
+            timeout,
+            proxy_check_interval,
+        )
         self.print_proxy_tip(
             _print,
         )
@@ -106,26 +146,47 @@ class Manager:
             timeout=timeout,
             verify=False,
             follow_redirects=True,
-            mounts={
-                "http://": AsyncHTTPTransport(proxy=self.proxy),
-                "https://": AsyncHTTPTransport(proxy=self.proxy),
-            },
+            transport=ProxyPoolTransport(self.proxy_pool),
         )
         self.download_client = AsyncClient(
             headers=self.blank_headers,
             timeout=timeout,
             verify=False,
             follow_redirects=True,
-            mounts={
-                "http://": AsyncHTTPTransport(proxy=self.proxy),
-                "https://": AsyncHTTPTransport(proxy=self.proxy),
-            },
+            transport=ProxyPoolTransport(self.proxy_pool),
         )
+        self.proxy_clients = ProxyClientPool(timeout)
         self.image_download = self.check_bool(image_download, True)
         self.video_download = self.check_bool(video_download, True)
         self.live_download = self.check_bool(live_download, True)
         self.author_archive = self.check_bool(author_archive, False)
         self.write_mtime = self.check_bool(write_mtime, False)
+        self.segmented_download = self.check_bool(segmented_download, False)
+        self.segment_threshold = max(segment_threshold, chunk)
+        self.segment_count = max(segment_count, 1)
+        self.download_concurrency = AdaptiveConcurrency(
+            MAX_WORKERS,
+            maximum=max_concurrency,
+        )
+        self.record_batch_size = max(record_batch_size, 1)
+        self.record_flush_interval = max(record_flush_interval, 0)
+        self.rate_limiter = RateLimiter(request_rate, request_burst)
+        self.bandwidth = BandwidthLimiter(download_bandwidth)
+        self.directory_index = DirectoryIndex()
+        self.link_cache_size = max(link_cache_size, 1)
+        self.link_cache_ttl = max(link_cache_ttl, 0)
+        self.link_cache_persist = self.check_bool(link_cache_persist, False)
+        self.media_dedup = self.check_bool(media_dedup, False)
+        self.write_buffer_size = max(write_buffer_size, chunk)
+        self.writer_pool = WriterPool(io_threads)
+        self.page_cache = PageCache(
+            root.joinpath("PageCache"),
+            self.check_bool(page_cache, False),
+            page_cache_ttl,
+            page_cache_size,
+        )
+        if self.page_cache.enabled:
+            self.record_directory(self.page_cache.root)
         self.create_folder()
 
     def __check_path(self, path: str) -> Path:
@@ -180,7 +241,11 @@ class Manager:
         mtime: int = None,
         rewrite: bool = False,
     ):
-        move(temp.resolve(), path.resolve())
+        try:
+            replace(temp.resolve(), path.resolve())
+        except OSError:
+            # 缓存文件与目标文件位于不同文件系统时无法直接重命名
+            move(temp.resolve(), path.resolve())
         if rewrite and mtime:
             cls.update_mtime(path.resolve(), mtime)
 
@@ -195,6 +260,22 @@ class Manager:
         name = self.NAME.sub("_", name)
         return sub(r"_+", "_", name).strip("_")
 
+    def record_directory(self, *paths: Path) -> None:
+        self.directories.update(paths)
+
+    def sweep_directories(self) -> None:
+        """遍历作品数据根路径与下载文件夹，删除全部空文件夹；文件数量较多时耗时较长
+
+        缓存文件夹、媒体库文件夹与本次运行创建的作品文件夹不会被删除。
+        """
+        keep = (
+            self.temp,
+            self.folder.joinpath(".media_store"),
+            *self.directories,
+        )
+        remove_empty_directories(self.root, keep)
+        remove_empty_directories(self.folder, keep)
+
     @staticmethod
     def check_bool(value: bool, default: bool) -> bool:
         return value if isinstance(value, bool) else default
@@ -202,9 +283,18 @@ class Manager:
     async def close(self):
         await self.request_client.aclose()
         await self.download_client.aclose()
+        await self.proxy_clients.close()
+        await self.proxy_pool.close()
+        self.writer_pool.shutdown()
         # self.__clean()
-        remove_empty_directories(self.root)
-        remove_empty_directories(self.folder)
+        remove_candidate_directories(
+            self.directories,
+            (
+                self.root,
+                self.folder,
+            ),
+        )
+        self.directories.clear()
 
     def __check_name_format(self, format_: str) -> str:
         keys = format_.split()
@@ -213,48 +303,36 @@ class Manager:
             format_,
         )
 
+    @staticmethod
     def __check_proxy(
-        self,
-        proxy: str,
-        url="https://www.xiaohongshu.com/explore",
-    ) -> str | None:
-        if proxy:
+        proxy: str | list | dict,
+    ) -> list[str]:
+        if not proxy:
+            return []
+        if isinstance(proxy, str):
+            return [proxy]
+        if isinstance(proxy, dict):
+            proxy = proxy.values()
+        result = []
+        for i in proxy:
+            if not i:
+                continue
             try:
-                response = get(
-                    url,
-                    proxy=proxy,
-                    timeout=10,
-                    headers={
-                        "User-Agent": USERAGENT,
-                    },
-                )
-                response.raise_for_status()
-                self.proxy_tip = (_("代理 {0} 测试成功").format(proxy),)
-                return proxy
-            except TimeoutException:
-                self.proxy_tip = (
-                    _("代理 {0} 测试超时").format(proxy),
-                    WARNING,
-                )
-            except (
-                RequestError,
-                HTTPStatusError,
-            ) as e:
-                self.proxy_tip = (
-                    _("代理 {0} 测试失败：{1}").format(
-                        proxy,
-                        e,
-                    ),
-                    WARNING,
-                )
+                Proxy(i)
+            except (TypeError, ValueError):
+                logging(None, _("代理 {0} 格式无效，已忽略").format(i), WARNING)
+                continue
+            result.append(i)
+        return result
 
     def print_proxy_tip(
         self,
         _print: bool = True,
         log=None,
     ) -> None:
-        if _print and self.proxy_tip:
-            logging(log, *self.proxy_tip)
+        if _print:
+            for tip in self.proxy_pool.tips():
+                logging(log, *tip)
 
     @classmethod
     def clean_cookie(cls, cookie_string: str) -> str:
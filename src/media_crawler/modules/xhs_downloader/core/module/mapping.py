@@ -1,3 +1,7 @@
+from asyncio import Condition, to_thread
+from contextlib import asynccontextmanager
+from json import JSONDecodeError, dumps, loads
+from os import replace, scandir
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -13,7 +17,50 @@ if TYPE_CHECKING:
 __all__ = ["Mapping"]
 
 
+class AuthorGate:
+    """作者文件夹的读写闸门：下载为共享方，重命名为独占方
+
+    开始重命名后新的下载等待重命名完成，重命名等待进行中的下载全部结束后才会执行。
+    """
+
+    def __init__(self):
+        self.condition = Condition()
+        self.active = 0
+        self.renaming = False
+
+    @asynccontextmanager
+    async def download(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: not self.renaming)
+            self.active += 1
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.active -= 1
+                self.condition.notify_all()
+
+    @asynccontextmanager
+    async def rename(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: not self.renaming)
+            self.renaming = True
+            await self.condition.wait_for(lambda: not self.active)
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.renaming = False
+                self.condition.notify_all()
+
+
 class Mapping:
+    """作者别名变化时重命名作者文件夹、作品文件夹与作品文件
+
+    重命名操作先整体规划并写入重命名日志，再在工作线程中执行；每个步骤均可重复执行，
+    程序中断后启动时根据日志继续完成未完成的批次。
+    """
+
     def __init__(
         self,
         manager: "Manager",
@@ -23,6 +70,11 @@ class Mapping:
         self.folder_mode = manager.folder_mode
         self.database = mapping
         self.switch = manager.author_archive
+        self.index = manager.directory_index
+        self.journal = manager.root.joinpath("RenameJournal")
+        self.manager = manager
+        self.gates: dict[str, AuthorGate] = {}
+        self.progress: dict[str, list[int]] = {}
 
     async def update_cache(
         self,
@@ -33,18 +85,50 @@ class Mapping:
         if not self.switch:
             return
         if (a := await self.has_mapping(id_)) and a != alias:
-            self.__check_file(
+            # 先更新别名，避免同一作者的其他作品重复触发重命名
+            await self.database.add(id_, alias)
+            await self.__check_file(
                 id_,
                 alias,
                 a,
                 log,
             )
+            return
         await self.database.add(id_, alias)
 
     async def has_mapping(self, id_: str) -> str:
         return d[0] if (d := await self.database.select(id_)) else ""
 
-    def __check_file(
+    @asynccontextmanager
+    async def downloading(self, id_: str):
+        """下载作者的作品文件期间持有，作者文件夹重命名时等待下载结束"""
+        async with self.__gate(id_).download():
+            yield
+
+    async def resume(self, log=None) -> None:
+        """继续执行上次中断的重命名批次"""
+        if not self.journal.is_dir():
+            return
+        for file in sorted(self.journal.glob("*.json")):
+            try:
+                batch = loads(file.read_text(encoding="utf-8"))
+            except (OSError, JSONDecodeError):
+                file.unlink(missing_ok=True)
+                continue
+            logging(
+                log,
+                _("继续执行作者 {0} 未完成的重命名操作").format(batch["id"]),
+            )
+            async with self.__gate(batch["id"]).rename():
+                await self.__execute(batch, log)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            id_: {"done": done, "total": total}
+            for id_, (done, total) in self.progress.items()
+        }
+
+    async def __check_file(
         self,
         id_: str,
         alias: str,
@@ -59,175 +143,137 @@ class Mapping:
                 ),
             )
             return
-        self.__rename_folder(
-            old_folder,
-            id_,
-            alias,
-            log,
-        )
-        self.__scan_file(
-            id_,
-            alias,
-            old_alias,
-            log,
-        )
-
-    def __rename_folder(
-        self,
-        old_folder: Path,
-        id_: str,
-        alias: str,
-        log,
-    ):
-        new_folder = self.root.joinpath(f"{id_}_{alias}")
-        self.__rename(
-            old_folder,
-            new_folder,
-            _("文件夹"),
-            log,
-        )
+        async with self.__gate(id_).rename():
+            steps = await to_thread(self.__plan, old_folder, id_, alias, old_alias)
+            await self.__execute(
+                {
+                    "id": id_,
+                    "alias": alias,
+                    "old_alias": old_alias,
+                    "steps": steps,
+                },
+                log,
+            )
         logging(
             log,
             _("文件夹 {old_folder} 已重命名为 {new_folder}").format(
-                old_folder=old_folder.name, new_folder=new_folder.name
+                old_folder=old_folder.name, new_folder=f"{id_}_{alias}"
             ),
         )
 
-    def __rename_works_folder(
-        self,
-        old_: Path,
-        alias: str,
-        old_alias: str,
-        log,
-    ) -> Path:
-        if old_alias in old_.name:
-            new_ = old_.parent / old_.name.replace(old_alias, alias, 1)
-            self.__rename(
-                old_,
-                new_,
-                _("文件夹"),
-                log,
-            )
-            logging(
-                log,
-                _("文件夹 {old_} 重命名为 {new_}").format(
-                    old_=old_.name, new_=new_.name
-                ),
-            )
-            return new_
-        return old_
-
-    def __scan_file(
+    def __plan(
         self,
+        old_folder: Path,
         id_: str,
         alias: str,
         old_alias: str,
-        log,
-    ):
-        root = self.root.joinpath(f"{id_}_{alias}")
-        item_list = root.iterdir()
+    ) -> list[tuple[str, str, str]]:
+        """规划重命名步骤：先重命名文件，再重命名作品文件夹，最后重命名作者文件夹"""
+        steps = []
         if self.folder_mode:
-            for f in item_list:
-                if f.is_dir():
-                    f = self.__rename_works_folder(
-                        f,
-                        alias,
-                        old_alias,
-                        log,
-                    )
-                    files = f.iterdir()
-                    self.__batch_rename(
-                        f,
-                        files,
-                        alias,
-                        old_alias,
-                        log,
+            with scandir(old_folder) as entries:
+                folders = [i.path for i in entries if i.is_dir()]
+            for folder in map(Path, folders):
+                steps.extend(self.__plan_files(folder, alias, old_alias))
+                if old_alias in folder.name:
+                    steps.append(
+                        self.__step(
+                            folder,
+                            folder.name.replace(old_alias, alias, 1),
+                            _("文件夹"),
+                        )
                     )
         else:
-            self.__batch_rename(
-                root,
-                item_list,
-                alias,
-                old_alias,
-                log,
-            )
+            steps.extend(self.__plan_files(old_folder, alias, old_alias))
+        steps.append(self.__step(old_folder, f"{id_}_{alias}", _("文件夹")))
+        return steps
 
-    def __batch_rename(
+    def __plan_files(
         self,
-        root: Path,
-        files,
+        folder: Path,
         alias: str,
         old_alias: str,
-        log,
-    ):
-        for old_file in files:
-            if old_alias not in old_file.name:
-                break
-            self.__rename_file(
-                root,
-                old_file,
-                alias,
-                old_alias,
-                log,
+    ) -> list[tuple[str, str, str]]:
+        with scandir(folder) as entries:
+            names = [i.name for i in entries if i.is_file() and old_alias in i.name]
+        return [
+            self.__step(
+                folder.joinpath(name),
+                name.replace(old_alias, alias, 1),
+                _("文件"),
             )
+            for name in names
+        ]
 
-    def __rename_file(
-        self,
-        root: Path,
-        old_file: Path,
-        alias: str,
-        old_alias: str,
-        log,
-    ):
-        new_file = root.joinpath(old_file.name.replace(old_alias, alias, 1))
-        self.__rename(
-            old_file,
-            new_file,
-            _("文件"),
-            log,
+    def __step(self, old_: Path, name: str, type_: str) -> tuple[str, str, str]:
+        return (
+            old_.relative_to(self.root).as_posix(),
+            old_.with_name(name).relative_to(self.root).as_posix(),
+            type_,
         )
+
+    async def __execute(self, batch: dict, log) -> None:
+        id_, steps = batch["id"], batch["steps"]
+        self.journal.mkdir(exist_ok=True)
+        file = self.journal.joinpath(f"{id_}.json")
+        await to_thread(self.__save_journal, file, batch)
+        self.progress[id_] = progress = [0, len(steps)]
         logging(
             log,
-            _("文件 {old_file} 重命名为 {new_file}").format(
-                old_file=old_file.name, new_file=new_file.name
-            ),
+            _("开始重命名作者 {0} 的 {1} 个文件和文件夹").format(id_, len(steps)),
         )
-        return True
+        errors = await to_thread(self.__rename_all, steps, progress)
+        for error in errors:
+            logging(log, error, ERROR)
+        file.unlink(missing_ok=True)
+        self.manager.record_directory(self.journal)
+        self.progress.pop(id_, None)
+        self.index.invalidate()
+
+    @staticmethod
+    def __save_journal(file: Path, batch: dict) -> None:
+        temp = file.with_suffix(".tmp")
+        temp.write_text(dumps(batch, ensure_ascii=False), encoding="utf-8")
+        replace(temp, file)
+
+    def __rename_all(
+        self,
+        steps: list[tuple[str, str, str]],
+        progress: list[int],
+    ) -> list[str]:
+        errors = []
+        for old_, new_, type_ in steps:
+            old_, new_ = self.root.joinpath(old_), self.root.joinpath(new_)
+            # 中断后重新执行时跳过已完成的步骤
+            if old_.exists() or not new_.exists():
+                if error := self.__rename(old_, new_, type_):
+                    errors.append(error)
+            progress[0] += 1
+        return errors
+
+    def __gate(self, id_: str) -> AuthorGate:
+        if id_ not in self.gates:
+            self.gates[id_] = AuthorGate()
+        return self.gates[id_]
 
     @staticmethod
     def __rename(
         old_: Path,
         new_: Path,
         type_=_("文件"),
-        log=None,
-    ) -> bool:
+    ) -> str | None:
+        """重命名文件或文件夹，失败时返回错误信息"""
         try:
             old_.rename(new_)
-            return True
         except PermissionError as e:
-            logging(
-                log,
-                _("{type} {old}被占用，重命名失败: {error}").format(
-                    type=type_, old=old_.name, error=e
-                ),
-                ERROR,
+            return _("{type} {old}被占用，重命名失败: {error}").format(
+                type=type_, old=old_.name, error=e
             )
-            return False
         except FileExistsError as e:
-            logging(
-                log,
-                _("{type} {new}名称重复，重命名失败: {error}").format(
-                    type=type_, new=new_.name, error=e
-                ),
-                ERROR,
+            return _("{type} {new}名称重复，重命名失败: {error}").format(
+                type=type_, new=new_.name, error=e
             )
-            return False
         except OSError as e:
-            logging(
-                log,
-                _("处理{type} {old}时发生预期之外的错误: {error}").format(
-                    type=type_, old=old_.name, error=e
-                ),
-                ERROR,
+            return _("处理{type} {old}时发生预期之外的错误: {error}").format(
+                type=type_, old=old_.name, error=e
             )
-            return True
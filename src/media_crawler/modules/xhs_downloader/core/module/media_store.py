@@ -0,0 +1,119 @@
+from asyncio import to_thread
+from hashlib import file_digest, sha256
+from os import link, replace
+from pathlib import Path
+from shutil import copy2
+from typing import TYPE_CHECKING
+
+try:
+    from fcntl import ioctl
+except ImportError:  # Windows
+    ioctl = None
+
+if TYPE_CHECKING:
+    from .manager import Manager
+    from .recorder import MediaRecorder
+
+__all__ = ["MediaStore"]
+
+
+class MediaStore:
+    """内容寻址的媒体存储：相同内容只保存一份，作品文件以引用链接或硬链接指向该内容
+
+    内容文件保存在下载文件夹内的 ``.media_store`` 目录，按 SHA-256 命名；
+    文件系统支持时优先创建引用链接（reflink），其次创建硬链接，均不支持时复制文件；
+    需要写入文件修改时间时不创建硬链接，避免共享同一 inode 的文件互相覆盖修改时间。
+    """
+
+    FICLONE = 0x40049409
+
+    def __init__(
+        self,
+        manager: "Manager",
+        recorder: "MediaRecorder",
+    ):
+        self.enabled = manager.media_dedup
+        self.folder = manager.folder
+        self.root = manager.folder.joinpath(".media_store")
+        self.recorder = recorder
+        self.hardlink = not manager.write_mtime
+        self.stored = 0
+        self.deduplicated = 0
+        self.saved = 0
+        if self.enabled:
+            self.root.mkdir(exist_ok=True)
+
+    @staticmethod
+    def hasher():
+        return sha256()
+
+    @staticmethod
+    def digest(file: Path) -> str:
+        with file.open("rb") as f:
+            return file_digest(f, "sha256").hexdigest()
+
+    def blob(self, digest: str) -> Path:
+        return self.root.joinpath(digest[:2], digest)
+
+    async def commit(
+        self,
+        temp: Path,
+        path: Path,
+        digest: str = None,
+    ) -> None:
+        """将缓存文件存入内容存储并在目标路径创建链接；digest 为空时读取文件计算"""
+        digest = digest or await to_thread(self.digest, temp)
+        size, reused = await to_thread(self.__commit, temp, path, digest)
+        if reused:
+            self.deduplicated += 1
+            self.saved += size
+        else:
+            self.stored += 1
+        await self.recorder.add(
+            path.relative_to(self.folder).as_posix(),
+            digest,
+            size,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "stored": self.stored,
+            "deduplicated": self.deduplicated,
+            "saved_bytes": self.saved,
+        }
+
+    def __commit(self, temp: Path, path: Path, digest: str) -> tuple[int, bool]:
+        blob = self.blob(digest)
+        size = temp.stat().st_size
+        if reused := blob.is_file():
+            temp.unlink()
+        else:
+            blob.parent.mkdir(exist_ok=True)
+            replace(temp, blob)
+        self.link(blob, path, self.hardlink)
+        return size, reused
+
+    @classmethod
+    def link(cls, blob: Path, path: Path, hardlink: bool = True) -> None:
+        path.unlink(missing_ok=True)
+        if cls.__reflink(blob, path):
+            return
+        if hardlink:
+            try:
+                link(blob, path)
+                return
+            except OSError:
+                pass
+        copy2(blob, path)
+
+    @classmethod
+    def __reflink(cls, blob: Path, path: Path) -> bool:
+        if not ioctl:
+            return False
+        try:
+            with blob.open("rb") as source, path.open("wb") as target:
+                ioctl(target.fileno(), cls.FICLONE, source.fileno())
+            return True
+        except OSError:
+            path.unlink(missing_ok=True)
+            return False
@@ -14,3 +14,18 @@ class ExtractData(BaseModel):
     message: str
     params: ExtractParams
     data: dict | None
+
+
+class ExtractBatchParams(BaseModel):
+    urls: list[str]
+    download: bool = False
+    index: list[str | int] | None = None
+    cookie: str = None
+    proxy: str = None
+    skip: bool = False
+
+
+class ExtractResult(BaseModel):
+    url: str
+    message: str
+    data: dict | None
@@ -0,0 +1,115 @@
+from asyncio import to_thread
+from collections import OrderedDict
+from hashlib import sha1
+from os import replace, scandir
+from pathlib import Path
+from secrets import token_hex
+from time import time
+from zlib import compress, decompress, error
+
+__all__ = ["PageCache"]
+
+
+class PageCache:
+    """作品页面 HTML 的磁盘缓存，以作品 ID 为键、zlib 压缩存储
+
+    条目超过有效期后失效；缓存总大小超过上限时按最近使用顺序淘汰。
+    重启后以文件写入时间近似最近使用顺序。
+    """
+
+    SUFFIX = ".html.z"
+
+    def __init__(
+        self,
+        root: Path,
+        enabled: bool = False,
+        ttl: float = 600,
+        max_size: int = 256 * 1024 * 1024,
+    ):
+        self.root = root
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_size = max(max_size, 0)
+        self.entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        if enabled:
+            self.root.mkdir(exist_ok=True)
+            self.__load()
+
+    async def get(self, id_: str) -> str:
+        if not self.enabled:
+            return ""
+        key = self.key(id_)
+        if not (entry := self.entries.get(key)) or time() - entry[1] > self.ttl:
+            self.misses += 1
+            return ""
+        try:
+            html = await to_thread(self.__read, self.root.joinpath(key))
+        except (OSError, error, UnicodeDecodeError):
+            self.__discard(key)
+            self.misses += 1
+            return ""
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return html
+
+    async def put(self, id_: str, html: str) -> None:
+        if not self.enabled or not html:
+            return
+        key = self.key(id_)
+        size = await to_thread(self.__write, self.root.joinpath(key), html)
+        self.__discard(key, False)
+        self.entries[key] = (size, time())
+        self.size += size
+        self.__evict()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    @classmethod
+    def key(cls, id_: str) -> str:
+        return sha1(id_.encode()).hexdigest() + cls.SUFFIX
+
+    @staticmethod
+    def __read(file: Path) -> str:
+        return decompress(file.read_bytes()).decode("utf-8")
+
+    @staticmethod
+    def __write(file: Path, html: str) -> int:
+        temp = file.with_name(f"{file.name}.{token_hex(4)}.tmp")
+        temp.write_bytes(data := compress(html.encode("utf-8"), 6))
+        replace(temp, file)
+        return len(data)
+
+    def __load(self) -> None:
+        items = []
+        with scandir(self.root) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                    stat = entry.stat()
+                    items.append((stat.st_mtime, entry.name, stat.st_size))
+        for mtime, name, size in sorted(items):
+            self.entries[name] = (size, mtime)
+            self.size += size
+        self.__evict()
+
+    def __evict(self) -> None:
+        now = time()
+        for key, (__, stored) in list(self.entries.items()):
+            if now - stored > self.ttl:
+                self.__discard(key)
+        while self.size > self.max_size and self.entries:
+            self.__discard(next(iter(self.entries)))
+
+    def __discard(self, key: str, delete: bool = True) -> None:
+        if entry := self.entries.pop(key, None):
+            self.size -= entry[0]
+        if delete:
+            self.root.joinpath(key).unlink(missing_ok=True)
@@ -0,0 +1,258 @@
+from asyncio import (
+    CancelledError,
+    Task,
+    create_task,
+    gather,
+    get_running_loop,
+    sleep,
+)
+from time import monotonic
+
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    AsyncHTTPTransport,
+    Request,
+    Response,
+    TimeoutException,
+    TransportError,
+)
+
+from ..translation import _
+from .static import INFO, USERAGENT, WARNING
+
+__all__ = ["ProxyPool", "ProxyPoolTransport"]
+
+
+class ProxyState:
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        self.latency = 0.0
+        self.failure_rate = 0.0
+        self.failures = 0
+        self.success = 0
+        self.failure = 0
+        self.checked = 0.0
+        self.retry_at = 0.0
+        self.healthy = True
+        self.tip = (_("代理 {0} 正在后台测试").format(proxy), INFO)
+
+    def score(self) -> float:
+        return self.latency * (1 + 4 * self.failure_rate)
+
+    def due(self, now: float, interval: float) -> bool:
+        if self.healthy:
+            return not self.checked or now - self.checked >= interval
+        return now >= self.retry_at
+
+
+class ProxyPool:
+    """代理池：后台异步检测代理可用性，按延迟与失败率评分，请求优先使用评分最优的代理；
+    失败的代理按指数退避稍后重新检测，全部不可用时直接连接"""
+
+    FAILURE_STATUS = 407
+
+    def __init__(
+        self,
+        proxies: list[str],
+        timeout: int = 10,
+        check_interval: float = 300,
+        retry_interval: float = 30,
+        max_failures: int = 3,
+        smoothing: float = 0.3,
+        url: str = "https://www.xiaohongshu.com/explore",
+    ):
+        self.states = {proxy: ProxyState(proxy) for proxy in dict.fromkeys(proxies)}
+        self.timeout = timeout
+        self.check_interval = max(check_interval, 1)
+        self.retry_interval = min(max(retry_interval, 1), self.check_interval)
+        self.max_failures = max(max_failures, 1)
+        self.smoothing = smoothing
+        self.url = url
+        self.task: Task | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.states)
+
+    def start(self) -> None:
+        if not self.states or self.task:
+            return
+        try:
+            get_running_loop()
+        except RuntimeError:
+            return
+        self.task = create_task(self.__run())
+
+    async def close(self) -> None:
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except CancelledError:
+                pass
+            self.task = None
+
+    def select(self) -> str | None:
+        now = monotonic()
+        candidates = [
+            state
+            for state in self.states.values()
+            if state.healthy or now >= state.retry_at
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=ProxyState.score).proxy
+
+    def succeed(self, proxy: str, latency: float) -> None:
+        if not (state := self.states.get(proxy)):
+            return
+        state.success += 1
+        state.failures = 0
+        state.healthy = True
+        state.latency = (
+            state.latency + (latency - state.latency) * self.smoothing
+            if state.latency
+            else latency
+        )
+        state.failure_rate -= state.failure_rate * self.smoothing
+
+    def fail(self, proxy: str, force: bool = False) -> None:
+        if not (state := self.states.get(proxy)):
+            return
+        state.failure += 1
+        state.failures += 1
+        state.failure_rate += (1 - state.failure_rate) * self.smoothing
+        if force:
+            state.failures = max(state.failures, self.max_failures)
+        if state.failures >= self.max_failures:
+            state.healthy = False
+            state.retry_at = monotonic() + min(
+                self.retry_interval * 2 ** (state.failures - self.max_failures),
+                self.check_interval,
+            )
+
+    async def check(self, state: ProxyState) -> None:
+        start = monotonic()
+        try:
+            async with AsyncClient(
+                proxy=state.proxy,
+                timeout=self.timeout,
+                headers={
+                    "User-Agent": USERAGENT,
+                },
+            ) as client:
+                response = await client.get(self.url)
+                response.raise_for_status()
+        except TimeoutException:
+            state.tip = (_("代理 {0} 测试超时").format(state.proxy), WARNING)
+        except Exception as e:
+            # 包括请求失败、状态码异常，以及代理地址无效或缺少 SOCKS 支持时无法创建客户端
+            state.tip = (
+                _("代理 {0} 测试失败：{1}").format(
+                    state.proxy,
+                    e,
+                ),
+                WARNING,
+            )
+        else:
+            state.tip = (_("代理 {0} 测试成功").format(state.proxy),)
+            state.checked = monotonic()
+            self.succeed(state.proxy, state.checked - start)
+            return
+        state.checked = monotonic()
+        # 检测失败直接判定为不可用
+        self.fail(state.proxy, True)
+
+    def tips(self) -> list[tuple]:
+        return [state.tip for state in self.states.values()]
+
+    def stats(self) -> dict[str, dict]:
+        now = monotonic()
+        return {
+            proxy: {
+                "healthy": state.healthy,
+                "score": round(state.score(), 4),
+                "latency_ms": round(state.latency * 1000, 2),
+                "failure_rate": round(state.failure_rate, 4),
+                "success": state.success,
+                "failure": state.failure,
+                "retry_in": (
+                    0 if state.healthy else max(round(state.retry_at - now, 1), 0)
+                ),
+            }
+            for proxy, state in self.states.items()
+        }
+
+    async def __run(self) -> None:
+        while True:
+            now = monotonic()
+            if due := [
+                state
+                for state in self.states.values()
+                if state.due(now, self.check_interval)
+            ]:
+                await gather(
+                    *(self.check(state) for state in due),
+                    return_exceptions=True,
+                )
+            await sleep(self.__next_check())
+
+    def __next_check(self) -> float:
+        now = monotonic()
+        return max(
+            min(
+                (
+                    state.checked + self.check_interval
+                    if state.healthy
+                    else state.retry_at
+                )
+                - now
+                for state in self.states.values()
+            ),
+            1,
+        )
+
+
+class ProxyPoolTransport(AsyncBaseTransport):
+    """按请求从代理池选择代理的传输层，并将响应延迟与失败反馈给代理池"""
+
+    def __init__(self, pool: ProxyPool):
+        self.pool = pool
+        self.transports: dict[str | None, AsyncHTTPTransport] = {}
+
+    async def handle_async_request(self, request: Request) -> Response:
+        self.pool.start()
+        proxy = self.pool.select()
+        try:
+            transport = self.__transport(proxy)
+        except (ImportError, ValueError):
+            # 代理无法使用时判定为不可用，本次请求直接连接
+            self.pool.fail(proxy, True)
+            proxy = None
+            transport = self.__transport(proxy)
+        if not proxy:
+            return await transport.handle_async_request(request)
+        start = monotonic()
+        try:
+            response = await transport.handle_async_request(request)
+        except TransportError:
+            self.pool.fail(proxy)
+            raise
+        if (
+            response.status_code == self.pool.FAILURE_STATUS
+            or response.status_code >= 500
+        ):
+            self.pool.fail(proxy)
+        else:
+            self.pool.succeed(proxy, monotonic() - start)
+        return response
+
+    async def aclose(self) -> None:
+        for transport in self.transports.values():
+            await transport.aclose()
+        self.transports.clear()
+
+    def __transport(self, proxy: str | None) -> AsyncHTTPTransport:
+        if proxy not in self.transports:
+            self.transports[proxy] = AsyncHTTPTransport(proxy=proxy)
+        return self.transports[proxy]
@@ -0,0 +1,145 @@
+from asyncio import CancelledError, sleep
+from collections import deque
+from time import monotonic
+from urllib.parse import urlparse
+
+__all__ = ["RateLimiter", "BandwidthLimiter"]
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = monotonic()
+        self.requests = 0
+        self.delayed = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self, tokens: float = 1) -> float:
+        """预占令牌，返回需要等待的秒数；令牌允许为负，以便并发请求按到达顺序排队"""
+        now = monotonic()
+        self.tokens = min(self.tokens + (now - self.updated) * self.rate, self.burst)
+        self.updated = now
+        self.tokens -= tokens
+        return max(-self.tokens / self.rate, 0)
+
+    def record(self, wait: float) -> None:
+        self.requests += 1
+        if wait:
+            self.delayed += 1
+            self.waited += wait
+            self.max_wait = max(self.max_wait, wait)
+
+
+class RateLimiter:
+    """按域名划分的令牌桶限速器，所有并发任务共享同一速率；突发容量内的请求无需等待"""
+
+    def __init__(
+        self,
+        rate: float = 0.5,
+        burst: int = 3,
+    ):
+        self.rate = max(rate, 0.01)
+        self.burst = max(burst, 1)
+        self.buckets: dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str) -> float:
+        bucket = self.__bucket(url)
+        if wait := bucket.reserve():
+            try:
+                await sleep(wait)
+            except CancelledError:
+                bucket.tokens += 1
+                raise
+        bucket.record(wait)
+        return wait
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            host: {
+                "rate": bucket.rate,
+                "burst": bucket.burst,
+                "requests": bucket.requests,
+                "delayed": bucket.delayed,
+                "wait_total_s": round(bucket.waited, 3),
+                "wait_avg_ms": round(
+                    bucket.waited / bucket.requests * 1000 if bucket.requests else 0,
+                    2,
+                ),
+                "wait_max_ms": round(bucket.max_wait * 1000, 2),
+            }
+            for host, bucket in self.buckets.items()
+        }
+
+    def __bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).hostname or ""
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+
+class BandwidthLimiter:
+    """下载带宽限制，令牌单位为字节；全局令牌桶由所有下载共享，单次请求可额外指定上限
+
+    ``rate`` 为 0 时不限速，仅统计吞吐量；``throughput`` 为最近 ``WINDOW`` 秒的平均速度。
+    """
+
+    WINDOW = 5
+
+    def __init__(self, rate: int = 0):
+        self.rate = max(int(rate or 0), 0)
+        self.bucket = TokenBucket(self.rate, self.rate) if self.rate else None
+        self.bytes = 0
+        self.delayed = 0
+        self.waited = 0.0
+        self.started = monotonic()
+        self.window: deque[tuple[float, int]] = deque()
+        self.window_bytes = 0
+
+    @staticmethod
+    def job(rate: int = None) -> TokenBucket | None:
+        """创建单次请求的令牌桶，同一请求的所有文件共享该上限"""
+        return TokenBucket(rate, rate) if rate and rate > 0 else None
+
+    async def consume(self, size: int, job: TokenBucket = None) -> float:
+        """记录已接收的字节数，超出带宽上限时等待，暂停读取期间由 TCP 流控降低发送速度"""
+        self.__record(size)
+        buckets = [i for i in (self.bucket, job) if i]
+        if not buckets:
+            return 0
+        wait = max(i.reserve(size) for i in buckets)
+        if wait:
+            try:
+                await sleep(wait)
+            except CancelledError:
+                for bucket in buckets:
+                    bucket.tokens += size
+                raise
+            self.delayed += 1
+            self.waited += wait
+        return wait
+
+    def throughput(self) -> float:
+        self.__expire(now := monotonic())
+        return self.window_bytes / max(min(now - self.started, self.WINDOW), 1e-3)
+
+    def stats(self) -> dict:
+        return {
+            "limit_bps": self.rate,
+            "throughput_bps": round(self.throughput()),
+            "bytes": self.bytes,
+            "delayed": self.delayed,
+            "wait_total_s": round(self.waited, 3),
+        }
+
+    def __record(self, size: int) -> None:
+        self.bytes += size
+        self.window.append((now := monotonic(), size))
+        self.window_bytes += size
+        self.__expire(now)
+
+    def __expire(self, now: float) -> None:
+        while self.window and now - self.window[0][0] > self.WINDOW:
+            self.window_bytes -= self.window.popleft()[1]
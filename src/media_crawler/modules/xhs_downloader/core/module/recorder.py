@@ -1,16 +1,93 @@
-from asyncio import CancelledError
+from array import array
+from asyncio import CancelledError, Lock, Task, create_task, sleep
+from bisect import bisect_left
+from heapq import merge
 from contextlib import suppress
+from itertools import groupby
+from operator import itemgetter
 from typing import TYPE_CHECKING
 from shutil import move
+from time import time
 from aiosqlite import connect
 
 if TYPE_CHECKING:
     from ..module import Manager
 
-__all__ = ["IDRecorder", "DataRecorder", "MapRecorder"]
+__all__ = [
+    "IDRecorder",
+    "DataRecorder",
+    "MapRecorder",
+    "LinkRecorder",
+    "MediaRecorder",
+    "AuthorRecorder",
+    "JournalRecorder",
+]
+
+
+class IDIndex:
+    """作品 ID 的内存成员索引
+
+    启动时载入的 ID 以 64 位指纹的有序数组保存，每个 ID 仅占用 8 字节；
+    批量载入时每批指纹排序后暂存为数组，合并时逐个归并，不会为全部 ID 创建 Python 对象；
+    运行期间新增的 ID 存放在集合中。指纹冲突概率约为 n / 2^64，可忽略不计。
+    """
+
+    MASK = (1 << 64) - 1
+
+    def __init__(self):
+        self.loaded = array("Q")
+        self.batches: list[array] = []
+        self.added: set[int] = set()
+
+    @classmethod
+    def fingerprint(cls, id_: str) -> int:
+        return hash(id_) & cls.MASK
+
+    def update(self, ids) -> None:
+        """批量载入 ID，调用 compact 后合并进有序数组"""
+        self.batches.append(array("Q", sorted(map(self.fingerprint, ids))))
+
+    def compact(self) -> None:
+        """将批量载入与新增的指纹归并进有序数组以降低内存占用"""
+        loaded, last = array("Q"), None
+        for value in merge(self.loaded, *self.batches, sorted(self.added)):
+            if value != last:
+                loaded.append(value)
+                last = value
+        self.loaded = loaded
+        self.batches.clear()
+        self.added.clear()
+
+    def add(self, id_: str) -> None:
+        self.added.add(self.fingerprint(id_))
+
+    def discard(self, id_: str) -> None:
+        value = self.fingerprint(id_)
+        self.added.discard(value)
+        for values in (self.loaded, *self.batches):
+            if (i := self.__search(values, value)) is not None:
+                del values[i]
+
+    def __contains__(self, id_: str) -> bool:
+        value = self.fingerprint(id_)
+        return value in self.added or any(
+            self.__search(values, value) is not None
+            for values in (self.loaded, *self.batches)
+        )
+
+    def __len__(self) -> int:
+        return len(self.loaded) + sum(len(i) for i in self.batches) + len(self.added)
+
+    @staticmethod
+    def __search(values: array, value: int) -> int | None:
+        i = bisect_left(values, value)
+        return i if i < len(values) and values[i] == value else None
 
 
 class IDRecorder:
+    # 为 True 时，对应功能关闭的情况下不创建数据库文件
+    OPTIONAL = False
+
     def __init__(self, manager: "Manager"):
         self.name = "ExploreID.db"
         self.file = manager.root.joinpath(self.name)
@@ -18,19 +95,64 @@ class IDRecorder:
         self.switch = manager.download_record
         self.database = None
         self.cursor = None
+        self.index = IDIndex()
+        self.batch_size = manager.record_batch_size
+        self.flush_interval = manager.record_flush_interval
+        self.pending: dict[str, tuple[str, tuple]] = {}
+        self.lock = Lock()
+        self.timer: Task | None = None
 
-    async def _connect_database(self):
+    async def _open_database(self):
         self.database = await connect(self.file)
+        await self.database.execute("PRAGMA journal_mode=WAL;")
+        await self.database.execute("PRAGMA synchronous=NORMAL;")
         self.cursor = await self.database.cursor()
+
+    async def _connect_database(self):
+        await self._open_database()
         await self.database.execute(
             "CREATE TABLE IF NOT EXISTS explore_id (ID TEXT PRIMARY KEY);"
         )
         await self.database.commit()
+        if self.switch:
+            await self._load_index()
+
+    async def _load_index(self):
+        await self.cursor.execute("SELECT ID FROM explore_id")
+        while rows := await self.cursor.fetchmany(10000):
+            self.index.update(i[0] for i in rows)
+        self.index.compact()
+
+    async def _write(self, key: str, sql: str, parameters: tuple) -> None:
+        """缓冲写入操作，达到批量大小或间隔时间后在同一事务中提交；同一主键仅保留最后一次操作"""
+        self.pending[key] = (sql, parameters)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+        elif not self.timer:
+            self.timer = create_task(self.__flush_later())
+
+    async def __flush_later(self) -> None:
+        await sleep(self.flush_interval)
+        self.timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """立即提交所有缓冲的写入操作"""
+        async with self.lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, {}
+            try:
+                for sql, items in groupby(batch.values(), key=itemgetter(0)):
+                    await self.database.executemany(sql, [i[1] for i in items])
+                await self.database.commit()
+            except BaseException:
+                self.pending = batch | self.pending
+                raise
 
     async def select(self, id_: str):
-        if self.switch:
-            await self.cursor.execute("SELECT ID FROM explore_id WHERE ID=?", (id_,))
-            return await self.cursor.fetchone()
+        if self.switch and id_ in self.index:
+            return (id_,)
 
     async def add(
         self,
@@ -40,32 +162,49 @@ class IDRecorder:
         **kwargs,
     ) -> None:
         if self.switch:
-            await self.database.execute("REPLACE INTO explore_id VALUES (?);", (id_,))
-            await self.database.commit()
+            await self._write(id_, "REPLACE INTO explore_id VALUES (?);", (id_,))
+            self.index.add(id_)
 
     async def __delete(self, id_: str) -> None:
         if id_:
-            await self.database.execute("DELETE FROM explore_id WHERE ID=?", (id_,))
-            await self.database.commit()
+            await self._write(id_, "DELETE FROM explore_id WHERE ID=?", (id_,))
+            self.index.discard(id_)
 
     async def delete(self, ids: list[str]):
         if self.switch:
             [await self.__delete(i) for i in ids]
+            await self.flush()
 
     async def all(self):
         if self.switch:
+            await self.flush()
             await self.cursor.execute("SELECT ID FROM explore_id")
             return [i[0] for i in await self.cursor.fetchmany()]
 
     async def __aenter__(self):
+        if self.OPTIONAL and not self.switch:
+            return self
         self.compatible()
         await self._connect_database()
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        if self.timer:
+            self.timer.cancel()
+            with suppress(CancelledError):
+                await self.timer
+            self.timer = None
+        if not self.database:
+            return
+        await self.flush()
         with suppress(CancelledError):
             await self.cursor.close()
         await self.database.close()
+        self.database = None
+        self.cursor = None
 
     def compatible(
         self,
@@ -108,8 +247,7 @@ class DataRecorder(IDRecorder):
         self.switch = manager.record_data
 
     async def _connect_database(self):
-        self.database = await connect(self.file)
-        self.cursor = await self.database.cursor()
+        await self._open_database()
         await self.database.execute(f"""CREATE TABLE IF NOT EXISTS explore_data (
         {",".join(" ".join(i) for i in self.DATA_TABLE)}
         );""")
@@ -120,7 +258,8 @@ class DataRecorder(IDRecorder):
 
     async def add(self, **kwargs) -> None:
         if self.switch:
-            await self.database.execute(
+            await self._write(
+                kwargs["作品ID"],
                 f"""REPLACE INTO explore_data (
         {", ".join(i[0] for i in self.DATA_TABLE)}
         ) VALUES (
@@ -128,7 +267,6 @@ class DataRecorder(IDRecorder):
         );""",
                 self.__generate_values(kwargs),
             )
-            await self.database.commit()
 
     async def __delete(self, id_: str) -> None:
         pass
@@ -149,10 +287,10 @@ class MapRecorder(IDRecorder):
         self.name = "MappingData.db"
         self.file = manager.root.joinpath(self.name)
         self.switch = manager.author_archive
+        self.cache: dict[str, str] = {}
 
     async def _connect_database(self):
-        self.database = await connect(self.file)
-        self.cursor = await self.database.cursor()
+        await self._open_database()
         await self.database.execute(
             "CREATE TABLE IF NOT EXISTS mapping_data ("
             "ID TEXT PRIMARY KEY,"
@@ -163,21 +301,26 @@ class MapRecorder(IDRecorder):
 
     async def select(self, id_: str):
         if self.switch:
+            if id_ in self.cache:
+                return (self.cache[id_],)
             await self.cursor.execute(
                 "SELECT NAME FROM mapping_data WHERE ID=?", (id_,)
             )
-            return await self.cursor.fetchone()
+            if row := await self.cursor.fetchone():
+                self.cache[id_] = row[0]
+            return row
 
     async def add(self, id_: str, name: str, *args, **kwargs) -> None:
         if self.switch:
-            await self.database.execute(
+            self.cache[id_] = name
+            await self._write(
+                id_,
                 "REPLACE INTO mapping_data VALUES (?, ?);",
                 (
                     id_,
                     name,
                 ),
             )
-            await self.database.commit()
 
     async def __delete(self, id_: str) -> None:
         pass
@@ -187,5 +330,331 @@ class MapRecorder(IDRecorder):
 
     async def all(self):
         if self.switch:
+            await self.flush()
             await self.cursor.execute("SELECT ID, NAME FROM mapping_data")
             return [i[0] for i in await self.cursor.fetchmany()]
+
+
+class LinkRecorder(IDRecorder):
+    OPTIONAL = True
+
+    def __init__(self, manager: "Manager"):
+        super().__init__(manager)
+        self.name = "ShortLink.db"
+        self.file = manager.root.joinpath(self.name)
+        self.changed = True
+        self.switch = manager.link_cache_persist
+        self.ttl = manager.link_cache_ttl
+
+    async def _connect_database(self):
+        await self._open_database()
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS short_link ("
+            "URL TEXT PRIMARY KEY,"
+            "TARGET TEXT NOT NULL,"
+            "CREATED REAL NOT NULL"
+            ");"
+        )
+        await self.database.execute(
+            "DELETE FROM short_link WHERE CREATED<?", (time() - self.ttl,)
+        )
+        await self.database.commit()
+
+    async def select(self, id_: str):
+        if self.switch:
+            # 并发解析不同短链接时各自使用独立游标
+            async with self.database.execute(
+                "SELECT TARGET, CREATED FROM short_link WHERE URL=? AND CREATED>=?",
+                (id_, time() - self.ttl),
+            ) as cursor:
+                return await cursor.fetchone()
+
+    async def add(self, id_: str, name: str, created: float = None, **kwargs) -> None:
+        if self.switch:
+            await self._write(
+                id_,
+                "REPLACE INTO short_link VALUES (?, ?, ?);",
+                (
+                    id_,
+                    name,
+                    created or time(),
+                ),
+            )
+
+    async def __delete(self, id_: str) -> None:
+        pass
+
+    async def delete(self, ids: list[str]):
+        pass
+
+    async def all(self):
+        pass
+
+
+class MediaRecorder(IDRecorder):
+    OPTIONAL = True
+
+    def __init__(self, manager: "Manager"):
+        super().__init__(manager)
+        self.name = "MediaStore.db"
+        self.file = manager.root.joinpath(self.name)
+        self.changed = True
+        self.switch = manager.media_dedup
+
+    async def _connect_database(self):
+        await self._open_database()
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS media_file ("
+            "PATH TEXT PRIMARY KEY,"
+            "HASH TEXT NOT NULL,"
+            "SIZE INTEGER NOT NULL"
+            ");"
+        )
+        await self.database.execute(
+            "CREATE INDEX IF NOT EXISTS media_file_hash ON media_file (HASH);"
+        )
+        await self.database.commit()
+
+    async def select(self, id_: str):
+        if self.switch:
+            await self.flush()
+            async with self.database.execute(
+                "SELECT HASH, SIZE FROM media_file WHERE PATH=?", (id_,)
+            ) as cursor:
+                return await cursor.fetchone()
+
+    async def add(self, id_: str, name: str, size: int = 0, **kwargs) -> None:
+        if self.switch:
+            await self._write(
+                id_,
+                "REPLACE INTO media_file VALUES (?, ?, ?);",
+                (
+                    id_,
+                    name,
+                    size,
+                ),
+            )
+
+    async def __delete(self, id_: str) -> None:
+        pass
+
+    async def delete(self, ids: list[str]):
+        pass
+
+    async def all(self):
+        pass
+
+
+class AuthorRecorder(IDRecorder):
+    """作者同步进度：记录每位作者已处理的最新作品 ID，作为增量同步的高水位线"""
+
+    def __init__(self, manager: "Manager"):
+        super().__init__(manager)
+        self.name = "AuthorSync.db"
+        self.file = manager.root.joinpath(self.name)
+        self.changed = True
+        self.switch = True
+        self.connecting = Lock()
+
+    async def __aenter__(self):
+        # 首次同步作者主页时才创建数据库
+        return self
+
+    async def __ready(self) -> None:
+        async with self.connecting:
+            if not self.database:
+                await self._connect_database()
+
+    async def _connect_database(self):
+        await self._open_database()
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS author_sync ("
+            "ID TEXT PRIMARY KEY,"
+            "NOTE TEXT NOT NULL,"
+            "UPDATED REAL NOT NULL"
+            ");"
+        )
+        await self.database.commit()
+
+    async def select(self, id_: str):
+        await self.__ready()
+        await self.flush()
+        async with self.database.execute(
+            "SELECT NOTE, UPDATED FROM author_sync WHERE ID=?", (id_,)
+        ) as cursor:
+            return await cursor.fetchone()
+
+    async def add(self, id_: str, name: str, *args, **kwargs) -> None:
+        await self.__ready()
+        await self._write(
+            id_,
+            "REPLACE INTO author_sync VALUES (?, ?, ?);",
+            (
+                id_,
+                name,
+                time(),
+            ),
+        )
+
+    async def __delete(self, id_: str) -> None:
+        pass
+
+    async def delete(self, ids: list[str]):
+        pass
+
+    async def all(self):
+        pass
+
+
+class JournalRecorder(IDRecorder):
+    """下载日志：记录每个文件任务的链接、保存位置、状态与已写入字节数，重启后据此恢复未完成的任务
+
+    进行中的任务同时保存在内存中，每次状态变化写入完整的记录行；
+    已完成的记录保留 ``KEEP`` 秒后在启动时清理。
+    """
+
+    OPTIONAL = True
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    KEEP = 7 * 24 * 3600
+    FIELDS = (
+        "KEY",
+        "NOTE",
+        "URL",
+        "PATH",
+        "NAME",
+        "FORMAT",
+        "MTIME",
+        "STATE",
+        "SIZE",
+        "UPDATED",
+    )
+
+    def __init__(self, manager: "Manager"):
+        super().__init__(manager)
+        self.name = "DownloadJournal.db"
+        self.file = manager.root.joinpath(self.name)
+        self.changed = True
+        self.switch = manager.download_journal
+        self.active: dict[str, dict] = {}
+
+    async def _connect_database(self):
+        await self._open_database()
+        await self.database.execute(
+            "CREATE TABLE IF NOT EXISTS download_journal ("
+            "KEY TEXT PRIMARY KEY,"
+            "NOTE TEXT NOT NULL,"
+            "URL TEXT NOT NULL,"
+            "PATH TEXT NOT NULL,"
+            "NAME TEXT NOT NULL,"
+            "FORMAT TEXT NOT NULL,"
+            "MTIME INTEGER,"
+            "STATE TEXT NOT NULL,"
+            "SIZE INTEGER NOT NULL,"
+            "UPDATED REAL NOT NULL"
+            ");"
+        )
+        await self.database.execute(
+            "DELETE FROM download_journal WHERE STATE=? AND UPDATED<?",
+            (self.COMPLETED, time() - self.KEEP),
+        )
+        await self.database.commit()
+
+    @staticmethod
+    def key(path, name: str, format_: str) -> str:
+        return str(path.joinpath(f"{name}.{format_}"))
+
+    async def select(self, id_: str):
+        if self.switch:
+            await self.flush()
+            async with self.database.execute(
+                "SELECT STATE, SIZE FROM download_journal WHERE KEY=?", (id_,)
+            ) as cursor:
+                return await cursor.fetchone()
+
+    async def add(
+        self,
+        id_: str,
+        name: str,
+        url: str = "",
+        path=None,
+        format_: str = "",
+        mtime: int = None,
+        **kwargs,
+    ) -> None:
+        """记录排队等待下载的文件任务；id_ 为所属作品 ID，name 为不含后缀的文件名"""
+        if self.switch and not self.running(key := self.key(path, name, format_)):
+            self.active[key] = {
+                "KEY": key,
+                "NOTE": id_,
+                "URL": url,
+                "PATH": str(path),
+                "NAME": name,
+                "FORMAT": format_,
+                "MTIME": mtime,
+                "STATE": self.QUEUED,
+                "SIZE": 0,
+            }
+            await self.__save(key)
+
+    async def update(self, key: str, state: str, size: int = None) -> None:
+        if self.switch and (row := self.active.get(key)):
+            row["STATE"] = state
+            if size is not None:
+                row["SIZE"] = size
+            await self.__save(key)
+            if state in {self.COMPLETED, self.FAILED}:
+                del self.active[key]
+
+    async def unfinished(self) -> list[dict]:
+        """返回上次运行中断时尚未完成的文件任务，并载入内存以便继续记录状态"""
+        if not self.switch:
+            return []
+        await self.flush()
+        async with self.database.execute(
+            f"SELECT {', '.join(self.FIELDS)} FROM download_journal "
+            "WHERE STATE IN (?, ?) ORDER BY UPDATED",
+            (self.QUEUED, self.RUNNING),
+        ) as cursor:
+            rows = [dict(zip(self.FIELDS, i)) for i in await cursor.fetchall()]
+        for row in rows:
+            row.pop("UPDATED")
+            row["STATE"] = self.QUEUED
+            self.active.setdefault(row["KEY"], row)
+        return rows
+
+    def running(self, key: str) -> bool:
+        row = self.active.get(key)
+        return row is not None and row["STATE"] == self.RUNNING
+
+    async def completed(self, id_: str) -> bool:
+        """作品在日志中的全部文件任务均已完成时返回 True"""
+        if not self.switch:
+            return False
+        await self.flush()
+        async with self.database.execute(
+            "SELECT COUNT(*), SUM(STATE=?) FROM download_journal WHERE NOTE=?",
+            (self.COMPLETED, id_),
+        ) as cursor:
+            total, done = await cursor.fetchone()
+        return bool(total) and total == done
+
+    async def __save(self, key: str) -> None:
+        row = self.active[key]
+        await self._write(
+            key,
+            "REPLACE INTO download_journal VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);",
+            (*(row[i] for i in self.FIELDS[:-1]), time()),
+        )
+
+    async def __delete(self, id_: str) -> None:
+        pass
+
+    async def delete(self, ids: list[str]):
+        pass
+
+    async def all(self):
+        pass
@@ -0,0 +1,114 @@
+from asyncio import sleep
+from random import uniform
+from urllib.parse import urlparse
+
+from httpx import HTTPError, HTTPStatusError, TransportError
+
+__all__ = ["Failure", "RetryPolicy"]
+
+
+class Failure:
+    """被重试装饰器识别的失败结果，携带异常以及放弃重试时返回的值"""
+
+    def __init__(self, error: BaseException | None, value=None):
+        self.error = error
+        self.value = value
+
+    def __bool__(self) -> bool:
+        return False
+
+
+class RetryBudget:
+    def __init__(self, tokens: float):
+        self.tokens = tokens
+        self.requests = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.permanent = 0
+
+
+class RetryPolicy:
+    """重试策略：指数退避加随机抖动，区分可重试与永久错误，并按主机限制重试预算
+
+    每个主机的预算最多 ``budget_maximum`` 个令牌，每个首次请求存入 ``budget_ratio`` 个令牌，
+    每次重试消耗一个令牌；大面积失败时预算耗尽，后续失败不再重试，避免形成重试风暴。
+    """
+
+    RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        base: float = 0.5,
+        maximum: float = 30,
+        budget_ratio: float = 0.2,
+        budget_maximum: float = 10,
+    ):
+        self.base = max(base, 0)
+        self.maximum = max(maximum, self.base)
+        self.budget_ratio = max(budget_ratio, 0)
+        self.budget_maximum = max(budget_maximum, 0)
+        self.budgets: dict[str, RetryBudget] = {}
+
+    def start(self, url: str) -> str:
+        """记录一次首次请求并返回主机名"""
+        budget = self.__budget(host := self.host(url))
+        budget.requests += 1
+        budget.tokens = min(budget.tokens + self.budget_ratio, self.budget_maximum)
+        return host
+
+    async def backoff(self, host: str, attempt: int, result) -> bool:
+        """判断失败结果是否应当重试，需要重试时等待退避时间后返回 True"""
+        budget = self.__budget(host)
+        error = result.error if isinstance(result, Failure) else None
+        if error and not self.retryable(error):
+            budget.permanent += 1
+            return False
+        if budget.tokens < 1:
+            budget.exhausted += 1
+            return False
+        budget.tokens -= 1
+        budget.retries += 1
+        await sleep(self.delay(attempt, error))
+        return True
+
+    def retryable(self, error: BaseException) -> bool:
+        if isinstance(error, HTTPStatusError):
+            return error.response.status_code in self.RETRYABLE_STATUS
+        return isinstance(error, TransportError) or not isinstance(error, HTTPError)
+
+    def delay(self, attempt: int, error: BaseException = None) -> float:
+        if (retry_after := self.__retry_after(error)) is not None:
+            return min(retry_after, self.maximum)
+        return uniform(0, min(self.base * 2**attempt, self.maximum))
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            host: {
+                "requests": budget.requests,
+                "retries": budget.retries,
+                "budget": round(budget.tokens, 2),
+                "exhausted": budget.exhausted,
+                "permanent": budget.permanent,
+            }
+            for host, budget in self.budgets.items()
+        }
+
+    @staticmethod
+    def host(url: str) -> str:
+        if not url.startswith("http"):
+            url = f"https://{url}"
+        return urlparse(url).hostname or ""
+
+    @staticmethod
+    def __retry_after(error: BaseException | None) -> float | None:
+        if not isinstance(error, HTTPStatusError):
+            return None
+        try:
+            return max(float(error.response.headers.get("Retry-After", "")), 0)
+        except ValueError:
+            return None
+
+    def __budget(self, host: str) -> RetryBudget:
+        if host not in self.budgets:
+            self.budgets[host] = RetryBudget(self.budget_maximum)
+        return self.budgets[host]
@@ -30,6 +30,38 @@ class Settings:
         "author_archive": False,  # 是否按作者归档
         "write_mtime": False,  # 是否写入修改时间
         "language": "zh_CN",  # 语言设置
+        "fetch_workers": 4,  # 批量处理时请求作品页面的并发数
+        "parse_workers": 2,  # 批量处理时解析作品数据的并发数
+        "download_workers": 2,  # 批量处理时下载作品文件的并发数
+        "queue_size": 8,  # 批量处理各阶段之间的队列容量
+        "monitor_workers": 4,  # 并发处理监听队列中作品链接的协程数量
+        "monitor_queue_size": 64,  # 监听队列容量，已满时新链接等待入队
+        "batch_concurrency": 8,  # 批量获取作品数据接口同时处理的链接数量
+        "segmented_download": False,  # 是否对大文件启用分段并发下载
+        "segment_threshold": 1024 * 1024 * 20,  # 启用分段下载的文件大小阈值(字节)
+        "segment_count": 4,  # 分段下载的分段数量
+        "max_concurrency": 16,  # 单个主机的最大下载并发数
+        "record_batch_size": 100,  # 数据库批量提交的记录数量
+        "record_flush_interval": 0.5,  # 数据库批量提交的最长间隔(秒)
+        "proxy_check_interval": 300,  # 代理池后台检测的间隔(秒)
+        "request_rate": 0.5,  # 每个域名每秒允许的请求数量
+        "request_burst": 3,  # 每个域名允许的突发请求数量
+        "link_cache_size": 1024,  # 短链接解析缓存的最大条目数量
+        "link_cache_ttl": 86400,  # 短链接解析缓存的有效期(秒)
+        "link_cache_persist": False,  # 是否将短链接解析结果保存至数据库
+        "page_cache": False,  # 是否启用作品页面磁盘缓存
+        "page_cache_ttl": 600,  # 作品页面缓存的有效期(秒)
+        "page_cache_size": 256 * 1024 * 1024,  # 作品页面缓存的最大占用空间(字节)
+        "media_dedup": False,  # 是否按文件内容去重保存作品文件
+        "write_buffer_size": 4 * 1024 * 1024,  # 下载文件的写入缓冲区大小(字节)
+        "io_threads": 2,  # 下载文件写入线程数量
+        "retry_backoff": 0.5,  # 重试退避基础时间(秒)，每次重试翻倍并加入随机抖动
+        "retry_backoff_max": 30,  # 重试退避最长时间(秒)
+        "retry_budget_ratio": 0.2,  # 每个主机的重试次数占请求次数的比例上限
+        "download_journal": True,  # 是否记录下载日志，启动时继续下载未完成的文件
+        "download_bandwidth": 0,  # 下载带宽上限(字节/秒)，0 表示不限制
+        "verify_checksum": False,  # 是否在下载时计算 MD5 并与响应头提供的校验值比对
+        "etag_checksum": False,  # 是否将 32 位十六进制的强 ETag 视为文件 MD5 参与校验
     }
     # 根据操作系统设置编码格式
     encode = "UTF-8-SIG" if system() == "Windows" else "UTF-8"
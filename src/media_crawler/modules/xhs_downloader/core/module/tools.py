@@ -5,17 +5,25 @@ from rich import print
 from rich.text import Text
 
 from ..translation import _
+from .retry_policy import Failure
 from .static import INFO
 
 
 def retry(function):
+    """失败时按 self.retry_policy 退避重试，最多重试 self.retry 次；第一个参数须为请求链接"""
+
     async def inner(self, *args, **kwargs):
-        if result := await function(self, *args, **kwargs):
-            return result
-        for __ in range(self.retry):
+        host = self.retry_policy.start(args[0] if args else kwargs["url"])
+        for attempt in range(self.retry + 1):
             if result := await function(self, *args, **kwargs):
                 return result
-        return result
+            if attempt == self.retry or not await self.retry_policy.backoff(
+                host,
+                attempt,
+                result,
+            ):
+                break
+        return result.value if isinstance(result, Failure) else result
 
     return inner
 
@@ -0,0 +1,164 @@
+from asyncio import shield, wrap_future
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import cycle
+from os import O_CREAT, O_WRONLY, SEEK_SET, close, lseek, write
+from os import open as open_file
+from pathlib import Path
+
+try:
+    from os import pwritev
+except ImportError:  # Windows
+    pwritev = None
+
+try:
+    from os import O_BINARY
+except ImportError:
+    O_BINARY = 0
+
+__all__ = ["WriterPool", "BufferedWriter"]
+
+IOV_MAX = 1024
+
+
+class WriterPool:
+    """下载文件专用的 I/O 线程，与默认线程池隔离
+
+    每个文件固定分配给一个单线程执行器，同一文件的打开、写入与关闭按提交顺序执行。
+    """
+
+    def __init__(self, threads: int = 2):
+        self.executors = [
+            ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=f"xhs-writer-{i}",
+            )
+            for i in range(max(threads, 1))
+        ]
+        self.next = cycle(self.executors)
+
+    def writer(
+        self,
+        file: Path,
+        offset: int = 0,
+        buffer_size: int = 4 * 1024 * 1024,
+        max_pending: int = 2,
+    ) -> "BufferedWriter":
+        return BufferedWriter(
+            next(self.next),
+            file,
+            offset,
+            buffer_size,
+            max_pending,
+        )
+
+    def shutdown(self) -> None:
+        for executor in self.executors:
+            executor.shutdown(wait=True)
+
+
+class BufferedWriter:
+    """合并写入：数据块先累积到缓冲区，达到阈值后交给 I/O 线程按偏移量写入
+
+    每个文件同时最多有 ``max_pending`` 个缓冲区等待写入，单个文件占用的内存不超过
+    ``buffer_size * (max_pending + 1)``；``written`` 为已经写入文件的字节数。
+    某次写入失败后，后续写入不再执行，文件中不会留下空洞。
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        file: Path,
+        offset: int = 0,
+        buffer_size: int = 4 * 1024 * 1024,
+        max_pending: int = 2,
+    ):
+        self.executor = executor
+        self.file = file
+        self.offset = offset
+        self.buffer_size = max(buffer_size, 1)
+        self.max_pending = max(max_pending, 1)
+        self.buffer: list[bytes] = []
+        self.buffered = 0
+        self.pending: deque[Future] = deque()
+        self.written = 0
+        self.descriptor: int | None = None
+        self.failed = False
+
+    async def __aenter__(self) -> "BufferedWriter":
+        self.descriptor = await self.__run(
+            open_file,
+            self.file,
+            O_WRONLY | O_CREAT | O_BINARY,
+            0o666,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None:
+                await self.flush()
+        finally:
+            # 关闭操作排在已提交的写入之后执行
+            self.pending.clear()
+            await self.__run(close, self.descriptor)
+
+    async def write(self, data: bytes) -> None:
+        self.buffer.append(data)
+        self.buffered += len(data)
+        if self.buffered >= self.buffer_size:
+            self.__submit()
+            await self.__wait(self.max_pending)
+
+    async def flush(self) -> None:
+        if self.buffer:
+            self.__submit()
+        await self.__wait(0)
+
+    def __submit(self) -> None:
+        # 数据块以列表形式交给 I/O 线程，由 pwritev 一次写入，事件循环中不复制数据
+        self.pending.append(
+            self.executor.submit(
+                self.__write_at,
+                self.buffer,
+                self.offset,
+            )
+        )
+        self.offset += self.buffered
+        self.buffer, self.buffered = [], 0
+
+    async def __wait(self, limit: int) -> None:
+        while len(self.pending) > limit:
+            self.written += await shield(wrap_future(self.pending[0]))
+            self.pending.popleft()
+
+    def __write_at(self, buffers: list[bytes], offset: int) -> int:
+        if self.failed:
+            raise OSError(f"{self.file} 先前的写入已失败")
+        total = 0
+        try:
+            if pwritev:
+                views = [memoryview(i) for i in buffers]
+                while views:
+                    size = pwritev(
+                        self.descriptor,
+                        views[:IOV_MAX],
+                        offset + total,
+                    )
+                    total += size
+                    while views and size >= len(views[0]):
+                        size -= len(views.pop(0))
+                    if size:
+                        views[0] = views[0][size:]
+            else:
+                data = b"".join(buffers)
+                lseek(self.descriptor, offset, SEEK_SET)
+                while total < len(data):
+                    total += write(self.descriptor, data[total:])
+        except OSError:
+            self.failed = True
+            raise
+        return total
+
+    async def __run(self, function, *args):
+        return await shield(wrap_future(self.executor.submit(function, *args)))
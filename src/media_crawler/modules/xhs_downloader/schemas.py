@@ -5,8 +5,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, field_validator
 
 
-class XHSDownloaderRequest(BaseModel):
-    url: str = Field(..., description="小红书作品链接，支持包含 xhslink 形式")
+class XHSDownloaderOptions(BaseModel):
     download: bool = Field(default=False, description="是否下载作品文件")
     index: Optional[List[int]] = Field(
         default=None,
@@ -18,13 +17,11 @@ class XHSDownloaderRequest(BaseModel):
         default=False,
         description="如果已经存在下载记录则跳过处理",
     )
-
-    @field_validator("url", mode="before")
-    @classmethod
-    def _trim_url(cls, value: Any) -> Any:
-        if isinstance(value, str):
-            return value.strip()
-        return value
+    bandwidth: Optional[int] = Field(
+        default=None,
+        ge=1024,
+        description="本次请求的下载带宽上限（字节/秒），与全局上限同时生效",
+    )
 
     @field_validator("index", mode="before")
     @classmethod
@@ -46,7 +43,39 @@ class XHSDownloaderRequest(BaseModel):
         return cleaned or None
 
 
+class XHSDownloaderRequest(XHSDownloaderOptions):
+    url: str = Field(..., description="小红书作品链接，支持包含 xhslink 形式")
+
+    @field_validator("url", mode="before")
+    @classmethod
+    def _trim_url(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            return value.strip()
+        return value
+
+
+class XHSDownloaderBatchRequest(XHSDownloaderOptions):
+    urls: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=10000,
+        description="小红书作品链接列表，每一项可包含多个链接",
+    )
+
+    @field_validator("urls", mode="before")
+    @classmethod
+    def _trim_urls(cls, value: Any) -> Any:
+        if isinstance(value, (list, tuple)):
+            return [i.strip() for i in value if isinstance(i, str) and i.strip()]
+        return value
+
+
 class XHSDownloaderDetail(BaseModel):
     url: str = Field(..., description="实际处理的作品链接")
     message: str
     data: Optional[Dict[str, Any]] = Field(default=None, description="作品详情数据")
+
+
+class XHSDownloaderQueued(BaseModel):
+    queued: List[str] = Field(default_factory=list, description="成功加入监听队列的链接")
+    message: str
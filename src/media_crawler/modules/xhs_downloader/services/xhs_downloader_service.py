@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 from media_crawler.config.settings import XHSDownloaderSettings
 from media_crawler.log.logHelper import get_logger
 
 from media_crawler.modules.xhs_downloader.core.application import XHS
 from media_crawler.modules.xhs_downloader.schemas import (
+    XHSDownloaderBatchRequest,
     XHSDownloaderDetail,
+    XHSDownloaderQueued,
     XHSDownloaderRequest,
 )
 
@@ -82,6 +84,38 @@ class XHSDownloaderService:
             "language": self._settings.language,
             "read_cookie": self._settings.read_cookie,
             "_print": self._settings.print_logs,
+            "fetch_workers": self._settings.fetch_workers,
+            "parse_workers": self._settings.parse_workers,
+            "download_workers": self._settings.download_workers,
+            "queue_size": self._settings.queue_size,
+            "monitor_workers": self._settings.monitor_workers,
+            "monitor_queue_size": self._settings.monitor_queue_size,
+            "batch_concurrency": self._settings.batch_concurrency,
+            "segmented_download": self._settings.segmented_download,
+            "segment_threshold": self._settings.segment_threshold,
+            "segment_count": self._settings.segment_count,
+            "max_concurrency": self._settings.max_concurrency,
+            "record_batch_size": self._settings.record_batch_size,
+            "record_flush_interval": self._settings.record_flush_interval,
+            "proxy_check_interval": self._settings.proxy_check_interval,
+            "request_rate": self._settings.request_rate,
+            "request_burst": self._settings.request_burst,
+            "link_cache_size": self._settings.link_cache_size,
+            "link_cache_ttl": self._settings.link_cache_ttl,
+            "link_cache_persist": self._settings.link_cache_persist,
+            "page_cache": self._settings.page_cache,
+            "page_cache_ttl": self._settings.page_cache_ttl,
+            "page_cache_size": self._settings.page_cache_size,
+            "media_dedup": self._settings.media_dedup,
+            "write_buffer_size": self._settings.write_buffer_size,
+            "io_threads": self._settings.io_threads,
+            "retry_backoff": self._settings.retry_backoff,
+            "retry_backoff_max": self._settings.retry_backoff_max,
+            "retry_budget_ratio": self._settings.retry_budget_ratio,
+            "download_journal": self._settings.download_journal,
+            "download_bandwidth": self._settings.download_bandwidth,
+            "verify_checksum": self._settings.verify_checksum,
+            "etag_checksum": self._settings.etag_checksum,
         }
 
     def _load_mapping_data(self) -> Dict[str, str]:
@@ -104,6 +138,17 @@ class XHSDownloaderService:
             logger.warning("XHS-Downloader 映射文件 %s 内容需为字典，实际为 %s", path, type(raw))
         return mapping
 
+    def statistics(self) -> Dict[str, Any]:
+        if not self._client:
+            return {}
+        return self._client.statistics()
+
+    async def sweep_directories(self) -> None:
+        if not self.enabled:
+            raise XHSDownloaderError("XHS-Downloader 模块未启用")
+        if not await self._require_client().sweep_directories():
+            raise XHSDownloaderError("存在进行中的下载任务，请稍后再清理空文件夹")
+
     def _require_client(self) -> XHS:
         if not self._client:
             raise XHSDownloaderError("XHS-Downloader 服务尚未初始化")
@@ -129,6 +174,49 @@ class XHSDownloaderService:
         message = "获取小红书作品数据成功" if data else "获取小红书作品数据失败"
         return XHSDownloaderDetail(url=target, message=message, data=data)
 
+    async def stream_details(
+        self, payload: XHSDownloaderBatchRequest
+    ) -> AsyncIterator[XHSDownloaderDetail]:
+        """并发处理多个链接，每个作品处理完成后立即返回结果"""
+        if not self.enabled:
+            raise XHSDownloaderError("XHS-Downloader 模块未启用")
+        client = self._require_client()
+        async for url, data in client.extract_stream(
+            payload.urls,
+            payload.download,
+            payload.index,
+            None,
+            None,
+            not payload.skip_downloaded,
+            payload.cookie,
+            payload.proxy,
+            payload.bandwidth,
+        ):
+            if data is None:
+                message = "提取小红书作品链接失败"
+            else:
+                message = "获取小红书作品数据成功" if data else "获取小红书作品数据失败"
+            yield XHSDownloaderDetail(url=url, message=message, data=data or None)
+
+    async def enqueue(self, payload: XHSDownloaderRequest) -> XHSDownloaderQueued:
+        """将链接推送至监听队列后立即返回，队列已满时等待空位"""
+        if not self.enabled:
+            raise XHSDownloaderError("XHS-Downloader 模块未启用")
+        client = self._require_client()
+        queued = await client.enqueue_links(
+            payload.url,
+            payload.download,
+            None,
+            None,
+            not payload.skip_downloaded,
+            payload.index,
+            payload.cookie,
+            payload.proxy,
+            payload.bandwidth,
+        )
+        message = f"已加入队列 {len(queued)} 个链接" if queued else "没有可加入队列的新链接"
+        return XHSDownloaderQueued(queued=queued, message=message)
+
     async def _invoke_core(
         self,
         url: str,
@@ -145,4 +233,5 @@ class XHSDownloaderService:
             not payload.skip_downloaded,
             payload.cookie,
             payload.proxy,
+            payload.bandwidth,
         )
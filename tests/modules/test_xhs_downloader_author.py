@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.application.app import XHS
+from media_crawler.modules.xhs_downloader.core.application.author import (
+    Author,
+    AuthorNote,
+)
+from media_crawler.modules.xhs_downloader.core.application.pipeline import (
+    ExtractTask,
+)
+from media_crawler.modules.xhs_downloader.core.module.recorder import AuthorRecorder
+
+USER = "5a0000000000000000000001"
+PROFILE = f"https://www.xiaohongshu.com/user/profile/{USER}?xsec_source=pc_note"
+
+
+def note_id(second: int) -> str:
+    return f"{second:08x}0000000000000000"
+
+
+def profile_html(ids: list[str], sticky: str = "", more=True) -> str:
+    state = {
+        "user": {
+            "notes": [
+                [
+                    {
+                        "id": i,
+                        "xsecToken": "token",
+                        "noteCard": {"interactInfo": {"sticky": i == sticky}},
+                    }
+                    for i in ids
+                ]
+            ],
+            "noteQueries": [{"cursor": ids[-1], "hasMore": more}],
+        }
+    }
+    return f"<script>window.__INITIAL_STATE__={json.dumps(state)}</script>"
+
+
+def posted_json(ids: list[str]) -> str:
+    return json.dumps(
+        {
+            "success": True,
+            "data": {
+                "notes": [{"note_id": i, "xsec_token": "token"} for i in ids],
+                "cursor": "",
+                "has_more": False,
+            },
+        }
+    )
+
+
+class FakeHtml:
+    def __init__(self, pages: list[str]):
+        self.pages = pages
+        self.requests = []
+
+    async def request_url(self, url: str, *args, **kwargs) -> str:
+        self.requests.append(url)
+        return self.pages.pop(0) if self.pages else ""
+
+
+def fake_manager(tmp_path):
+    return SimpleNamespace(
+        root=tmp_path,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_sync_pages_through_all_notes(tmp_path):
+    html = FakeHtml(
+        [
+            profile_html([note_id(9), note_id(8)]),
+            posted_json([note_id(7), note_id(6)]),
+        ]
+    )
+    async with AuthorRecorder(fake_manager(tmp_path)) as recorder:
+        author = Author(html, recorder)
+        id_, notes = await author.run(PROFILE)
+
+    assert id_ == USER
+    assert [i.id for i in notes] == [note_id(i) for i in (9, 8, 7, 6)]
+    assert "xsec_token=token" in notes[0].url
+    assert len(html.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_resync_stops_at_high_water_mark(tmp_path):
+    async with AuthorRecorder(fake_manager(tmp_path)) as recorder:
+        html = FakeHtml(
+            [
+                profile_html(
+                    [note_id(1), note_id(7), note_id(5), note_id(4)],
+                    sticky=note_id(1),
+                )
+            ]
+        )
+        author = Author(html, recorder)
+        await author.commit(USER, [AuthorNote(note_id(5))])
+        __, notes = await author.run(PROFILE)
+
+    assert [i.id for i in notes] == [note_id(7)]
+    assert len(html.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_commit_keeps_newest_mark(tmp_path):
+    async with AuthorRecorder(fake_manager(tmp_path)) as recorder:
+        author = Author(FakeHtml([]), recorder)
+        await author.commit(USER, [AuthorNote(note_id(3))])
+        await author.commit(USER, [AuthorNote(note_id(2))])
+
+        assert (await recorder.select(USER))[0] == note_id(3)
+
+
+@pytest.mark.asyncio
+async def test_mark_stops_before_first_failed_note(tmp_path):
+    async with AuthorRecorder(fake_manager(tmp_path)) as recorder:
+        xhs = SimpleNamespace(author=Author(FakeHtml([]), recorder))
+        notes = [AuthorNote(note_id(i)) for i in (9, 8, 7, 6)]
+        tasks = [ExtractTask("other", True, None, None, None, False)]
+        tasks += [ExtractTask(i.url, True, None, None, None, False) for i in notes]
+        for task, success in zip(tasks, (False, True, False, True, True)):
+            task.success = success
+
+        await XHS._XHS__commit_authors(xhs, [(USER, notes)], tasks)
+
+        assert (await recorder.select(USER))[0] == note_id(7)
+
+        tasks[2].success = True
+        await XHS._XHS__commit_authors(xhs, [(USER, notes)], tasks)
+
+        assert (await recorder.select(USER))[0] == note_id(9)
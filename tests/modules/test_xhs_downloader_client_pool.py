@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module import client_pool
+from media_crawler.modules.xhs_downloader.core.module.client_pool import (
+    ProxyClientPool,
+)
+
+PROXY = "http://127.0.0.1:{0}"
+
+
+@pytest.mark.asyncio
+async def test_same_proxy_reuses_client():
+    pool = ProxyClientPool(10)
+    async with pool.client(PROXY.format(1)) as first:
+        pass
+    async with pool.client(PROXY.format(1)) as second:
+        assert second is first
+    assert len(pool.clients) == 1
+    await pool.close()
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_client_is_closed_when_full():
+    pool = ProxyClientPool(10, max_clients=2)
+    clients = {}
+    for port in (1, 2, 1, 3):
+        async with pool.client(PROXY.format(port)) as client:
+            clients[port] = client
+
+    assert list(pool.clients) == [PROXY.format(1), PROXY.format(3)]
+    assert clients[2].is_closed
+    assert not clients[1].is_closed
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_client_in_use_is_closed_after_release():
+    pool = ProxyClientPool(10, max_clients=1)
+    async with pool.client(PROXY.format(1)) as busy:
+        async with pool.client(PROXY.format(2)):
+            assert not busy.is_closed
+    assert busy.is_closed
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_clients_are_closed_after_timeout(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(client_pool, "monotonic", lambda: now[0])
+    pool = ProxyClientPool(10, idle_timeout=60)
+    async with pool.client(PROXY.format(1)) as idle:
+        pass
+
+    now[0] += 30
+    async with pool.client(PROXY.format(2)):
+        pass
+    assert not idle.is_closed
+
+    now[0] += 31
+    async with pool.client(PROXY.format(2)):
+        pass
+    assert idle.is_closed
+    assert list(pool.clients) == [PROXY.format(2)]
+    await pool.close()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.concurrency import (
+    AdaptiveConcurrency,
+)
+
+HOST = "https://sns-video-bd.xhscdn.com/demo"
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_responses_are_healthy():
+    controller = AdaptiveConcurrency(initial=2, maximum=6)
+
+    async def job():
+        async with controller.slot(HOST) as slot:
+            await asyncio.sleep(0.001)
+            slot.response(200)
+
+    await asyncio.gather(*(job() for _ in range(100)))
+
+    assert controller.stats()["sns-video-bd.xhscdn.com"]["limit"] == 6
+
+
+@pytest.mark.asyncio
+async def test_limit_halves_on_throttling_and_caps_active_slots():
+    controller = AdaptiveConcurrency(initial=4, maximum=8)
+    peak = 0
+
+    async def job():
+        nonlocal peak
+        async with controller.slot(HOST) as slot:
+            peak = max(peak, controller.stats()["sns-video-bd.xhscdn.com"]["active"])
+            await asyncio.sleep(0.001)
+            slot.response(503)
+
+    await asyncio.gather(*(job() for _ in range(20)))
+    stats = controller.stats()["sns-video-bd.xhscdn.com"]
+
+    assert peak == 4
+    assert stats["limit"] == 2
+    assert stats["throttled"] == 20
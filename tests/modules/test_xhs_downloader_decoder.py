@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from media_crawler.modules.xhs_downloader.core.expansion import Converter, decode_state
+
+
+def test_decode_state_replaces_js_literals_outside_strings():
+    text = 'window.__INITIAL_STATE__={"a":undefined,"b":"undefined NaN","c":[NaN,-Infinity]}'
+
+    assert decode_state(text) == {"a": None, "b": "undefined NaN", "c": [None, None]}
+
+
+def test_decode_state_keeps_escaped_characters():
+    text = (
+        r'window.__INITIAL_STATE__={"url":"http://xhscdn.com","q":"say \"undefined\""}'
+    )
+
+    assert decode_state(text) == {"url": "http://xhscdn.com", "q": 'say "undefined"'}
+
+
+def test_decode_state_falls_back_to_yaml_for_non_json():
+    assert decode_state("window.__INITIAL_STATE__={note: {id: 1}}") == {
+        "note": {"id": 1}
+    }
+    assert decode_state("") is None
+
+
+def test_converter_extracts_note_from_html():
+    html = (
+        "<html><script>window.__INITIAL_STATE__="
+        '{"note":{"noteDetailMap":{"abc":{"note":{"noteId":"abc","video":undefined}}}}}'
+        "</script></html>"
+    )
+
+    assert Converter().run(html) == {"noteId": "abc", "video": None}
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from media_crawler.modules.xhs_downloader.core.module.directory_index import (
+    DirectoryIndex,
+)
+
+
+def test_lookups_use_a_single_scan(tmp_path):
+    tmp_path.joinpath("note_1.png").write_bytes(b"")
+    index = DirectoryIndex()
+
+    assert index.exists(tmp_path, "note_1.png")
+    assert not any(
+        index.exists(tmp_path, f"note_2.{s}") for s in ("jpeg", "png", "webp")
+    )
+    assert index.stats()["scans"] == 1
+
+
+def test_saved_files_are_visible_without_rescan(tmp_path):
+    index = DirectoryIndex()
+    assert not index.exists(tmp_path, "video.mp4")
+
+    tmp_path.joinpath("video.mp4").write_bytes(b"")
+    index.add(tmp_path, "video.mp4")
+
+    assert index.exists(tmp_path, "video.mp4")
+    assert index.stats()["scans"] == 1
+
+
+def test_expired_or_evicted_folders_are_rescanned(tmp_path):
+    first, second = tmp_path.joinpath("a"), tmp_path.joinpath("b")
+    first.mkdir()
+    second.mkdir()
+    index = DirectoryIndex(max_folders=1, ttl=0)
+
+    index.exists(first, "x")
+    first.joinpath("x").write_bytes(b"")
+    assert index.exists(first, "x")
+
+    index = DirectoryIndex(max_folders=1)
+    index.exists(first, "x")
+    index.exists(second, "x")
+    assert index.exists(first, "x")
+    assert index.stats() == {"folders": 1, "scans": 3, "lookups": 3}
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import errno
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.application.download import Download
+from media_crawler.modules.xhs_downloader.core.expansion import Cleaner
+from media_crawler.modules.xhs_downloader.core.module import (
+    JournalRecorder,
+    Manager,
+    MediaStore,
+    RetryPolicy,
+)
+from media_crawler.modules.xhs_downloader.core.module import manager as manager_module
+from media_crawler.modules.xhs_downloader.core.module.concurrency import (
+    AdaptiveConcurrency,
+)
+from media_crawler.modules.xhs_downloader.core.module.directory_index import (
+    DirectoryIndex,
+)
+from media_crawler.modules.xhs_downloader.core.module.rate_limit import (
+    BandwidthLimiter,
+)
+from media_crawler.modules.xhs_downloader.core.module.writer import WriterPool
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+
+
+def real_manager(tmp_path) -> Manager:
+    return Manager(
+        tmp_path,
+        str(tmp_path),
+        "Download",
+        "发布时间 作者昵称 作品标题",
+        1024,
+        "",
+        "",
+        None,
+        10,
+        0,
+        False,
+        "png",
+        True,
+        True,
+        False,
+        True,
+        False,
+        False,
+        False,
+        False,
+        Cleaner(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_temp_folder_is_inside_download_folder(tmp_path):
+    manager = real_manager(tmp_path)
+    try:
+        assert manager.temp == manager.folder.joinpath(".temp")
+        assert manager.temp.is_dir()
+        assert manager.temp.stat().st_dev == manager.folder.stat().st_dev
+    finally:
+        await manager.close()
+
+
+def test_move_falls_back_when_rename_crosses_filesystems(tmp_path, monkeypatch):
+    def cross_device(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(manager_module, "replace", cross_device)
+    temp = tmp_path.joinpath("a.png")
+    temp.write_bytes(PNG)
+    target = tmp_path.joinpath("Download")
+    target.mkdir()
+
+    Manager.move(temp, target.joinpath("a.png"))
+
+    assert target.joinpath("a.png").read_bytes() == PNG
+    assert not temp.exists()
+
+
+@pytest.mark.asyncio
+async def test_file_type_is_sniffed_from_first_chunks(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=PNG)
+
+    folder = tmp_path.joinpath("Download")
+    temp = folder.joinpath(".temp")
+    temp.mkdir(parents=True)
+    manager = SimpleNamespace(
+        root=tmp_path,
+        folder=folder,
+        temp=temp,
+        # 文件签名分多个数据块到达
+        chunk=3,
+        download_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        blank_headers={},
+        retry=0,
+        retry_policy=RetryPolicy(0.01),
+        folder_mode=False,
+        image_format="webp",
+        image_download=True,
+        video_download=True,
+        live_download=False,
+        author_archive=False,
+        write_mtime=False,
+        segmented_download=False,
+        segment_threshold=0,
+        segment_count=1,
+        download_concurrency=AdaptiveConcurrency(),
+        writer_pool=WriterPool(1),
+        write_buffer_size=64,
+        bandwidth=BandwidthLimiter(0),
+        verify_checksum=False,
+        etag_checksum=False,
+        media_dedup=False,
+        download_journal=False,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+        directory_index=DirectoryIndex(),
+        record_directory=lambda *paths: None,
+        move=Manager.move,
+        delete=Manager.delete,
+        archive=Manager.archive,
+        update_mtime=Manager.update_mtime,
+    )
+    written = []
+    writer = manager.writer_pool.writer
+
+    def record_writer(file, *args):
+        written.append(file)
+        return writer(file, *args)
+
+    manager.writer_pool.writer = record_writer
+    downloader = Download(manager, MediaStore(manager, None), JournalRecorder(manager))
+    try:
+        assert await downloader._Download__download(
+            "https://sns-img-bd.xhscdn.com/demo",
+            folder,
+            "image",
+            "webp",
+            0,
+            None,
+            None,
+        )
+    finally:
+        await manager.download_client.aclose()
+        manager.writer_pool.shutdown()
+
+    assert written == [temp.joinpath("image.webp")]
+    assert folder.joinpath("image.png").read_bytes() == PNG
+    assert not folder.joinpath("image.webp").exists()
+    assert not any(temp.iterdir())
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.application.app import XHS
+from media_crawler.modules.xhs_downloader.core.module.rate_limit import (
+    BandwidthLimiter,
+)
+
+
+class FakeXHS:
+    """只提供 extract_stream 依赖的属性，作品处理耗时由链接指定"""
+
+    def __init__(self, concurrency: int):
+        self.batch_limit = asyncio.Semaphore(concurrency)
+        self.manager = SimpleNamespace(bandwidth=BandwidthLimiter(0))
+        self.running = 0
+        self.peak = 0
+        self.started = []
+        self.cancelled = []
+
+    async def extract_links(self, text: str, log) -> list[str]:
+        return [] if text == "invalid" else [text]
+
+    async def _XHS__run_task(self, task) -> dict:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.started.append(task.url)
+        try:
+            await asyncio.sleep(float(task.url))
+        except asyncio.CancelledError:
+            self.cancelled.append(task.url)
+            raise
+        finally:
+            self.running -= 1
+        if task.url == "0.03":
+            raise RuntimeError("parse failed")
+        return {"作品ID": task.url}
+
+    def extract_stream(self, urls: list[str]):
+        return XHS.extract_stream(self, urls)
+
+
+@pytest.mark.asyncio
+async def test_results_are_yielded_in_completion_order_with_bounded_concurrency():
+    xhs = FakeXHS(2)
+
+    urls = ["0.1", "0.01", "invalid", "0.03", "0.02"]
+
+    results = [i async for i in xhs.extract_stream(urls)]
+
+    assert results == [
+        ("0.01", {"作品ID": "0.01"}),
+        ("invalid", None),
+        ("0.03", {}),
+        ("0.02", {"作品ID": "0.02"}),
+        ("0.1", {"作品ID": "0.1"}),
+    ]
+    assert xhs.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_pending_links_are_cancelled_when_client_disconnects():
+    xhs = FakeXHS(2)
+    stream = xhs.extract_stream(["0.01", "5", "5"])
+
+    assert await stream.__anext__() == ("0.01", {"作品ID": "0.01"})
+    await stream.aclose()
+
+    assert xhs.cancelled == ["5"]
+    assert xhs.started == ["0.01", "5"]
+    assert xhs.running == 0
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.application.app import XHS
+from media_crawler.modules.xhs_downloader.core.expansion import (
+    remove_candidate_directories,
+    remove_empty_directories,
+)
+
+
+def test_only_candidates_and_their_empty_parents_are_removed(tmp_path):
+    root = tmp_path.joinpath("Download")
+    created = root.joinpath("author", "work")
+    created.mkdir(parents=True)
+    untouched = root.joinpath("old", "empty")
+    untouched.mkdir(parents=True)
+    kept = root.joinpath("kept", "work")
+    kept.mkdir(parents=True)
+    kept.joinpath("a.png").write_bytes(b"")
+
+    remove_candidate_directories(
+        [created, kept, root.joinpath("renamed")],
+        [root],
+    )
+
+    assert not root.joinpath("author").exists()
+    assert untouched.is_dir()
+    assert kept.is_dir()
+    assert root.is_dir()
+
+
+def test_directories_outside_boundaries_are_ignored(tmp_path):
+    outside = tmp_path.joinpath("outside")
+    outside.mkdir()
+
+    remove_candidate_directories([outside], [tmp_path.joinpath("Download")])
+
+    assert outside.is_dir()
+
+
+def test_sweep_keeps_protected_directories(tmp_path):
+    root = tmp_path.joinpath("Download")
+    temp = root.joinpath(".temp")
+    shard = root.joinpath(".media_store", "ab")
+    created = root.joinpath("author", "work")
+    old = root.joinpath("old", "empty")
+    for path in (temp, shard, created, old):
+        path.mkdir(parents=True)
+
+    remove_empty_directories(root, (temp, root.joinpath(".media_store"), created))
+
+    assert temp.is_dir()
+    assert shard.is_dir()
+    assert created.is_dir()
+    assert not old.exists()
+
+
+@pytest.mark.asyncio
+async def test_sweep_is_skipped_while_downloads_are_running():
+    swept = []
+    xhs = SimpleNamespace(
+        download=SimpleNamespace(running=1, sweeping=asyncio.Lock()),
+        manager=SimpleNamespace(sweep_directories=lambda: swept.append(True)),
+    )
+
+    assert not await XHS.sweep_directories(xhs)
+    xhs.download.running = 0
+    assert await XHS.sweep_directories(xhs)
+    assert swept == [True]
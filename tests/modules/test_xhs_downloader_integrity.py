@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+
+import httpx
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.expansion import IntegrityError
+from media_crawler.modules.xhs_downloader.core.module.integrity import StreamVerifier
+
+DATA = b"0123456789" * 100
+
+
+def response(status: int = 200, **headers) -> httpx.Response:
+    return httpx.Response(
+        status,
+        headers={k.replace("_", "-"): v for k, v in headers.items()},
+    )
+
+
+def test_truncated_body_is_resumable():
+    verifier = StreamVerifier("a.mp4", response(Content_Length=str(len(DATA))))
+
+    with pytest.raises(IntegrityError) as error:
+        verifier.verify(len(DATA) - 1)
+
+    assert error.value.truncated
+    verifier.verify(len(DATA))
+
+
+def test_content_range_total_and_start_are_checked():
+    verifier = StreamVerifier(
+        "a.mp4",
+        response(206, Content_Range=f"bytes 100-{len(DATA) - 1}/{len(DATA)}"),
+        100,
+    )
+    verifier.verify(len(DATA) - 100)
+
+    with pytest.raises(IntegrityError) as error:
+        verifier.verify(len(DATA))
+    assert not error.value.truncated
+
+    with pytest.raises(IntegrityError):
+        StreamVerifier("a.mp4", response(206, Content_Range="bytes 0-9/1000"), 100)
+
+
+def test_rolling_checksum_matches_content_md5():
+    digest = base64.b64encode(hashlib.md5(DATA).digest()).decode()
+    verifier = StreamVerifier(
+        "a.png",
+        response(Content_MD5=digest),
+        checksum=True,
+    )
+    for i in range(0, len(DATA), 64):
+        verifier.update(DATA[i : i + 64])
+    verifier.verify(len(DATA))
+
+    corrupted = StreamVerifier(
+        "a.png",
+        response(ETag=f'"{hashlib.md5(DATA).hexdigest()}"'),
+        checksum=True,
+        etag=True,
+    )
+    corrupted.update(DATA[:-1] + b"x")
+    with pytest.raises(IntegrityError):
+        corrupted.verify(len(DATA))
+
+
+def test_etag_is_ignored_unless_enabled():
+    verifier = StreamVerifier(
+        "a.png",
+        response(ETag='"0123456789abcdef0123456789abcdef"'),
+        checksum=True,
+    )
+    verifier.update(DATA)
+    verifier.verify(len(DATA))
+
+    assert verifier.digest is None
+
+
+def test_compressed_or_unsized_responses_are_not_checked():
+    StreamVerifier(
+        "a.png", response(Content_Length="10", Content_Encoding="gzip")
+    ).verify(len(DATA))
+    StreamVerifier("a.png", response()).verify(len(DATA))
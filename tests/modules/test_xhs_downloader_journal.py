@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.recorder import JournalRecorder
+
+URL = "https://sns-video-bd.xhscdn.com/demo"
+
+
+def fake_manager(tmp_path):
+    return SimpleNamespace(
+        root=tmp_path,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+        download_journal=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_unfinished_tasks_survive_restart(tmp_path):
+    folder = tmp_path.joinpath("Download")
+    async with JournalRecorder(fake_manager(tmp_path)) as journal:
+        for name in ("a_1", "a_2", "a_3"):
+            await journal.add("note", name, URL, folder, "png", 1700000000)
+        await journal.update(journal.key(folder, "a_1", "png"), journal.RUNNING)
+        await journal.update(journal.key(folder, "a_2", "png"), journal.COMPLETED, 1024)
+        await journal.update(journal.key(folder, "a_3", "png"), journal.FAILED, 10)
+
+    async with JournalRecorder(fake_manager(tmp_path)) as journal:
+        rows = await journal.unfinished()
+        assert await journal.select(journal.key(folder, "a_2", "png")) == (
+            journal.COMPLETED,
+            1024,
+        )
+
+    assert [(i["NOTE"], i["NAME"], i["URL"], i["MTIME"]) for i in rows] == [
+        ("note", "a_1", URL, 1700000000)
+    ]
+    assert rows[0]["PATH"] == str(folder)
+
+
+@pytest.mark.asyncio
+async def test_running_task_is_not_queued_twice(tmp_path):
+    folder = tmp_path.joinpath("Download")
+    async with JournalRecorder(fake_manager(tmp_path)) as journal:
+        key = journal.key(folder, "v", "mp4")
+        await journal.add("note", "v", URL, folder, "mp4")
+        await journal.update(key, journal.RUNNING)
+        await journal.add("note", "v", URL, folder, "mp4")
+
+        assert journal.running(key)
+
+
+@pytest.mark.asyncio
+async def test_note_is_completed_only_when_every_file_completed(tmp_path):
+    folder = tmp_path.joinpath("Download")
+    async with JournalRecorder(fake_manager(tmp_path)) as journal:
+        for name in ("a_1", "a_2"):
+            await journal.add("note", name, URL, folder, "png")
+        await journal.update(journal.key(folder, "a_1", "png"), journal.COMPLETED, 1024)
+        await journal.update(journal.key(folder, "a_2", "png"), journal.FAILED, 10)
+
+        assert not await journal.completed("note")
+        assert not await journal.completed("unknown")
+
+        await journal.add("note", "a_2", URL, folder, "png")
+        await journal.update(journal.key(folder, "a_2", "png"), journal.COMPLETED, 2048)
+        assert await journal.completed("note")
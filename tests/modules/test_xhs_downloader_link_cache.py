@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.link_cache import LinkCache
+from media_crawler.modules.xhs_downloader.core.module.recorder import LinkRecorder
+
+SHORT = "http://xhslink.com/a/demo"
+TARGET = "https://www.xiaohongshu.com/explore/demo"
+
+
+def fake_manager(tmp_path, persist=True):
+    return SimpleNamespace(
+        root=tmp_path,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+        link_cache_persist=persist,
+        link_cache_ttl=3600,
+    )
+
+
+def counting_resolver(calls: list):
+    async def resolve(url: str) -> str:
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return TARGET
+
+    return resolve
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_request(tmp_path):
+    calls = []
+    async with LinkRecorder(fake_manager(tmp_path, False)) as recorder:
+        cache = LinkCache(recorder)
+        results = await asyncio.gather(
+            *(cache.resolve(SHORT, counting_resolver(calls)) for _ in range(5))
+        )
+        again = await cache.resolve("xhslink.com/a/demo", counting_resolver(calls))
+
+    assert results == [TARGET] * 5 and again == TARGET
+    assert len(calls) == 1
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "shared": 4}
+
+
+@pytest.mark.asyncio
+async def test_failed_resolution_is_not_cached(tmp_path):
+    calls = []
+
+    async def failing(url: str) -> str:
+        calls.append(url)
+        return ""
+
+    async with LinkRecorder(fake_manager(tmp_path, False)) as recorder:
+        cache = LinkCache(recorder)
+        assert await cache.resolve(SHORT, failing) == ""
+        assert await cache.resolve(SHORT, failing) == ""
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_persisted_links_survive_restart(tmp_path):
+    calls = []
+    async with LinkRecorder(fake_manager(tmp_path)) as recorder:
+        await LinkCache(recorder).resolve(SHORT, counting_resolver(calls))
+    async with LinkRecorder(fake_manager(tmp_path)) as recorder:
+        cache = LinkCache(recorder)
+        assert await cache.resolve(SHORT, counting_resolver(calls)) == TARGET
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_oldest_entry(tmp_path):
+    calls = []
+    async with LinkRecorder(fake_manager(tmp_path, False)) as recorder:
+        cache = LinkCache(recorder, max_size=2)
+        for name in ("a", "b", "c"):
+            await cache.resolve(f"xhslink.com/{name}", counting_resolver(calls))
+
+    assert list(cache.entries) == ["xhslink.com/b", "xhslink.com/c"]
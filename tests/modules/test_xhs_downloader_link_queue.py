@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.application.link_queue import (
+    LinkQueue,
+)
+from media_crawler.modules.xhs_downloader.core.application.pipeline import (
+    ExtractTask,
+)
+
+
+def task(url: str) -> ExtractTask:
+    return ExtractTask(url, False, None, None, None, True)
+
+
+@pytest.mark.asyncio
+async def test_links_are_processed_concurrently():
+    running = 0
+    peak = 0
+
+    async def handler(task: ExtractTask) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    queue = LinkQueue(handler, workers=4, size=16)
+    for i in range(12):
+        await queue.put(task(f"https://www.xiaohongshu.com/explore/{i}"))
+    await queue.join()
+    await queue.close()
+
+    assert peak == 4
+    assert queue.stats()["processed"] == 12
+
+
+@pytest.mark.asyncio
+async def test_queued_and_running_links_are_deduplicated():
+    release = asyncio.Event()
+    handled = []
+
+    async def handler(task: ExtractTask) -> None:
+        handled.append(task.url)
+        await release.wait()
+
+    queue = LinkQueue(handler, workers=1, size=4)
+    assert await queue.put(task("a"))
+    assert await queue.put(task("b"))
+    await asyncio.sleep(0)
+    assert not await queue.put(task("a"))
+    assert not await queue.put(task("b"))
+    assert queue.stats()["in_flight"] == 1
+    assert queue.stats()["queued"] == 1
+
+    release.set()
+    await queue.join()
+    assert await queue.put(task("a"))
+    await queue.join()
+    await queue.close()
+
+    assert handled == ["a", "b", "a"]
+    assert queue.stats()["duplicated"] == 2
+
+
+@pytest.mark.asyncio
+async def test_producer_blocks_when_queue_is_full():
+    release = asyncio.Event()
+
+    async def handler(task: ExtractTask) -> None:
+        await release.wait()
+
+    queue = LinkQueue(handler, workers=1, size=1)
+    await queue.put(task("a"))
+    await asyncio.sleep(0)
+    await queue.put(task("b"))
+    blocked = asyncio.create_task(queue.put(task("c")))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    assert await blocked
+    await queue.join()
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_put_does_not_block_later_submissions():
+    release = asyncio.Event()
+
+    async def handler(task: ExtractTask) -> None:
+        await release.wait()
+
+    queue = LinkQueue(handler, workers=1, size=1)
+    await queue.put(task("a"))
+    await queue.put(task("b"))
+    waiting = asyncio.create_task(queue.put(task("c")))
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    release.set()
+    assert await queue.put(task("c"))
+    await queue.join()
+    await queue.close()
+
+    assert queue.stats()["duplicated"] == 0
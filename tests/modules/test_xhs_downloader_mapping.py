@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.directory_index import (
+    DirectoryIndex,
+)
+from media_crawler.modules.xhs_downloader.core.module.mapping import Mapping
+from media_crawler.modules.xhs_downloader.core.module.recorder import MapRecorder
+
+AUTHOR = "5a0000000000000000000001"
+
+
+def fake_manager(tmp_path, folder_mode=False):
+    folder = tmp_path.joinpath("Download")
+    folder.mkdir(exist_ok=True)
+    return SimpleNamespace(
+        root=tmp_path,
+        folder=folder,
+        folder_mode=folder_mode,
+        author_archive=True,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+        directory_index=DirectoryIndex(),
+        record_directory=lambda *paths: None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_alias_change_renames_folders_and_files(tmp_path):
+    manager = fake_manager(tmp_path, folder_mode=True)
+    works = manager.folder.joinpath(f"{AUTHOR}_old", "2024 old title")
+    works.mkdir(parents=True)
+    for i in range(1, 4):
+        works.joinpath(f"2024 old title_{i}.png").write_bytes(b"")
+
+    async with MapRecorder(manager) as recorder:
+        mapping = Mapping(manager, recorder)
+        await mapping.update_cache(AUTHOR, "old")
+        await mapping.update_cache(AUTHOR, "new")
+        assert await mapping.has_mapping(AUTHOR) == "new"
+
+    folder = manager.folder.joinpath(f"{AUTHOR}_new", "2024 new title")
+    assert sorted(i.name for i in folder.iterdir()) == [
+        f"2024 new title_{i}.png" for i in range(1, 4)
+    ]
+    assert not manager.folder.joinpath(f"{AUTHOR}_old").exists()
+    assert not any(tmp_path.joinpath("RenameJournal").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_interrupted_batch_is_resumed(tmp_path):
+    manager = fake_manager(tmp_path)
+    old = manager.folder.joinpath(f"{AUTHOR}_old")
+    old.mkdir()
+    # 第一个文件已在中断前重命名
+    old.joinpath("new_1.png").write_bytes(b"")
+    old.joinpath("old_2.png").write_bytes(b"")
+    journal = tmp_path.joinpath("RenameJournal")
+    journal.mkdir()
+    journal.joinpath(f"{AUTHOR}.json").write_text(
+        json.dumps(
+            {
+                "id": AUTHOR,
+                "alias": "new",
+                "old_alias": "old",
+                "steps": [
+                    [f"{AUTHOR}_old/old_1.png", f"{AUTHOR}_old/new_1.png", "file"],
+                    [f"{AUTHOR}_old/old_2.png", f"{AUTHOR}_old/new_2.png", "file"],
+                    [f"{AUTHOR}_old", f"{AUTHOR}_new", "folder"],
+                ],
+            }
+        )
+    )
+
+    async with MapRecorder(manager) as recorder:
+        await Mapping(manager, recorder).resume()
+
+    new = manager.folder.joinpath(f"{AUTHOR}_new")
+    assert sorted(i.name for i in new.iterdir()) == ["new_1.png", "new_2.png"]
+    assert not journal.joinpath(f"{AUTHOR}.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_downloads_wait_for_rename(tmp_path):
+    manager = fake_manager(tmp_path)
+    manager.folder.joinpath(f"{AUTHOR}_old").mkdir()
+    events = []
+
+    async with MapRecorder(manager) as recorder:
+        mapping = Mapping(manager, recorder)
+        await mapping.update_cache(AUTHOR, "old")
+
+        async def download(delay: float):
+            await asyncio.sleep(delay)
+            async with mapping.downloading(AUTHOR):
+                events.append("download start")
+                await asyncio.sleep(0.05)
+                events.append("download end")
+
+        async def rename():
+            await asyncio.sleep(0.01)
+            await mapping.update_cache(AUTHOR, "new")
+            events.append("renamed")
+
+        await asyncio.gather(download(0), rename(), download(0.02))
+
+    assert events == [
+        "download start",
+        "download end",
+        "renamed",
+        "download start",
+        "download end",
+    ]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from hashlib import sha256
+from types import SimpleNamespace
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.media_store import MediaStore
+from media_crawler.modules.xhs_downloader.core.module.recorder import MediaRecorder
+
+CONTENT = b"\x00\x00\x00\x18ftypmp42" + b"media" * 1000
+
+
+def fake_manager(tmp_path):
+    folder = tmp_path.joinpath("Download")
+    folder.mkdir()
+    return SimpleNamespace(
+        root=tmp_path,
+        folder=folder,
+        download_record=True,
+        media_dedup=True,
+        write_mtime=False,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_stored_once(tmp_path):
+    manager = fake_manager(tmp_path)
+    async with MediaRecorder(manager) as recorder:
+        store = MediaStore(manager, recorder)
+        for author in ("old-name", "new-name"):
+            temp = tmp_path.joinpath(f"{author}.tmp")
+            temp.write_bytes(CONTENT)
+            target = manager.folder.joinpath(author, "note.mp4")
+            target.parent.mkdir()
+            await store.commit(temp, target)
+            assert not temp.exists()
+
+        digest = sha256(CONTENT).hexdigest()
+        assert await recorder.select("new-name/note.mp4") == (digest, len(CONTENT))
+
+    blobs = [i for i in store.root.rglob("*") if i.is_file()]
+    assert len(blobs) == 1
+    assert manager.folder.joinpath("old-name", "note.mp4").read_bytes() == CONTENT
+    assert manager.folder.joinpath("new-name", "note.mp4").read_bytes() == CONTENT
+    assert store.stats() == {
+        "stored": 1,
+        "deduplicated": 1,
+        "saved_bytes": len(CONTENT),
+    }
+
+
+@pytest.mark.asyncio
+async def test_streamed_digest_is_used_when_given(tmp_path):
+    manager = fake_manager(tmp_path)
+    async with MediaRecorder(manager) as recorder:
+        store = MediaStore(manager, recorder)
+        hasher = store.hasher()
+        hasher.update(CONTENT)
+        temp = tmp_path.joinpath("note.tmp")
+        temp.write_bytes(CONTENT)
+        await store.commit(
+            temp, manager.folder.joinpath("note.mp4"), hasher.hexdigest()
+        )
+
+    assert store.blob(sha256(CONTENT).hexdigest()).read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_files_are_not_hardlinked_when_mtime_is_written(tmp_path):
+    manager = fake_manager(tmp_path)
+    manager.write_mtime = True
+    async with MediaRecorder(manager) as recorder:
+        store = MediaStore(manager, recorder)
+        temp = tmp_path.joinpath("note.tmp")
+        temp.write_bytes(CONTENT)
+        target = manager.folder.joinpath("note.mp4")
+        await store.commit(temp, target)
+
+    blob = store.blob(sha256(CONTENT).hexdigest())
+    assert target.read_bytes() == CONTENT
+    assert target.stat().st_ino != blob.stat().st_ino
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from copy import deepcopy
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.expansion import Namespace
+
+NOTE = {
+    "noteId": "demo",
+    "title": "",
+    "interactInfo": {"likedCount": "10", "collectedCount": 0},
+    "tagList": [{"name": "a"}, {"name": "b"}],
+    "imageList": [],
+    "video": {"media": {"stream": {"h264": [{"masterUrl": "https://v/1"}]}}},
+}
+
+
+def previous_extract(data_object, attribute_chain: str, default=""):
+    """优化前的实现，每次读取前复制完整数据"""
+    data = deepcopy(data_object)
+    for attribute in attribute_chain.split("."):
+        if "[" in attribute:
+            attribute, index = attribute.split("[", 1)
+            try:
+                data = getattr(data, attribute, None)[int(index[:-1])]
+            except (IndexError, TypeError, ValueError):
+                return default
+        else:
+            data = getattr(data, attribute, None)
+            if not data:
+                return default
+    return data or default
+
+
+@pytest.mark.parametrize(
+    "chain",
+    [
+        "noteId",
+        "title",
+        "interactInfo.likedCount",
+        "interactInfo.collectedCount",
+        "tagList",
+        "tagList[1].name",
+        "tagList[5].name",
+        "tagList[x].name",
+        "imageList[0]",
+        "video.media.stream.h264[0].masterUrl",
+        "video.media.stream.h265[0].masterUrl",
+        "missing.key",
+    ],
+)
+def test_lookup_matches_previous_behaviour(chain):
+    namespace = Namespace(NOTE)
+
+    for default in ("", None, []):
+        assert namespace.safe_extract(chain, default) == previous_extract(
+            namespace.data, chain, default
+        )
+        assert Namespace.object_extract(
+            namespace.data, chain, default
+        ) == previous_extract(namespace.data, chain, default)
+
+
+def test_changing_returned_value_keeps_source_data():
+    namespace = Namespace(NOTE)
+
+    tags = namespace.safe_extract("tagList")
+    tags.append("new")
+    tags[0].name = "changed"
+    namespace.safe_extract("video.media").stream = None
+
+    assert namespace.safe_extract("tagList[0].name") == "a"
+    assert len(namespace.safe_extract("tagList")) == 2
+    assert (
+        namespace.safe_extract("video.media.stream.h264[0].masterUrl") == "https://v/1"
+    )
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.page_cache import PageCache
+
+HTML = "<html>" + "window.__INITIAL_STATE__={}" * 200 + "</html>"
+
+
+@pytest.mark.asyncio
+async def test_pages_are_compressed_and_survive_restart(tmp_path):
+    cache = PageCache(tmp_path, True)
+    await cache.put("note-1", HTML)
+
+    assert cache.stats()["bytes"] < len(HTML)
+    assert await cache.get("note-1") == HTML
+    assert await PageCache(tmp_path, True).get("note-1") == HTML
+
+
+@pytest.mark.asyncio
+async def test_expired_pages_are_missed(tmp_path):
+    cache = PageCache(tmp_path, True, ttl=0)
+    await cache.put("note-1", HTML)
+
+    assert await cache.get("note-1") == ""
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = PageCache(tmp_path, True)
+    await cache.put("note-1", HTML)
+    cache.max_size = cache.size * 2 + 16
+    await cache.put("note-2", HTML + "2")
+    await cache.get("note-1")
+    await cache.put("note-3", HTML + "3")
+
+    assert await cache.get("note-1") == HTML
+    assert await cache.get("note-2") == ""
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_does_nothing(tmp_path):
+    cache = PageCache(tmp_path.joinpath("PageCache"))
+    await cache.put("note-1", HTML)
+
+    assert await cache.get("note-1") == ""
+    assert not tmp_path.joinpath("PageCache").exists()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.application.pipeline import (
+    ExtractTask,
+    Pipeline,
+)
+
+
+def tasks(count: int) -> list[ExtractTask]:
+    return [ExtractTask(str(i), False, None, None, None, True) for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_results_keep_input_order_with_several_workers():
+    async def fetch(task: ExtractTask) -> None:
+        await asyncio.sleep(random.random() / 100)
+        task.html = task.url
+
+    async def parse(task: ExtractTask) -> None:
+        await asyncio.sleep(random.random() / 100)
+        if task.url == "3":
+            task.finish({"cached": task.url})
+
+    async def download(task: ExtractTask) -> None:
+        await asyncio.sleep(random.random() / 100)
+        task.finish({"id": task.html})
+
+    pipeline = Pipeline(((fetch, 3), (parse, 2), (download, 2)), queue_size=2)
+
+    results = await pipeline.run(tasks(20))
+
+    assert results[3] == {"cached": "3"}
+    assert [i.get("id") for i in results[4:]] == [str(i) for i in range(4, 20)]
+
+
+@pytest.mark.asyncio
+async def test_bounded_queues_apply_backpressure():
+    release = asyncio.Event()
+    fetched = []
+
+    async def fetch(task: ExtractTask) -> None:
+        fetched.append(task.url)
+
+    async def download(task: ExtractTask) -> None:
+        await release.wait()
+        task.finish({"id": task.url})
+
+    pipeline = Pipeline(((fetch, 1), (download, 1)), queue_size=1)
+    run = asyncio.create_task(pipeline.run(tasks(10)))
+    await asyncio.sleep(0.05)
+
+    # 下载阶段处理 1 个，队列中 1 个，请求阶段持有 1 个等待入队
+    assert len(fetched) == 3
+
+    release.set()
+    results = await run
+    assert [i["id"] for i in results] == [str(i) for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_stage_error_returns_empty_result_without_stalling():
+    async def fetch(task: ExtractTask) -> None:
+        if task.url in {"1", "4"}:
+            raise RuntimeError("fetch failed")
+
+    async def download(task: ExtractTask) -> None:
+        task.finish({"id": task.url})
+
+    pipeline = Pipeline(((fetch, 2), (download, 2)), queue_size=1)
+
+    results = await asyncio.wait_for(pipeline.run(tasks(6)), 1)
+
+    assert results == [
+        {"id": "0"},
+        {},
+        {"id": "2"},
+        {"id": "3"},
+        {},
+        {"id": "5"},
+    ]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module import Manager
+from media_crawler.modules.xhs_downloader.core.module.proxy_pool import ProxyPool
+
+FAST = "http://127.0.0.1:8001"
+SLOW = "http://127.0.0.1:8002"
+
+
+def test_select_prefers_lowest_latency_proxy():
+    pool = ProxyPool([SLOW, FAST])
+    pool.succeed(SLOW, 0.8)
+    pool.succeed(FAST, 0.1)
+
+    assert pool.select() == FAST
+
+
+def test_failing_proxy_is_skipped_until_retry():
+    pool = ProxyPool([FAST, SLOW], max_failures=2, retry_interval=30)
+    pool.succeed(FAST, 0.1)
+    pool.succeed(SLOW, 0.8)
+    pool.fail(FAST)
+
+    assert pool.select() == FAST
+
+    pool.fail(FAST)
+    stats = pool.stats()[FAST]
+
+    assert pool.select() == SLOW
+    assert not stats["healthy"] and stats["retry_in"] > 0
+
+    pool.states[FAST].retry_at = 0
+    pool.succeed(FAST, 0.1)
+
+    assert pool.stats()[FAST]["healthy"]
+
+
+def test_select_falls_back_to_direct_connection():
+    pool = ProxyPool([FAST], max_failures=1)
+    pool.fail(FAST)
+
+    assert pool.select() is None
+    assert not ProxyPool([])
+
+
+@pytest.mark.asyncio
+async def test_check_marks_unusable_proxy_failed():
+    invalid = "ftp://127.0.0.1:8003"
+    pool = ProxyPool([invalid, FAST])
+    pool.succeed(FAST, 0.1)
+
+    await pool.check(pool.states[invalid])
+
+    assert not pool.states[invalid].healthy
+    assert pool.select() == FAST
+
+
+def test_invalid_proxy_urls_are_dropped():
+    assert Manager._Manager__check_proxy([FAST, "ftp://127.0.0.1", "", SLOW]) == [
+        FAST,
+        SLOW,
+    ]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.rate_limit import (
+    BandwidthLimiter,
+    RateLimiter,
+)
+
+URL = "https://www.xiaohongshu.com/explore/demo"
+
+
+@pytest.mark.asyncio
+async def test_burst_passes_without_waiting():
+    limiter = RateLimiter(rate=1, burst=3)
+
+    waits = [await limiter.acquire(URL) for _ in range(3)]
+
+    assert waits == [0, 0, 0]
+    assert limiter.stats()["www.xiaohongshu.com"]["delayed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_the_rate():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = monotonic()
+
+    await asyncio.gather(*(limiter.acquire(URL) for _ in range(6)))
+    stats = limiter.stats()["www.xiaohongshu.com"]
+
+    assert monotonic() - start >= 0.09
+    assert stats["requests"] == 6
+    assert stats["delayed"] == 5
+    assert stats["wait_max_ms"] >= 90
+
+
+@pytest.mark.asyncio
+async def test_domains_are_limited_independently():
+    limiter = RateLimiter(rate=0.1, burst=1)
+
+    assert await limiter.acquire(URL) == 0
+    assert await limiter.acquire("https://xhslink.com/abc") == 0
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_is_shaped_by_global_and_job_caps():
+    limiter = BandwidthLimiter(rate=100_000)
+    job = limiter.job(50_000)
+    start = monotonic()
+
+    for _ in range(4):
+        await limiter.consume(25_000, job)
+    elapsed = monotonic() - start
+    stats = limiter.stats()
+
+    # 任务令牌桶初始容量为 50KB，其余 50KB 以 50KB/s 发放
+    assert 0.9 <= elapsed < 1.5
+    assert stats["bytes"] == 100_000
+    assert stats["delayed"] == 2
+    assert stats["throughput_bps"] > 0
+
+
+@pytest.mark.asyncio
+async def test_unlimited_bandwidth_only_counts_bytes():
+    limiter = BandwidthLimiter()
+
+    assert limiter.job(None) is None
+    assert await limiter.consume(1 << 20) == 0
+    assert limiter.stats()["bytes"] == 1 << 20
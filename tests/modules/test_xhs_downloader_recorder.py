@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.recorder import (
+    AuthorRecorder,
+    IDIndex,
+    IDRecorder,
+    JournalRecorder,
+    LinkRecorder,
+    MediaRecorder,
+)
+
+
+def test_id_index_tracks_loaded_added_and_removed_ids():
+    index = IDIndex()
+    index.update(["a", "b", "c"])
+    index.compact()
+    index.add("d")
+    index.discard("b")
+
+    assert "a" in index and "d" in index
+    assert "b" not in index and "x" not in index
+    assert len(index) == 3
+
+
+def test_id_index_merges_loaded_batches_into_one_array():
+    index = IDIndex()
+    index.update(["c", "a"])
+    index.update(["b", "a"])
+    index.add("d")
+
+    assert "b" in index and "d" in index
+
+    index.compact()
+
+    assert not index.batches and not index.added
+    assert list(index.loaded) == sorted({index.fingerprint(i) for i in "abcd"})
+    assert all(i in index for i in "abcd")
+
+
+@pytest.mark.asyncio
+async def test_id_recorder_answers_from_index(tmp_path):
+    manager = SimpleNamespace(
+        root=tmp_path,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+    )
+    async with IDRecorder(manager) as recorder:
+        await recorder.add("note-1")
+    async with IDRecorder(manager) as recorder:
+        assert await recorder.select("note-1") == ("note-1",)
+        assert await recorder.select("note-2") is None
+        await recorder.delete(["note-1"])
+        assert await recorder.select("note-1") is None
+
+
+@pytest.mark.asyncio
+async def test_buffered_writes_are_drained_on_exit(tmp_path):
+    manager = SimpleNamespace(
+        root=tmp_path,
+        download_record=True,
+        record_batch_size=1000,
+        record_flush_interval=60,
+    )
+    async with IDRecorder(manager) as recorder:
+        for i in range(10):
+            await recorder.add(f"note-{i}")
+        assert len(recorder.pending) == 10
+    async with IDRecorder(manager) as recorder:
+        assert len(recorder.index) == 10
+
+
+@pytest.mark.asyncio
+async def test_optional_recorders_skip_database_when_disabled(tmp_path):
+    manager = SimpleNamespace(
+        root=tmp_path,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+        link_cache_persist=False,
+        link_cache_ttl=3600,
+        media_dedup=False,
+        download_journal=False,
+    )
+    for recorder in (
+        LinkRecorder(manager),
+        MediaRecorder(manager),
+        JournalRecorder(manager),
+    ):
+        async with recorder:
+            await recorder.add("id", "name")
+            assert await recorder.select("id") is None
+
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_author_recorder_opens_database_on_first_use(tmp_path):
+    manager = SimpleNamespace(
+        root=tmp_path,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+    )
+    async with AuthorRecorder(manager) as recorder:
+        assert not tmp_path.joinpath("AuthorSync.db").exists()
+        await recorder.add("author", "note-1")
+        assert (await recorder.select("author"))[0] == "note-1"
+
+    assert tmp_path.joinpath("AuthorSync.db").exists()
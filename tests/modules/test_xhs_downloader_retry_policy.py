@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.retry_policy import (
+    Failure,
+    RetryPolicy,
+)
+from media_crawler.modules.xhs_downloader.core.module.tools import retry
+
+URL = "https://sns-video-bd.xhscdn.com/demo"
+
+
+def status_error(status: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", URL)
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class Fetcher:
+    def __init__(self, policy: RetryPolicy, errors: list, times: int = 3):
+        self.retry = times
+        self.retry_policy = policy
+        self.errors = errors
+        self.calls = 0
+
+    @retry
+    async def fetch(self, url: str):
+        self.calls += 1
+        if self.errors:
+            return Failure(self.errors.pop(0), "")
+        return "ok"
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    policy = RetryPolicy(base=0)
+    fetcher = Fetcher(policy, [status_error(503), httpx.ConnectTimeout("timeout")])
+
+    assert await fetcher.fetch(URL) == "ok"
+    assert fetcher.calls == 3
+    assert policy.stats()["sns-video-bd.xhscdn.com"]["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_permanent_errors_are_not_retried():
+    policy = RetryPolicy(base=0)
+    fetcher = Fetcher(policy, [status_error(404)])
+
+    assert await fetcher.fetch(URL) == ""
+    assert fetcher.calls == 1
+    assert policy.stats()["sns-video-bd.xhscdn.com"]["permanent"] == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_limits_retries_per_host():
+    policy = RetryPolicy(base=0, budget_ratio=0.5, budget_maximum=2)
+    fetcher = Fetcher(policy, [status_error(502) for _ in range(20)])
+
+    for _ in range(3):
+        await fetcher.fetch(URL)
+    stats = policy.stats()["sns-video-bd.xhscdn.com"]
+
+    assert stats["retries"] == 3
+    assert stats["exhausted"] == 3
+    assert fetcher.calls == 6
+
+
+def test_delay_uses_jitter_and_retry_after():
+    policy = RetryPolicy(base=1, maximum=5)
+
+    assert all(0 <= policy.delay(attempt) <= 5 for attempt in range(10))
+    assert policy.delay(0, status_error(429, {"Retry-After": "3"})) == 3
+    assert policy.delay(0, status_error(429, {"Retry-After": "120"})) == 5
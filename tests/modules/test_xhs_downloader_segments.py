@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.application.download import (
+    Download,
+    SegmentProgress,
+)
+from media_crawler.modules.xhs_downloader.core.module import (
+    JournalRecorder,
+    Manager,
+    MediaStore,
+    RetryPolicy,
+)
+from media_crawler.modules.xhs_downloader.core.module.concurrency import (
+    AdaptiveConcurrency,
+)
+from media_crawler.modules.xhs_downloader.core.module.directory_index import (
+    DirectoryIndex,
+)
+from media_crawler.modules.xhs_downloader.core.module.rate_limit import (
+    BandwidthLimiter,
+)
+from media_crawler.modules.xhs_downloader.core.module.writer import WriterPool
+
+DATA = b"\x00\x00\x00\x18ftypisom" + bytes(range(256)) * 4
+URL = "https://sns-video-bd.xhscdn.com/demo"
+
+
+class Server:
+    def __init__(self, ranges=True):
+        self.ranges = ranges
+        self.heads = 0
+        self.requests: list[str | None] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            self.heads += 1
+            if not self.ranges:
+                return httpx.Response(405)
+            return httpx.Response(
+                200,
+                headers={"Accept-Ranges": "bytes", "Content-Length": str(len(DATA))},
+            )
+        self.requests.append(value := request.headers.get("Range"))
+        if not value:
+            return httpx.Response(200, content=DATA)
+        start, end = value.removeprefix("bytes=").split("-")
+        end = int(end) if end else len(DATA) - 1
+        return httpx.Response(
+            206,
+            content=DATA[int(start) : end + 1],
+            headers={"Content-Range": f"bytes {start}-{end}/{len(DATA)}"},
+        )
+
+
+def fake_manager(tmp_path, server: Server):
+    folder = tmp_path.joinpath("Download")
+    temp = folder.joinpath(".temp")
+    temp.mkdir(parents=True)
+    return SimpleNamespace(
+        root=tmp_path,
+        folder=folder,
+        temp=temp,
+        chunk=64,
+        download_client=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+        blank_headers={},
+        retry=0,
+        retry_policy=RetryPolicy(0.01),
+        folder_mode=False,
+        image_format="png",
+        image_download=True,
+        video_download=True,
+        live_download=False,
+        author_archive=False,
+        write_mtime=False,
+        segmented_download=True,
+        segment_threshold=256,
+        segment_count=4,
+        download_concurrency=AdaptiveConcurrency(),
+        writer_pool=WriterPool(1),
+        write_buffer_size=128,
+        bandwidth=BandwidthLimiter(0),
+        verify_checksum=False,
+        etag_checksum=False,
+        media_dedup=False,
+        download_journal=False,
+        download_record=True,
+        record_batch_size=100,
+        record_flush_interval=0.5,
+        directory_index=DirectoryIndex(),
+        record_directory=lambda *paths: None,
+        move=Manager.move,
+        delete=Manager.delete,
+        archive=Manager.archive,
+        update_mtime=Manager.update_mtime,
+    )
+
+
+async def download(manager) -> bool:
+    downloader = Download(
+        manager,
+        MediaStore(manager, None),
+        JournalRecorder(manager),
+    )
+    try:
+        return await downloader._Download__download(
+            URL,
+            manager.folder,
+            "video",
+            "mp4",
+            0,
+            None,
+            None,
+        )
+    finally:
+        await manager.download_client.aclose()
+        manager.writer_pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_large_file_is_split_into_ranges(tmp_path):
+    server = Server()
+    manager = fake_manager(tmp_path, server)
+
+    assert await download(manager)
+
+    size = -(-len(DATA) // 4)
+    assert set(server.requests) == {
+        f"bytes={i}-{min(i + size, len(DATA)) - 1}" for i in range(0, len(DATA), size)
+    }
+    assert manager.folder.joinpath("video.mp4").read_bytes() == DATA
+    assert not any(manager.temp.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_head_probe_without_ranges_falls_back_to_single_stream(tmp_path):
+    server = Server(ranges=False)
+    manager = fake_manager(tmp_path, server)
+
+    assert await download(manager)
+
+    assert server.heads == 1
+    assert server.requests == ["bytes=0-"]
+    assert manager.folder.joinpath("video.mp4").read_bytes() == DATA
+
+
+@pytest.mark.asyncio
+async def test_partial_segments_resume_from_sidecar(tmp_path):
+    server = Server()
+    manager = fake_manager(tmp_path, server)
+    temp = manager.temp.joinpath("video.mp4")
+    half = len(DATA) // 2
+    quarter = half // 2
+    # 第一段已完成，第二段写入 100 字节，其余分段尚未开始
+    temp.write_bytes(DATA[: quarter + 100].ljust(len(DATA), b"\x00"))
+    manager.temp.joinpath("video.mp4.segments").write_text(
+        json.dumps(
+            {
+                "length": len(DATA),
+                "ranges": [
+                    [0, quarter - 1, quarter],
+                    [quarter, half - 1, 100],
+                    [half, half + quarter - 1, 0],
+                    [half + quarter, len(DATA) - 1, 0],
+                ],
+            }
+        )
+    )
+
+    assert await download(manager)
+
+    assert server.heads == 0
+    assert set(server.requests) == {
+        f"bytes={quarter + 100}-{half - 1}",
+        f"bytes={half}-{half + quarter - 1}",
+        f"bytes={half + quarter}-{len(DATA) - 1}",
+    }
+    assert manager.folder.joinpath("video.mp4").read_bytes() == DATA
+
+
+@pytest.mark.asyncio
+async def test_segment_progress_is_saved_on_interval(tmp_path):
+    file = tmp_path.joinpath("video.mp4.segments")
+    segments = {"length": 10, "ranges": [[0, 9, 0]]}
+    progress = SegmentProgress(file, segments)
+
+    await progress.update()
+    segments["ranges"][0][2] = 5
+    await progress.update()
+    assert json.loads(file.read_text())["ranges"] == [[0, 9, 0]]
+
+    await progress.save()
+    assert json.loads(file.read_text())["ranges"] == [[0, 9, 5]]
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import pytest
 
-from media_crawler.config.settings import (
+from media_crawler.config.models.xhs_downloader import (
     XHSDownloaderSettings,
     XHSDownloaderStorageSettings,
 )
-from media_crawler.modules.xhs_downloader.schemas import XHSDownloaderRequest
+from media_crawler.modules.xhs_downloader.schemas import (
+    XHSDownloaderBatchRequest,
+    XHSDownloaderRequest,
+)
 from media_crawler.modules.xhs_downloader.services.xhs_downloader_service import (
     XHSDownloaderError,
     XHSDownloaderService,
@@ -29,11 +32,21 @@ class StubXHS:
         }
         return self.data
 
+    async def extract_stream(self, urls: list[str], *args):  # pragma: no cover - 简单桩
+        self.captured = {"urls": urls, "args": args}
+        yield urls[1], {"作品ID": "fast"}
+        yield urls[0], {}
+        yield "invalid", None
+
 
 def build_settings(enabled: bool = True) -> XHSDownloaderSettings:
     return XHSDownloaderSettings(
         enabled=enabled,
-        storage=XHSDownloaderStorageSettings(work_directory="./tmp/xhs", folder_name="Download", name_format="发布时间 作者昵称"),
+        storage=XHSDownloaderStorageSettings(
+            work_directory="./tmp/xhs",
+            folder_name="Download",
+            name_format="发布时间 作者昵称",
+        ),
         default_cookie="a1=demo",
     )
 
@@ -41,7 +54,9 @@ def build_settings(enabled: bool = True) -> XHSDownloaderSettings:
 @pytest.mark.asyncio
 async def test_fetch_detail_returns_data_when_core_succeeds():
     service = XHSDownloaderService(build_settings())
-    stub = StubXHS(urls=["https://www.xiaohongshu.com/explore/demo"], data={"作品ID": "demo"})
+    stub = StubXHS(
+        urls=["https://www.xiaohongshu.com/explore/demo"], data={"作品ID": "demo"}
+    )
     service._client = stub  # type: ignore[attr-defined]
     service._started = True  # type: ignore[attr-defined]
     payload = XHSDownloaderRequest(url="https://www.xiaohongshu.com/explore/demo")
@@ -73,3 +88,37 @@ async def test_fetch_detail_raises_when_disabled():
 
     with pytest.raises(XHSDownloaderError):
         await service.fetch_detail(XHSDownloaderRequest(url="https://xhslink.com/abc"))
+
+
+@pytest.mark.asyncio
+async def test_stream_details_yields_results_in_completion_order():
+    service = XHSDownloaderService(build_settings())
+    stub = StubXHS(urls=[], data=None)
+    service._client = stub  # type: ignore[attr-defined]
+    service._started = True  # type: ignore[attr-defined]
+    payload = XHSDownloaderBatchRequest(
+        urls=[
+            " https://www.xiaohongshu.com/explore/slow ",
+            "https://www.xiaohongshu.com/explore/fast",
+            "invalid",
+            "",
+        ],
+        skip_downloaded=True,
+    )
+
+    results = [i async for i in service.stream_details(payload)]
+
+    assert stub.captured["urls"] == [
+        "https://www.xiaohongshu.com/explore/slow",
+        "https://www.xiaohongshu.com/explore/fast",
+        "invalid",
+    ]
+    assert [(i.url, i.message, i.data) for i in results] == [
+        (
+            "https://www.xiaohongshu.com/explore/fast",
+            "获取小红书作品数据成功",
+            {"作品ID": "fast"},
+        ),
+        ("https://www.xiaohongshu.com/explore/slow", "获取小红书作品数据失败", None),
+        ("invalid", "提取小红书作品链接失败", None),
+    ]
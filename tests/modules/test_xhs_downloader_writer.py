@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from media_crawler.modules.xhs_downloader.core.module.writer import WriterPool
+
+
+@pytest.fixture
+def pool():
+    pool = WriterPool(2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_coalesced_in_order(tmp_path, pool):
+    file = tmp_path.joinpath("video.mp4")
+    chunks = [os.urandom(1000) for _ in range(50)]
+
+    async with pool.writer(file, buffer_size=4096, max_pending=1) as writer:
+        for chunk in chunks:
+            await writer.write(chunk)
+            assert writer.buffered < 4096
+            assert len(writer.pending) <= 1
+
+    assert file.read_bytes() == b"".join(chunks)
+    assert writer.written == len(file.read_bytes())
+
+
+@pytest.mark.asyncio
+async def test_positional_writes_fill_preallocated_ranges(tmp_path, pool):
+    file = tmp_path.joinpath("segments.bin")
+    file.write_bytes(b"\0" * 300)
+
+    for index, value in ((2, b"c"), (0, b"a"), (1, b"b")):
+        async with pool.writer(file, index * 100, buffer_size=64) as writer:
+            for _ in range(10):
+                await writer.write(value * 10)
+
+    assert file.read_bytes() == b"a" * 100 + b"b" * 100 + b"c" * 100
+
+
+@pytest.mark.asyncio
+async def test_append_resumes_from_offset(tmp_path, pool):
+    file = tmp_path.joinpath("image.png")
+    file.write_bytes(b"head")
+
+    async with pool.writer(file, file.stat().st_size) as writer:
+        await writer.write(b"tail")
+
+    assert file.read_bytes() == b"headtail"